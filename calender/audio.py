@@ -0,0 +1,52 @@
+# calender/audio.py
+"""
+녹음 파일 메타데이터: 재생 길이와 파형(구간별 최대 진폭).
+표준 라이브러리 wave로 PCM WAV만 해석한다. 구간마다 readframes로 읽으므로 파일 전체를 메모리에 올리지 않고,
+진폭은 샘플마다 파이썬 정수를 만들지 않도록 최상위 바이트만 잘라(bytes 슬라이스/translate, C 구현) 구한다.
+"""
+import wave
+
+WAVEFORM_POINTS = 100
+
+# 부호 있는 최상위 바이트 → 크기 (0~128)
+_SIGNED_MAGNITUDE = bytes(v if v < 128 else 256 - v for v in range(256))
+# 8비트 WAV는 부호 없는 값 (128이 무음)
+_UNSIGNED_MAGNITUDE = bytes(abs(v - 128) for v in range(256))
+
+
+def _peak(data: bytes, width: int) -> float:
+    """구간의 최대 진폭 (0.0 ~ 1.0, 1/128 단위 - 목록 표시용으로 충분)"""
+    if width == 1:
+        high = data.translate(_UNSIGNED_MAGNITUDE)
+    else:
+        # WAV 샘플은 little-endian이라 각 샘플의 마지막 바이트가 최상위 바이트
+        high = data[width - 1::width].translate(_SIGNED_MAGNITUDE)
+    # 큰 값부터 포함 여부만 확인 (memchr) - 보통 몇 번 안에 끝난다
+    for level in range(128, 0, -1):
+        if level in high:
+            return level / 128
+    return 0.0
+
+
+def analyze_wav(fp, points: int = WAVEFORM_POINTS) -> dict:
+    """
+    {"duration_ms", "waveform"}. waveform은 0~255 정수 points개 (채널은 합쳐서 하나로).
+    PCM WAV가 아니면 wave.Error/EOFError.
+    """
+    with wave.open(fp, "rb") as w:
+        width, rate, nframes = w.getsampwidth(), w.getframerate(), w.getnframes()
+        result = {"duration_ms": nframes * 1000 // rate if rate else None, "waveform": []}
+        if not nframes:
+            return result
+
+        # 구간 경계를 i * nframes // points로 나눠 항상 points개를 만든다
+        # (프레임이 points보다 적으면 한 프레임이 여러 구간에 쓰인다)
+        waveform = []
+        for i in range(points):
+            start = i * nframes // points
+            end = max((i + 1) * nframes // points, start + 1)
+            w.setpos(start)
+            data = w.readframes(end - start)
+            waveform.append(round(_peak(data, width) * 255) if data else 0)
+        result["waveform"] = waveform
+        return result
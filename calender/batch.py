@@ -0,0 +1,245 @@
+# calender/batch.py
+"""
+한 방의 일정 생성/수정/삭제를 묶어서 처리한다.
+모든 작업을 먼저 함께 검증하고(대상 일정/담당자는 한 번씩만 조회), 하나라도 실패하면 아무것도 반영하지 않는다.
+반영은 한 트랜잭션 안에서:
+- 생성: bulk_create (첨부도 한 번에)
+- 단일 행 수정(반복 아닌 일정, 개별 수정본의 this): bulk_update 한 번
+- 단일 행 삭제: DELETE 한 번
+- 반복 일정의 this/following/all: series.py의 범위 처리를 작업별로 그대로 사용
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from room.models import RoomMembership
+from user.models import CustomUser as User
+from utils.cache import bump_room_version
+from utils.db import bulk_create_with_pks
+from .models import CalendarEvent, CalendarAttachment
+from .serializers import CalendarEventCreateUpdateSerializer
+from .series import SCOPE_THIS, default_scope, delete_occurrences, resolve_target, update_occurrences
+from .utils import build_attachments, resolve_attachment_files
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+CREATE_REQUIRED = ("date", "title", "start_at", "end_at")
+
+
+class BatchValidationError(Exception):
+    """errors: [{"index", "error_code", "message", "detail"}]"""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _error(index, code, message, detail=None) -> dict:
+    return {"index": index, "error_code": code, "message": message, "detail": detail or {}}
+
+
+class _Op:
+    def __init__(self, index, kind, event=None, scope=None, occurrence_date=None):
+        self.index = index
+        self.kind = kind
+        self.event = event
+        self.scope = scope
+        self.occurrence_date = occurrence_date
+        self.changes = {}
+        self.attachments = None
+        # 반복 범위 처리가 필요 없이 한 행만 바뀌는지
+        self.single_row = False
+
+
+def _load_targets(room, operations) -> dict:
+    ids = {op["id"] for op in operations if op["op"] != OP_CREATE and op.get("id")}
+    if not ids:
+        return {}
+    # 개별 수정본의 원본은 resolve_target에서 쓰므로 함께 가져온다
+    return CalendarEvent.objects.filter(room=room, id__in=ids).select_related("series").in_bulk()
+
+
+def _load_assignees(room, operations):
+    ids = {
+        op["data"]["assignee_id"] for op in operations
+        if op["op"] != OP_DELETE and (op.get("data") or {}).get("assignee_id")
+    }
+    if not ids:
+        return {}, set()
+    users = User.objects.in_bulk(ids)
+    members = set(RoomMembership.objects.filter(room=room, user_id__in=ids).values_list("user_id", flat=True))
+    return users, members
+
+
+def prepare(room, operations, user) -> list:
+    """
+    operations: CalendarBatchSerializer로 형식 검증된 목록. user: 요청한 사용자 (첨부할 수 있는 파일 확인).
+    작업별 변경 내용을 해석해 반환한다. 하나라도 잘못되면 BatchValidationError (모든 작업의 오류를 모아서).
+    """
+    targets = _load_targets(room, operations)
+    users, members = _load_assignees(room, operations)
+    errors, prepared, families = [], [], {}
+
+    for index, raw in enumerate(operations):
+        kind = raw["op"]
+        event = None
+        if kind != OP_CREATE:
+            event = targets.get(raw.get("id"))
+            if event is None:
+                errors.append(_error(index, "CALENDAR_EVENT_NOT_FOUND", "이 방에서 해당 일정을 찾을 수 없습니다.",
+                                     {"id": raw.get("id")}))
+                continue
+            # 같은 시리즈(원본 + 개별 수정본)를 두 번 건드리면 적용 순서에 따라 결과가 달라지므로 막는다
+            family = event.series_id or event.id
+            if family in families:
+                errors.append(_error(index, "CALENDAR_BATCH_DUPLICATE_TARGET",
+                                     "같은 일정(반복 시리즈)을 한 요청에서 여러 번 변경할 수 없습니다.",
+                                     {"id": event.id, "conflicts_with": families[family]}))
+                continue
+            families[family] = index
+
+        op = _Op(index, kind, event, raw.get("scope") or (default_scope(event) if event else None),
+                 raw.get("occurrence_date"))
+        if event is not None:
+            try:
+                master, _, _ = resolve_target(event, op.occurrence_date)
+            except ValueError:
+                errors.append(_error(index, "CALENDAR_OCCURRENCE_NOT_FOUND", "해당 날짜에 반복 일정 발생분이 없습니다.",
+                                     {"occurrence_date": str(op.occurrence_date)}))
+                continue
+            op.single_row = master is None or (event.series_id is not None and op.scope == SCOPE_THIS)
+
+        if kind == OP_DELETE:
+            prepared.append(op)
+            continue
+
+        serializer = CalendarEventCreateUpdateSerializer(
+            instance=event, data=raw.get("data") or {}, partial=kind == OP_UPDATE,
+        )
+        if not serializer.is_valid():
+            errors.append(_error(index, "CALENDAR_VALIDATION_ERROR", "유효성 검사 실패", serializer.errors))
+            continue
+        v = dict(serializer.validated_data)
+        # 묶음 처리에서는 겹침 검사를 하지 않는다 (필요하면 /calendar/conflicts/로 미리 확인)
+        v.pop("check_conflicts", None)
+        if kind == OP_CREATE:
+            missing = [f for f in CREATE_REQUIRED if f not in v]
+            if missing:
+                errors.append(_error(index, "CALENDAR_VALIDATION_ERROR", "유효성 검사 실패",
+                                     {f: ["이 필드는 필수 항목입니다."] for f in missing}))
+                continue
+
+        op.attachments = v.pop("attachments", None)
+        if "assignee_id" in v:
+            assignee_id = v.pop("assignee_id")
+            if assignee_id:
+                if assignee_id not in users:
+                    errors.append(_error(index, "ASSIGNEE_NOT_FOUND", "담당자 없음", {"assignee_id": assignee_id}))
+                    continue
+                if assignee_id not in members:
+                    errors.append(_error(index, "ASSIGNEE_NOT_ROOM_MEMBER", "담당자는 방 멤버만 가능",
+                                         {"assignee_id": assignee_id}))
+                    continue
+            v["assignee"] = users.get(assignee_id) if assignee_id else None
+        op.changes = v
+        prepared.append(op)
+
+    # 첨부 파일 권한은 모든 작업을 모아 한 번에 확인
+    with_files = [op for op in prepared if op.attachments]
+    denied = resolve_attachment_files(user, room, [op.attachments for op in with_files])
+    for op, file_ids in zip(with_files, denied):
+        if file_ids:
+            errors.append(_error(op.index, "ATTACHMENT_FILE_FORBIDDEN",
+                                 "직접 올렸거나 이 방 일정에 이미 첨부된 파일만 첨부할 수 있습니다.",
+                                 {"file_id": file_ids}))
+
+    if errors:
+        errors.sort(key=lambda error: error["index"])
+        raise BatchValidationError(errors)
+    return prepared
+
+
+def _new_event(room, v) -> CalendarEvent:
+    repeat_rule = v.get("repeat_rule", CalendarEvent.RepeatRule.NONE)
+    return CalendarEvent(
+        room=room,
+        date=v["date"],
+        title=v["title"],
+        start_at=v["start_at"],
+        end_at=v["end_at"],
+        is_all_day=v.get("is_all_day", False),
+        repeat_rule=repeat_rule,
+        repeat_until=v.get("repeat_until") if repeat_rule != CalendarEvent.RepeatRule.NONE else None,
+        description=v.get("description"),
+        assignee=v.get("assignee"),
+    )
+
+
+def _create(room, ops):
+    events = [_new_event(room, op.changes) for op in ops]
+    # 첨부 FK와 응답에 id가 필요하다
+    bulk_create_with_pks(CalendarEvent, events)
+    for op, event in zip(ops, events):
+        op.event = event
+    return events
+
+
+def _update_rows(ops):
+    now = timezone.now()
+    fields = {"updated_at"}
+    for op in ops:
+        for field, value in op.changes.items():
+            setattr(op.event, field, value)
+        fields.update(op.changes)
+        op.event.updated_at = now
+    if ops:
+        # 첨부만 바꾼 경우도 updated_at은 갱신해야 증분 동기화에 잡힌다
+        CalendarEvent.objects.bulk_update([op.event for op in ops], sorted(fields))
+
+
+def apply(room, ops) -> list:
+    """
+    prepare() 결과를 한 트랜잭션으로 반영한다.
+    반환: 입력 순서대로 [{"index", "op", "id", ...}] (create/update는 결과 행 id, delete는 삭제 행 수)
+    """
+    creates = [op for op in ops if op.kind == OP_CREATE]
+    row_updates = [op for op in ops if op.kind == OP_UPDATE and op.single_row]
+    series_updates = [op for op in ops if op.kind == OP_UPDATE and not op.single_row]
+    row_deletes = [op for op in ops if op.kind == OP_DELETE and op.single_row]
+    series_deletes = [op for op in ops if op.kind == OP_DELETE and not op.single_row]
+
+    results = {}
+    with transaction.atomic():
+        _create(room, creates)
+        _update_rows(row_updates)
+
+        # 첨부 교체는 대상 행을 모아 삭제 한 번 + 생성 한 번
+        replaced = [op for op in creates + row_updates if op.attachments is not None]
+        CalendarAttachment.objects.filter(event__in=[op.event for op in row_updates if op.attachments is not None]).delete()
+        CalendarAttachment.objects.bulk_create([
+            att for op in replaced for att in build_attachments(op.event, op.attachments)
+        ])
+
+        for op in series_updates:
+            op.event = update_occurrences(op.event, op.scope, op.occurrence_date, op.changes, op.attachments)
+
+        deleted_rows = {}
+        if row_deletes:
+            # QuerySet.delete도 행마다 post_delete를 보내므로 삭제 기록(tombstone)은 그대로 남는다
+            CalendarEvent.objects.filter(pk__in=[op.event.pk for op in row_deletes]).delete()
+            deleted_rows = {op.index: 1 for op in row_deletes}
+        for op in series_deletes:
+            deleted_rows[op.index] = delete_occurrences(op.event, op.scope, op.occurrence_date)
+
+        # bulk_create/bulk_update는 post_save를 보내지 않는다
+        bump_room_version(room.id, "calendar")
+
+    for op in creates + row_updates + series_updates:
+        results[op.index] = {"index": op.index, "op": op.kind, "id": op.event.id}
+    for op in row_deletes + series_deletes:
+        results[op.index] = {
+            "index": op.index, "op": op.kind, "id": op.event.id,
+            "scope": op.scope, "deleted_count": deleted_rows[op.index],
+        }
+    return [results[op.index] for op in ops]
@@ -0,0 +1,63 @@
+# calender/blobs.py
+"""
+내용 주소(sha256) 기반 파일 저장.
+같은 내용이 다시 올라오면 스토리지에 쓰지 않고 기존 FileBlob을 공유하며 ref_count만 올린다.
+UploadedFile.file은 blob과 같은 경로를 가리키므로 URL/백업 등 기존 코드는 그대로 동작한다.
+"""
+import hashlib
+import os
+import tempfile
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import FileBlob, UploadedFile
+from .processing import schedule_processing
+
+COPY_CHUNK = 256 * 1024
+
+
+def get_or_store_blob(file, sha256: str, size: int) -> FileBlob:
+    """sha256이 같은 blob이 있으면 그대로, 없으면 file을 저장해 새로 만든다 (ref_count는 올리지 않음)"""
+    blob = FileBlob.objects.filter(sha256=sha256).first()
+    if blob is not None:
+        return blob
+
+    blob = FileBlob(sha256=sha256, size=size)
+    blob.file.save(os.path.basename(file.name or sha256), file, save=False)
+    try:
+        with transaction.atomic():
+            blob.save()
+    except IntegrityError:
+        # 같은 내용이 동시에 올라온 경우: 먼저 저장된 blob을 쓰고 방금 쓴 파일은 지운다
+        winner = FileBlob.objects.get(sha256=sha256)
+        if blob.file.name != winner.file.name:
+            blob.file.storage.delete(blob.file.name)
+        return winner
+    return blob
+
+
+def create_uploaded_file(file, file_type: str, sha256: str, size: int, uploaded_by=None) -> UploadedFile:
+    blob = get_or_store_blob(file, sha256, size)
+    with transaction.atomic():
+        if not FileBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1):
+            # 참조가 없던 blob을 정리 작업(gc_uploads)이 방금 지운 경우: 다시 저장한다
+            file.seek(0)
+            blob = get_or_store_blob(file, sha256, size)
+            FileBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+        uploaded = UploadedFile.objects.create(file=blob.file.name, blob=blob, type=file_type, uploaded_by=uploaded_by)
+        # 파생본 생성 등은 응답을 기다리게 하지 않고 커밋 이후 백그라운드에서
+        schedule_processing(uploaded)
+    return uploaded
+
+
+def create_uploaded_file_from_stream(src, name: str, file_type: str, uploaded_by=None) -> UploadedFile:
+    """해시를 모르는 스트림(백업 가져오기 등): 임시 파일로 한 번 복사하면서 해시를 계산한다"""
+    digest, size = hashlib.sha256(), 0
+    with tempfile.NamedTemporaryFile(suffix=os.path.splitext(name)[1]) as tmp:
+        for chunk in iter(lambda: src.read(COPY_CHUNK), b""):
+            digest.update(chunk)
+            size += len(chunk)
+            tmp.write(chunk)
+        tmp.seek(0)
+        return create_uploaded_file(File(tmp, name=name), file_type, digest.hexdigest(), size, uploaded_by)
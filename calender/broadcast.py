@@ -0,0 +1,29 @@
+# calender/broadcast.py
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def calendar_group(room_id: int) -> str:
+    return f"room_{room_id}_calendar"
+
+
+def broadcast_calendar(room_id: int, payload: dict):
+    # 알림 실패가 이미 커밋된 변경의 응답을 깨뜨리지 않도록 로그만 남긴다 (클라이언트는 sync로 복구)
+    try:
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            calendar_group(room_id),
+            {"type": "calendar.update", "payload": payload},
+        )
+    except Exception:
+        logger.exception("calendar broadcast failed: room_id=%s", room_id)
+
+
+def publish_calendar_change(room_id: int, event_name: str, **payload):
+    """커밋 이후 {"event": event_name, "room_id": ..., **payload}를 방 캘린더 그룹에 보낸다"""
+    message = {"event": event_name, "room_id": room_id, **payload}
+    transaction.on_commit(lambda: broadcast_calendar(room_id, message))
@@ -0,0 +1,156 @@
+# calender/conflicts.py
+"""
+담당자 일정 겹침 검사.
+후보 구간(새 일정/수정될 발생분들)과 담당자의 기존 일정, 다른 방 확정 근무를
+출처별 범위 쿼리 한 번씩으로 가져와 시작 시각 순으로 합친 뒤 스윕해 겹치는 쌍을 찾는다.
+모든 시각은 일정 start_at과 같은 기준(UTC naive)으로 비교한다.
+"""
+import heapq
+import itertools
+from datetime import timedelta
+from django.db.models import Q
+
+from room.models import RoomMembership
+from schedule.shifts import iter_shift_runs, utc_naive
+from .models import CalendarEvent
+from .recurrence import SERIES, iter_occurrence_dates
+
+# 한 번에 검사하는 후보 발생분 상한 (2년치 매일 반복 정도)
+MAX_CANDIDATES = 800
+
+KIND_CANDIDATE = "candidate"
+KIND_EVENT = "event"
+KIND_SHIFT = "shift"
+
+
+class TooManyCandidates(Exception):
+    """검사할 후보 발생분이 MAX_CANDIDATES를 넘는다 (일부만 검사하면 뒤쪽 겹침을 놓치므로 검사하지 않는다)"""
+
+
+def iter_occurrence_intervals(event, start=None, end=None):
+    """일정(단일/반복)의 발생 구간 (start_at, end_at, 발생 날짜) (날짜 범위 start~end, 양 끝 포함)"""
+    for d in iter_occurrence_dates(event, start, end):
+        delta = timedelta(days=(d - event.date).days)
+        yield event.start_at + delta, event.end_at + delta, d
+
+
+def occurrence_intervals(event, start=None, end=None) -> list:
+    """검사할 후보 구간 목록. MAX_CANDIDATES를 넘으면 TooManyCandidates"""
+    out = list(itertools.islice(iter_occurrence_intervals(event, start, end), MAX_CANDIDATES + 1))
+    if len(out) > MAX_CANDIDATES:
+        raise TooManyCandidates(MAX_CANDIDATES)
+    return out
+
+
+def _event_items(user, lo, hi, exclude):
+    alive = Q(room__deleting_at__isnull=True)
+    # (assignee, end_at) 인덱스: 과거 이력은 end_at 조건에서 바로 걸러진다
+    singles = CalendarEvent.objects.filter(~SERIES, alive, assignee=user, end_at__gt=lo, start_at__lt=hi)
+    masters = CalendarEvent.objects.filter(
+        SERIES, alive, assignee=user, start_at__lt=hi, repeat_until__gte=lo.date() - timedelta(days=1),
+    )
+    if exclude is not None:
+        singles, masters = singles.exclude(exclude), masters.exclude(exclude)
+
+    singles = (singles
+               .order_by("start_at")
+               .values_list("id", "room_id", "title", "start_at", "end_at", "date"))
+    single_stream = (
+        (start_at, end_at, KIND_EVENT, {"id": pk, "room_id": room_id, "title": title, "date": d})
+        for pk, room_id, title, start_at, end_at, d in singles
+    )
+
+    streams = [single_stream]
+    masters = (masters
+               .only("id", "room_id", "title", "date", "start_at", "end_at",
+                     "repeat_rule", "repeat_until", "repeat_exceptions"))
+    for master in masters:
+        # 여러 날에 걸친 일정은 시작 날짜가 구간보다 앞설 수 있다
+        span = (master.end_at.date() - master.start_at.date()).days
+        streams.append(
+            (start_at, end_at, KIND_EVENT, {"id": master.id, "room_id": master.room_id, "title": master.title, "date": d})
+            for start_at, end_at, d in iter_occurrence_intervals(master, lo.date() - timedelta(days=span), hi.date())
+            if start_at < hi and end_at > lo
+        )
+    return heapq.merge(*streams, key=lambda item: item[0])
+
+
+def _shift_items(user, lo, hi):
+    room_ids = (RoomMembership.objects
+                .filter(user=user, room__deleting_at__isnull=True)
+                .values("room_id"))
+    # 현지/UTC 차이만큼 하루씩 넉넉하게 가져온 뒤 정확히 거른다
+    runs = iter_shift_runs(user, room_ids, lo.date() - timedelta(days=1), hi.date() + timedelta(days=1))
+    for run in runs:
+        start_at, end_at = utc_naive(run["start"]), utc_naive(run["end"])
+        if start_at < hi and end_at > lo:
+            yield start_at, end_at, KIND_SHIFT, {
+                "schedule_id": run["schedule_id"], "room_id": run["room_id"],
+                "title": f"근무 ({run['room_name']})", "date": run["date"],
+            }
+
+
+def sweep(intervals):
+    """시작 시각 순 구간들에서 겹치는 쌍 (앞선 구간, 뒤 구간)을 차례로 내보낸다"""
+    active = []  # (end_at, seq, item) 최소 힙
+    for seq, item in enumerate(intervals):
+        start_at = item[0]
+        while active and active[0][0] <= start_at:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, item
+        heapq.heappush(active, (item[1], seq, item))
+
+
+def find_conflicts(user, candidates, exclude=None) -> dict:
+    """
+    candidates: [(start_at, end_at)] 검사할 구간들 (MAX_CANDIDATES개까지, 넘으면 TooManyCandidates).
+    exclude: 기존 일정에서 제외할 조건 (수정 중인 일정 자신 등).
+    반환: {"conflicts": [후보와 겹치는 기존 항목], "overlaps": [(기존, 기존) 겹치는 쌍]}
+    """
+    if len(candidates) > MAX_CANDIDATES:
+        raise TooManyCandidates(MAX_CANDIDATES)
+    candidates = sorted(candidates)
+    if not candidates:
+        return {"conflicts": [], "overlaps": []}
+    lo = candidates[0][0]
+    hi = max(end for _, end in candidates)
+
+    candidate_stream = ((s, e, KIND_CANDIDATE, {}) for s, e in candidates)
+    merged = heapq.merge(
+        candidate_stream, _event_items(user, lo, hi, exclude), _shift_items(user, lo, hi),
+        key=lambda item: item[0],
+    )
+
+    conflicts, seen, overlaps = [], set(), []
+    for a, b in sweep(merged):
+        kinds = (a[2], b[2])
+        if kinds == (KIND_CANDIDATE, KIND_CANDIDATE):
+            continue
+        if KIND_CANDIDATE in kinds:
+            other = b if a[2] == KIND_CANDIDATE else a
+            key = (other[2], other[0], tuple(sorted(other[3].items())))
+            if key not in seen:
+                seen.add(key)
+                conflicts.append(other)
+        else:
+            overlaps.append((a, b))
+    return {"conflicts": conflicts, "overlaps": overlaps}
+
+
+def visible_room_ids(user) -> set:
+    """item_payload에서 내용까지 공개할 방: 요청자가 속한(삭제 중이 아닌) 방"""
+    return set(RoomMembership.objects
+               .filter(user=user, room__deleting_at__isnull=True)
+               .values_list("room_id", flat=True))
+
+
+def item_payload(item, visible_rooms) -> dict:
+    """다른 사람의 일정을 조회할 때, 요청자가 속하지 않은 방 항목은 시간만 공개"""
+    start_at, end_at, kind, info = item
+    payload = {"type": kind, "start_at": start_at.isoformat(), "end_at": end_at.isoformat()}
+    if visible_rooms is None or info["room_id"] in visible_rooms:
+        payload.update({k: (v.isoformat() if hasattr(v, "isoformat") else v) for k, v in info.items()})
+    else:
+        payload["private"] = True
+    return payload
@@ -0,0 +1,11 @@
+# calender/consumers.py
+import json
+from schedule.consumers import ScheduleRoomConsumer
+
+
+class CalendarRoomConsumer(ScheduleRoomConsumer):
+    """방 캘린더 변경 알림 (권한 체크/그룹 관리는 스케줄 소켓과 동일)"""
+    group_suffix = "calendar"
+
+    async def calendar_update(self, event):
+        await self.send(text_data=json.dumps(event["payload"], ensure_ascii=False))
@@ -0,0 +1,99 @@
+# calender/delivery.py
+"""
+업로드 파일 전달 (권한 확인 후).
+운영: Django는 권한만 확인하고 X-Accel-Redirect로 nginx internal 위치에 넘긴다 (Range/전송은 nginx가 처리).
+개발(MEDIA_ACCEL_PREFIX 비어 있음): 단일 Range 요청을 지원하는 스트리밍 응답으로 직접 보낸다.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.http import HttpResponse
+
+from room.roster import get_room_roster
+from utils.streaming import streaming_response
+from .models import CalendarAttachment
+
+READ_CHUNK = 256 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def file_room_ids(uploaded) -> set:
+    """이 파일이 첨부된 (삭제 중이 아닌) 방 id들"""
+    return set(CalendarAttachment.objects
+               .filter(uploaded_file=uploaded, event__room__deleting_at__isnull=True)
+               .values_list("event__room_id", flat=True)
+               .distinct())
+
+
+def can_access(user, uploaded) -> bool:
+    """올린 사람이거나, 파일이 첨부된 일정의 방 멤버 (멤버 목록은 members 버전 캐시 사용)"""
+    if uploaded.uploaded_by_id is not None and uploaded.uploaded_by_id == user.id:
+        return True
+    return any(
+        row["user_id"] == user.id
+        for room_id in file_room_ids(uploaded)
+        for row in get_room_roster(room_id)
+    )
+
+
+def _parse_range(header: str, size: int):
+    """단일 bytes 범위 → (start, end) (양 끝 포함). 해석할 수 없으면 None, 만족할 수 없으면 ValueError"""
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # bytes=-N: 마지막 N바이트
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _iter_file(storage, name, start, length):
+    with storage.open(name, "rb") as fp:
+        fp.seek(start)
+        while length > 0:
+            chunk = fp.read(min(READ_CHUNK, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, storage, name: str) -> HttpResponse:
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    disposition = 'inline; filename="%s"' % quote(os.path.basename(name))
+    prefix = getattr(settings, "MEDIA_ACCEL_PREFIX", "")
+
+    if prefix:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(name)
+    else:
+        size = storage.size(name)
+        try:
+            byte_range = _parse_range(request.META.get("HTTP_RANGE", ""), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        start, end = byte_range or (0, size - 1)
+        response = streaming_response(
+            request, _iter_file(storage, name, start, end - start + 1),
+            content_type=content_type, status=206 if byte_range else 200,
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Accept-Ranges"] = "bytes"
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Content-Disposition"] = disposition
+    response["Cache-Control"] = "private, max-age=3600"
+    return response
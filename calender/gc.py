@@ -0,0 +1,170 @@
+# calender/gc.py
+"""
+첨부되지 않은 업로드 파일 정리.
+- 업로드 파일: 어떤 일정 첨부도 참조하지 않고(LEFT JOIN ... IS NULL) 유예 기간이 지난 행
+  (임시 저장한 초안, 삭제된 일정/반복 발생분/방의 첨부였던 파일)
+- blob: ref_count가 0이 되었고 유예 기간이 지난 blob의 원본과 파생본
+- 분할 업로드: 오래 진행이 없는 세션과 임시 파일, 세션 행 없이 남은 임시 파일
+모두 pk 순서로 batch_size씩 조회/삭제하고, 스토리지 파일은 행 삭제가 커밋된 뒤에 지운다.
+"""
+import logging
+import os
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .images import variant_paths
+from .models import FileBlob, UploadedFile, UploadSession
+from .upload_sessions import session_path
+
+logger = logging.getLogger(__name__)
+
+# 업로드 직후 첨부되기 전(일정 작성 중)의 파일을 지우지 않도록
+DEFAULT_GRACE = timedelta(days=1)
+SESSION_TTL = timedelta(days=1)
+DEFAULT_BATCH_SIZE = 500
+
+
+def _delete_files(names):
+    for name in names:
+        if not name:
+            continue
+        try:
+            default_storage.delete(name)
+        except OSError as e:
+            logger.warning("gc: failed to delete %s (%s)", name, e)
+
+
+def _file_size(name) -> int:
+    try:
+        return default_storage.size(name)
+    except OSError:
+        return 0
+
+
+def orphan_uploads(cutoff):
+    """첨부에서 참조하지 않는, cutoff 이전에 올라온 업로드 파일"""
+    return UploadedFile.objects.filter(created_at__lt=cutoff, attachments__isnull=True)
+
+
+def collect_uploads(cutoff, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, report=None) -> tuple:
+    """
+    (행 수, 바이트 수). 바이트는 blob 없는 예전 업로드의 원본만 센다 (blob 원본은 collect_blobs에서).
+    행 삭제 시 post_delete가 blob의 ref_count를 내린다.
+    """
+    total = freed = last = 0
+    while True:
+        rows = list(orphan_uploads(cutoff).filter(pk__gt=last).order_by("pk")
+                    .values("pk", "file", "blob_id", "variants")[:batch_size])
+        if not rows:
+            break
+        last = rows[-1]["pk"]
+
+        if not dry_run:
+            with transaction.atomic():
+                # 조회 이후 첨부된 파일은 남긴다 (삭제하면 첨부의 FK가 SET_NULL로 끊긴다)
+                locked = list(UploadedFile.objects.select_for_update()
+                              .filter(pk__in=[row["pk"] for row in rows]).values_list("pk", flat=True))
+                doomed = set(orphan_uploads(cutoff).filter(pk__in=locked).values_list("pk", flat=True))
+                UploadedFile.objects.filter(pk__in=doomed).delete()
+            rows = [row for row in rows if row["pk"] in doomed]
+
+        legacy = [row for row in rows if row["blob_id"] is None]
+        freed += sum(_file_size(row["file"]) for row in legacy)
+        if not dry_run:
+            _delete_files([row["file"] for row in legacy])
+            _delete_files([name for row in legacy for name in (row["variants"] or {}).values()])
+        total += len(rows)
+        if report:
+            report("uploads", len(rows))
+    return total, freed
+
+
+def _unreferenced_blobs(cutoff, dry_run):
+    if not dry_run:
+        return FileBlob.objects.filter(ref_count=0, created_at__lt=cutoff)
+    # 미리보기: 업로드 정리 후 ref_count가 0이 될 blob까지 (남은 참조가 모두 정리 대상인 blob)
+    return (FileBlob.objects
+            .filter(created_at__lt=cutoff)
+            .annotate(orphans=Count("uploads", distinct=True, filter=Q(
+                uploads__created_at__lt=cutoff, uploads__attachments__isnull=True,
+            )))
+            .filter(ref_count=F("orphans")))
+
+
+def collect_blobs(cutoff, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, report=None) -> tuple:
+    """(blob 수, 바이트 수)"""
+    total = freed = last = 0
+    while True:
+        blobs = list(_unreferenced_blobs(cutoff, dry_run).filter(pk__gt=last).order_by("pk")
+                     .values("pk", "sha256", "file", "size")[:batch_size])
+        if not blobs:
+            break
+        last = blobs[-1]["pk"]
+
+        if not dry_run:
+            with transaction.atomic():
+                # 그 사이 같은 내용이 다시 올라와 참조된 blob은 남긴다
+                # (잠근 뒤 지우므로, 늦게 온 업로드는 ref_count 갱신이 0건이 되어 blob을 새로 저장한다)
+                doomed = set(FileBlob.objects.select_for_update()
+                             .filter(pk__in=[blob["pk"] for blob in blobs], ref_count=0)
+                             .values_list("pk", flat=True))
+                FileBlob.objects.filter(pk__in=doomed).delete()
+            blobs = [blob for blob in blobs if blob["pk"] in doomed]
+            _delete_files([blob["file"] for blob in blobs])
+            _delete_files([name for blob in blobs for name in variant_paths(blob["sha256"]).values()])
+
+        total += len(blobs)
+        freed += sum(blob["size"] for blob in blobs)
+        if report:
+            report("blobs", len(blobs))
+    return total, freed
+
+
+def collect_sessions(cutoff, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, report=None) -> tuple:
+    """(세션/임시 파일 수, 바이트 수)"""
+    total = freed = last = 0
+    while True:
+        sessions = list(UploadSession.objects.filter(updated_at__lt=cutoff, pk__gt=last).order_by("pk")[:batch_size])
+        if not sessions:
+            break
+        last = sessions[-1].pk
+        if not dry_run:
+            UploadSession.objects.filter(pk__in=[s.pk for s in sessions]).delete()
+            for session in sessions:
+                try:
+                    os.remove(session_path(session))
+                except FileNotFoundError:
+                    pass
+        total += len(sessions)
+        freed += sum(s.received for s in sessions)
+        if report:
+            report("sessions", len(sessions))
+
+    # 세션 행 없이 남은 임시 파일 (사용자 삭제로 세션이 CASCADE된 경우 등)
+    directory = settings.UPLOAD_SESSION_DIR
+    if not os.path.isdir(directory):
+        return total, freed
+    with os.scandir(directory) as entries:
+        stale = {
+            entry.name: entry.stat().st_size for entry in entries
+            if entry.is_file() and entry.stat().st_mtime < cutoff.timestamp()
+        }
+    names = list(stale)
+    for i in range(0, len(names), batch_size):
+        chunk = names[i:i + batch_size]
+        known = set(UploadSession.objects.filter(upload_id__in=chunk).values_list("upload_id", flat=True))
+        leftovers = [name for name in chunk if name not in known]
+        if not dry_run:
+            for name in leftovers:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+        total += len(leftovers)
+        freed += sum(stale[name] for name in leftovers)
+        if report and leftovers:
+            report("session files", len(leftovers))
+    return total, freed
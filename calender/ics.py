@@ -0,0 +1,203 @@
+# calender/ics.py
+"""
+사용자별 iCalendar(ICS) 피드.
+- 방 일정: 반복 일정은 펼치지 않고 RRULE/EXDATE로 내보낸다.
+- 확정 근무: 연속된 시간을 합친 구간(schedule.shifts)을 VEVENT 하나로 내보낸다.
+DB는 iterator()로 나눠 읽고 VEVENT 단위로 바로 흘려보낸다.
+"""
+import hashlib
+import secrets
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from dateutil.rrule import rrule, MONTHLY
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from room.models import RoomMembership
+from schedule.shifts import iter_shift_runs
+from utils.cache import room_version
+from .models import CalendarEvent, CalendarFeedToken
+from .recurrence import SERIES
+
+PRODID = "-//careon//calendar feed//KO"
+CHUNK_SIZE = 500
+# 피드에 포함할 과거 범위 (구독 앱은 보통 최근/미래만 필요)
+EVENT_LOOKBACK = timedelta(days=180)
+SHIFT_LOOKBACK = timedelta(days=60)
+RRULE_FREQ = {
+    CalendarEvent.RepeatRule.DAILY: "DAILY",
+    CalendarEvent.RepeatRule.WEEKLY: "WEEKLY",
+    CalendarEvent.RepeatRule.MONTHLY: "MONTHLY",
+}
+
+# 일정 시각(start_at/end_at)은 UTC 기준 naive 값으로 다루고 (serializers.to_local과 동일),
+# created/updated_at과 근무 시간(hour)은 현지 시각이다
+LOCAL_TZ = ZoneInfo(settings.TIME_ZONE)
+
+
+def issue_feed_token(user, rotate: bool = False) -> CalendarFeedToken:
+    feed = CalendarFeedToken.objects.filter(user=user).first()
+    if feed is None:
+        return CalendarFeedToken.objects.create(user=user, token=secrets.token_urlsafe(32))
+    if rotate:
+        feed.token = secrets.token_urlsafe(32)
+        feed.save(update_fields=["token"])
+    return feed
+
+
+def _escape(text) -> str:
+    return (str(text or "")
+            .replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n"))
+
+
+def _fold(line: str) -> bytes:
+    """RFC 5545: 75옥텟을 넘는 줄은 CRLF + 공백으로 접는다 (UTF-8 문자 중간에서 자르지 않음)"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return data + b"\r\n"
+    out, chunk, limit = [], b"", 75
+    for ch in line:
+        encoded = ch.encode("utf-8")
+        if len(chunk) + len(encoded) > limit:
+            out.append(chunk)
+            chunk, limit = b" ", 75
+        chunk += encoded
+    out.append(chunk)
+    return b"\r\n".join(out) + b"\r\n"
+
+
+def _utc(dt: datetime) -> str:
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _local_to_utc(dt: datetime) -> str:
+    return _utc(dt.replace(tzinfo=LOCAL_TZ).astimezone(dt_timezone.utc))
+
+
+def _day(d: date) -> str:
+    return d.strftime("%Y%m%d")
+
+
+def _vevent(lines) -> bytes:
+    return b"".join(_fold(line) for line in ["BEGIN:VEVENT", *lines, "END:VEVENT"])
+
+
+def _event_lines(row: dict) -> list:
+    lines = [
+        f"UID:event-{row['id']}@careon",
+        f"DTSTAMP:{_local_to_utc(row['updated_at'])}",
+        f"LAST-MODIFIED:{_local_to_utc(row['updated_at'])}",
+        f"SUMMARY:{_escape(row['title'])}",
+    ]
+    if row["is_all_day"]:
+        lines += [f"DTSTART;VALUE=DATE:{_day(row['date'])}", f"DTEND;VALUE=DATE:{_day(row['date'] + timedelta(days=1))}"]
+    else:
+        lines += [f"DTSTART:{_utc(row['start_at'])}", f"DTEND:{_utc(row['end_at'])}"]
+    if row["description"]:
+        lines.append(f"DESCRIPTION:{_escape(row['description'])}")
+
+    freq = RRULE_FREQ.get(row["repeat_rule"])
+    if freq and row["repeat_until"]:
+        if row["is_all_day"]:
+            lines.append(f"RRULE:FREQ={freq};UNTIL={_day(row['repeat_until'])}")
+            lines += [f"EXDATE;VALUE=DATE:{_day(date.fromisoformat(d))}" for d in row["repeat_exceptions"] or []]
+        else:
+            lines += _recurrence_lines(row, freq)
+    return lines
+
+
+def _recurrence_lines(row: dict, freq: str) -> list:
+    """
+    시간 지정 반복의 RRULE/RDATE/EXDATE (UTC).
+    반복 날짜는 현지 날짜(date) 기준이고 start_at은 UTC라, 현지 오전 9시 이전 일정은 UTC 날짜가 하루 앞선다.
+    발생분 시각은 서버 전개(recurrence.make_occurrence)와 같이 start_at에 날짜 차이만큼 더해 구한다.
+    """
+    start_at = row["start_at"]
+
+    def at(d: date) -> datetime:
+        return start_at + (d - row["date"])
+
+    until = at(row["repeat_until"])
+    excluded = {at(date.fromisoformat(d)) for d in row["repeat_exceptions"] or []}
+    added = set()
+    if freq == "MONTHLY" and start_at.date() != row["date"]:
+        # 구독 앱은 월 반복을 UTC 날짜의 '며칠'로 전개하므로 현지 날짜 기준 전개와 어긋나는 달이 생긴다
+        # (현지 31일 → UTC 30일이 있는 달, 현지 1일 → 전달 말일). 차이는 EXDATE/RDATE로 맞춘다.
+        local = rrule(MONTHLY, dtstart=datetime.combine(row["date"], time.min),
+                      until=datetime.combine(row["repeat_until"], time.min))
+        expected = {at(dt.date()) for dt in local}
+        expanded = set(rrule(MONTHLY, dtstart=start_at, until=until))
+        added = expected - expanded - excluded
+        excluded |= expanded - expected
+
+    return [
+        f"RRULE:FREQ={freq};UNTIL={_utc(until)}",
+        *(f"RDATE:{_utc(dt)}" for dt in sorted(added)),
+        *(f"EXDATE:{_utc(dt)}" for dt in sorted(excluded)),
+    ]
+
+
+def _iter_events(room_ids, since: date):
+    qs = (CalendarEvent.objects
+          .filter(room_id__in=room_ids)
+          .filter((SERIES & Q(repeat_until__gte=since)) | (~SERIES & Q(date__gte=since)))
+          .order_by()
+          .values("id", "date", "title", "start_at", "end_at", "is_all_day", "description",
+                  "repeat_rule", "repeat_until", "repeat_exceptions", "updated_at"))
+    for row in qs.iterator(chunk_size=CHUNK_SIZE):
+        yield _vevent(_event_lines(row))
+
+
+def _shift_vevent(run) -> bytes:
+    return _vevent([
+        f"UID:shift-{run['schedule_id']}-{run['date']:%Y%m%d}-{run['first_hour']}@careon",
+        f"DTSTAMP:{_local_to_utc(run['finalized_at'])}",
+        f"SUMMARY:{_escape('근무 (%s)' % run['room_name'])}",
+        f"DTSTART:{_local_to_utc(run['start'])}",
+        f"DTEND:{_local_to_utc(run['end'])}",
+    ])
+
+
+def feed_room_ids(user) -> list:
+    return list(RoomMembership.objects
+                .filter(user=user, room__deleting_at__isnull=True)
+                .order_by("room_id")
+                .values_list("room_id", flat=True))
+
+
+def feed_etag(user, room_ids) -> str:
+    """방별 calendar/schedule 캐시 버전 + 날짜(조회 범위 기준)로 계산 (DB 조회 없음)"""
+    parts = [str(user.pk), timezone.now().date().isoformat()] + [
+        f"{rid}:{room_version(rid, 'calendar')}:{room_version(rid, 'schedule')}" for rid in room_ids
+    ]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def feed_last_modified(etag: str) -> int:
+    """ETag가 처음 관측된 시각(epoch 초)을 Last-Modified로 사용 (내용이 같으면 값도 유지)"""
+    now = int(timezone.now().replace(tzinfo=LOCAL_TZ).timestamp())
+    cache.add(f"ics:lm:{etag}", now, 7 * 24 * 3600)
+    return cache.get(f"ics:lm:{etag}") or now
+
+
+def iter_feed(user, room_ids):
+    today = timezone.now().date()
+    yield b"".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:careon",
+    ])
+    yield from _iter_events(room_ids, today - EVENT_LOOKBACK)
+    for run in iter_shift_runs(user, room_ids, today - SHIFT_LOOKBACK):
+        yield _shift_vevent(run)
+    yield _fold("END:VCALENDAR")
@@ -0,0 +1,73 @@
+# calender/images.py
+"""
+이미지 첨부 파생본(썸네일/중간 크기) 생성.
+EXIF 회전을 반영한 뒤 메타데이터 없이 JPEG로 다시 인코딩한다.
+파생본 경로는 내용 해시(blob) 기준이라 같은 사진이 여러 번 올라와도 한 번만 만든다.
+Pillow는 처리할 때만 불러온다 (웹 요청 경로에서 import 비용 없음).
+"""
+import io
+from django.core.files.base import ContentFile
+
+# 이름 → 긴 변 최대 픽셀 (큰 것부터 만들어 다음 크기의 원본으로 재사용)
+VARIANT_SIZES = {
+    "medium": 1280,
+    "thumb": 320,
+}
+JPEG_QUALITY = 82
+
+
+def variant_paths(key: str) -> dict:
+    return {name: f"variants/{key[:2]}/{key}/{name}.jpg" for name in VARIANT_SIZES}
+
+
+def variant_names(uploaded) -> dict:
+    return variant_paths(uploaded.blob.sha256 if uploaded.blob_id else f"u{uploaded.pk}")
+
+
+def _flatten(img):
+    from PIL import Image
+
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        # 투명 배경은 흰색으로 (JPEG는 알파가 없다)
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def _fit(size, edge):
+    w, h = size
+    scale = edge / max(w, h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def _encode(img) -> bytes:
+    buf = io.BytesIO()
+    # exif/icc 등을 넘기지 않으므로 위치 정보 같은 메타데이터는 남지 않는다
+    img.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def generate_variants(uploaded) -> dict:
+    """없는 파생본만 만들어 저장하고 {이름: 스토리지 경로}를 반환한다. 이미지가 아니면 PIL 예외/OSError."""
+    from PIL import Image, ImageOps
+
+    storage = uploaded.file.storage
+    names = variant_names(uploaded)
+    missing = [name for name in VARIANT_SIZES if not storage.exists(names[name])]
+    if not missing:
+        return names
+
+    largest = max(VARIANT_SIZES[name] for name in missing)
+    with uploaded.file.open("rb") as fp, Image.open(fp) as img:
+        # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8로 줄여 읽을 수 있다 (큰 카메라 사진의 메모리/시간 절약)
+        img.draft("RGB", (largest, largest))
+        img = _flatten(ImageOps.exif_transpose(img))
+        for name in sorted(VARIANT_SIZES, key=VARIANT_SIZES.get, reverse=True):
+            edge = VARIANT_SIZES[name]
+            if max(img.size) > edge:
+                img = img.resize(_fit(img.size, edge), Image.LANCZOS)
+            if name in missing:
+                names[name] = storage.save(names[name], ContentFile(_encode(img)))
+    return names
@@ -0,0 +1,48 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from calender.gc import (
+    DEFAULT_BATCH_SIZE, DEFAULT_GRACE, SESSION_TTL, collect_blobs, collect_sessions, collect_uploads,
+)
+
+
+class Command(BaseCommand):
+    help = "일정에 첨부되지 않은 채 유예 기간이 지난 업로드 파일, 참조가 없는 blob, 중단된 분할 업로드를 정리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-hours", type=int, default=int(DEFAULT_GRACE.total_seconds() // 3600),
+                            help="업로드 후 이 시간이 지나도록 첨부되지 않은 파일만 정리")
+        parser.add_argument("--session-hours", type=int, default=int(SESSION_TTL.total_seconds() // 3600),
+                            help="이 시간 이상 진행이 없는 분할 업로드 세션을 정리")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 정리 대상만 보고")
+        parser.add_argument("--loop", action="store_true", help="종료하지 않고 주기적으로 계속 처리")
+        parser.add_argument("--interval", type=int, default=3600, help="--loop 대기 시간(초)")
+
+    def handle(self, *args, **opts):
+        while True:
+            self._run_once(opts)
+            if not opts["loop"]:
+                return
+            time.sleep(opts["interval"])
+
+    def _run_once(self, opts):
+        now = timezone.now()
+        cutoff = now - timedelta(hours=opts["grace_hours"])
+        kwargs = {"batch_size": opts["batch_size"], "dry_run": opts["dry_run"], "report": self._report}
+
+        uploads, upload_bytes = collect_uploads(cutoff, **kwargs)
+        blobs, blob_bytes = collect_blobs(cutoff, **kwargs)
+        sessions, session_bytes = collect_sessions(now - timedelta(hours=opts["session_hours"]), **kwargs)
+
+        label = "정리 대상" if opts["dry_run"] else "정리"
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: 업로드 파일 {uploads}건, blob {blobs}건, 분할 업로드 {sessions}건 "
+            f"({upload_bytes + blob_bytes + session_bytes} bytes)"
+        ))
+
+    def _report(self, label, count):
+        if count:
+            self.stdout.write(f"{label}: {count}")
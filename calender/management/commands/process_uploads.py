@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+
+from calender.models import UploadedFile
+from calender.processing import process_uploaded_file
+
+
+class Command(BaseCommand):
+    help = "아직 후처리(이미지 파생본, 녹음 길이/파형)되지 않은 업로드 파일을 처리합니다. (백그라운드 스레드 실패/중단분 재처리 포함)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=500, help="한 번에 처리할 최대 파일 수")
+        parser.add_argument("--loop", action="store_true", help="종료하지 않고 주기적으로 계속 처리")
+        parser.add_argument("--interval", type=int, default=30, help="--loop 대기 시간(초)")
+
+    def handle(self, *args, **opts):
+        while True:
+            self._run_once(opts)
+            if not opts["loop"]:
+                return
+            time.sleep(opts["interval"])
+
+    def _run_once(self, opts):
+        pks = list(UploadedFile.objects
+                   .filter(processed_at__isnull=True)
+                   .order_by("pk")
+                   .values_list("pk", flat=True)[:opts["limit"]])
+        done = sum(1 for pk in pks if process_uploaded_file(pk))
+        self.stdout.write(self.style.SUCCESS(f"업로드 파일 {done}/{len(pks)}건 처리"))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from calender.sync import TOMBSTONE_RETENTION, prune_tombstones
+
+
+class Command(BaseCommand):
+    help = f"보관 기간({TOMBSTONE_RETENTION.days}일)이 지난 일정 삭제 기록을 정리합니다."
+
+    def handle(self, *args, **opts):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"삭제 기록 {deleted}건 정리"))
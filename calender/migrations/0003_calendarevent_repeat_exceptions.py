@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calender', '0002_uploadedfile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarevent',
+            name='repeat_exceptions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
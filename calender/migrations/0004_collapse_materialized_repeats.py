@@ -0,0 +1,88 @@
+from datetime import datetime, time, timedelta
+
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rrule, DAILY, MONTHLY, WEEKLY
+from django.db import migrations
+
+STEP = {"DAILY": timedelta(days=1), "WEEKLY": timedelta(weeks=1), "MONTHLY": relativedelta(months=1)}
+# 조회 시 전개(calender.recurrence)와 같은 규칙
+FREQ = {"DAILY": DAILY, "WEEKLY": WEEKLY, "MONTHLY": MONTHLY}
+
+# 예전 POST는 같은 요청 안에서 복제본을 만들었으므로 원본 생성 직후에 만들어진 행만 복제본으로 본다
+COPY_WINDOW = timedelta(minutes=5)
+EDITED_AFTER = timedelta(seconds=2)
+
+
+def collapse_materialized_repeats(apps, schema_editor):
+    """
+    반복 일정을 원본 한 행으로만 저장하도록 바뀌면서, 예전에 미리 만들어 둔 복제본을 정리한다.
+    원본과 내용이 같은 복제본은 삭제하고, 나중에 개별 수정된 복제본은 단일 일정으로 남긴 뒤
+    해당 날짜를 원본의 repeat_exceptions에 추가해 중복 표시되지 않게 한다.
+    복제본이 없는 날짜(사용자가 삭제했거나 옮긴 경우)도 repeat_exceptions에 넣어 다시 나타나지 않게 한다.
+    예전 날짜와 전개 결과가 다른 시리즈(29~31일에 시작한 MONTHLY: 예전 로직은 2/28로 당긴 뒤 28일에 머물고,
+    rrule은 그 날이 없는 달을 건너뛴다)는 복제본을 단일 일정으로 그대로 두고 원본도 단일 일정으로 바꾼다.
+    """
+    CalendarEvent = apps.get_model("calender", "CalendarEvent")
+
+    masters = (CalendarEvent.objects
+               .exclude(repeat_rule="NONE")
+               .filter(repeat_until__isnull=False)
+               .iterator(chunk_size=500))
+    for master in masters:
+        if master.repeat_rule not in STEP:
+            continue
+        # 예전 복제 로직과 같은 방식으로 날짜를 누적 증가
+        series_dates, current = set(), master.date
+        while True:
+            current += STEP[master.repeat_rule]
+            if current > master.repeat_until:
+                break
+            series_dates.add(current)
+
+        expanded = {
+            dt.date() for dt in rrule(
+                FREQ[master.repeat_rule],
+                dtstart=datetime.combine(master.date, time.min),
+                until=datetime.combine(master.repeat_until, time.min),
+            )
+        } - {master.date}
+        if expanded != series_dates:
+            master.repeat_rule = "NONE"
+            master.repeat_until = None
+            master.save(update_fields=["repeat_rule", "repeat_until"])
+            continue
+
+        candidates = CalendarEvent.objects.filter(
+            room_id=master.room_id,
+            repeat_rule="NONE",
+            title=master.title,
+            date__in=series_dates,
+            created_at__gte=master.created_at,
+            created_at__lte=master.created_at + COPY_WINDOW,
+        )
+        stale_ids, exceptions = [], set(master.repeat_exceptions or [])
+        covered = set()
+        for copy in candidates:
+            covered.add(copy.date)
+            if copy.updated_at - copy.created_at > EDITED_AFTER:
+                exceptions.add(copy.date.isoformat())
+            else:
+                stale_ids.append(copy.id)
+        # 복제본이 남아 있지 않은 날짜(삭제했거나 다른 날로 옮긴 경우)는 전개되지 않도록 예외로
+        exceptions.update(d.isoformat() for d in series_dates - covered)
+
+        CalendarEvent.objects.filter(id__in=stale_ids).delete()
+        if exceptions != set(master.repeat_exceptions or []):
+            master.repeat_exceptions = sorted(exceptions)
+            master.save(update_fields=["repeat_exceptions"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("calender", "0003_calendarevent_repeat_exceptions"),
+    ]
+
+    operations = [
+        migrations.RunPython(collapse_materialized_repeats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def link_uploaded_files(apps, schema_editor):
+    """숫자 file_id를 실제 UploadedFile FK로 연결 (없는 파일은 비워 둔다)"""
+    CalendarAttachment = apps.get_model("calender", "CalendarAttachment")
+    UploadedFile = apps.get_model("calender", "UploadedFile")
+
+    pending = []
+    qs = CalendarAttachment.objects.only("id", "file_id").order_by("id")
+    for att in qs.iterator(chunk_size=BATCH_SIZE):
+        if str(att.file_id).isdigit():
+            pending.append(att)
+        if len(pending) >= BATCH_SIZE:
+            _link_batch(UploadedFile, CalendarAttachment, pending)
+            pending = []
+    if pending:
+        _link_batch(UploadedFile, CalendarAttachment, pending)
+
+
+def _link_batch(UploadedFile, CalendarAttachment, attachments):
+    existing = set(UploadedFile.objects
+                   .filter(id__in={int(a.file_id) for a in attachments})
+                   .values_list("id", flat=True))
+    linked = []
+    for att in attachments:
+        if int(att.file_id) in existing:
+            att.uploaded_file_id = int(att.file_id)
+            linked.append(att)
+    CalendarAttachment.objects.bulk_update(linked, ["uploaded_file"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calender', '0005_calendarevent_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarattachment',
+            name='uploaded_file',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attachments', to='calender.uploadedfile'),
+        ),
+        migrations.RunPython(link_uploaded_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calender', '0006_calendarattachment_uploaded_file'),
+        ('room', '0003_room_deleting_at_roomdeletionjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['room', 'date', 'start_at'], name='calender_ca_room_id_673e15_idx'),
+        ),
+    ]
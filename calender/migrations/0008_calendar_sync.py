@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calender', '0007_calendarevent_room_date_index'),
+        ('room', '0003_room_deleting_at_roomdeletionjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarEventTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['room', 'updated_at', 'id'], name='calender_ca_room_id_bbbe63_idx'),
+        ),
+        migrations.AddField(
+            model_name='calendareventtombstone',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_tombstones', to='room.room'),
+        ),
+        migrations.AddIndex(
+            model_name='calendareventtombstone',
+            index=models.Index(fields=['room', 'deleted_at', 'id'], name='calender_ca_room_id_ea5100_idx'),
+        ),
+    ]
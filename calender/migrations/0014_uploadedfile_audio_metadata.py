@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:36
+
+from django.db import migrations, models
+
+
+def queue_audio(apps, schema_editor):
+    # 이미 처리된 녹음도 길이/파형을 계산하도록 다시 처리 대상으로 (process_uploads가 가져간다)
+    UploadedFile = apps.get_model("calender", "UploadedFile")
+    UploadedFile.objects.filter(type="AUDIO").update(processed_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calender', '0013_uploadedfile_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='duration_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='waveform',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(queue_audio, migrations.RunPython.noop),
+    ]
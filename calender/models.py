@@ -1,6 +1,22 @@
+import os
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from room.models import Room  
+from utils.cache import bump_room_version
+
+
+class CalendarEventQuerySet(models.QuerySet):
+    def with_details(self):
+        """상세 직렬화에 필요한 방/담당자/첨부(+업로드 파일)를 한 번에 가져온다"""
+        return self.select_related("room", "assignee").prefetch_related(
+            models.Prefetch(
+                "attachments",
+                queryset=CalendarAttachment.objects.select_related("uploaded_file").order_by("id"),
+            )
+        )
 
 
 class CalendarEvent(models.Model):
@@ -26,6 +42,17 @@ class CalendarEvent(models.Model):
         default=RepeatRule.NONE,
     )
     repeat_until = models.DateField(null=True, blank=True)
+    # 반복 일정에서 제외된 발생 날짜 목록 ["YYYY-MM-DD", ...]
+    repeat_exceptions = models.JSONField(default=list, blank=True)
+    # 반복 일정의 특정 발생분만 수정한 경우: 원본(series)과 원래 발생 날짜(original_date)
+    series = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="overrides",
+    )
+    original_date = models.DateField(null=True, blank=True)
     description = models.CharField(
         max_length=50,  # 50자 제한
         null=True,
@@ -44,13 +71,52 @@ class CalendarEvent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CalendarEventQuerySet.as_manager()
+
     class Meta:
         ordering = ["start_at"]
+        indexes = [
+            models.Index(fields=['room', 'date', 'start_at']),
+            models.Index(fields=['room', 'updated_at', 'id']),
+            models.Index(fields=['assignee', 'end_at']),
+        ]
 
     def __str__(self):
         return f"[{self.room_id}] {self.title} ({self.date})"
 
 
+@receiver([post_save, post_delete], sender=CalendarEvent)
+def bump_calendar_cache(sender, instance, **kwargs):
+    bump_room_version(instance.room_id, "calendar")
+
+
+class CalendarEventTombstone(models.Model):
+    """삭제된 일정 기록 (증분 동기화에서 deleted 목록으로 내려준다)"""
+    room = models.ForeignKey(
+        Room,
+        on_delete=models.CASCADE,
+        related_name="calendar_tombstones",
+    )
+    event_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['room', 'deleted_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"[{self.room_id}] deleted event {self.event_id}"
+
+
+@receiver(post_delete, sender=CalendarEvent)
+def record_calendar_tombstone(sender, instance, origin=None, **kwargs):
+    # 방 자체를 지우는 중이면 기록할 필요가 없다 (기록하면 방 삭제가 FK에 막힌다)
+    if isinstance(origin, Room) or getattr(origin, "model", None) is Room:
+        return
+    CalendarEventTombstone.objects.create(room_id=instance.room_id, event_id=instance.pk)
+
+
 class CalendarAttachment(models.Model):
     class AttachmentType(models.TextChoices):
         IMAGE = "IMAGE", "Image"
@@ -62,6 +128,14 @@ class CalendarAttachment(models.Model):
         related_name="attachments",
     )
     file_id = models.CharField(max_length=255)
+    # file_id가 가리키는 업로드 파일 (URL 계산 시 한 번에 join하기 위한 실제 FK)
+    uploaded_file = models.ForeignKey(
+        "UploadedFile",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="attachments",
+    )
     type = models.CharField(max_length=10, choices=AttachmentType.choices)
 
     
@@ -70,19 +144,111 @@ class CalendarAttachment(models.Model):
     def __str__(self):
         return f"{self.type} - {self.file_id}"
 
+def blob_upload_to(instance, filename):
+    # 내용 해시로 경로를 정한다 (같은 내용은 같은 경로, 디렉터리당 파일 수 분산)
+    ext = os.path.splitext(filename)[1].lower()[:10]
+    return f"blobs/{instance.sha256[:2]}/{instance.sha256[2:4]}/{instance.sha256}{ext}"
+
+
+class FileBlob(models.Model):
+    """내용(sha256) 단위로 한 번만 저장하는 실제 파일. 여러 UploadedFile이 공유한다."""
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=blob_upload_to)
+    size = models.BigIntegerField()
+    # 이 blob을 가리키는 UploadedFile 수 (0이 되면 정리 대상)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
+
 class UploadedFile(models.Model):
     class FileType(models.TextChoices):
         IMAGE = "IMAGE", "Image"
         AUDIO = "AUDIO", "Audio"
 
-    # 이미지, 녹음 파일 둘 다 해당 필드에 저장
+    # 이미지, 녹음 파일 둘 다 해당 필드에 저장 (blob이 있으면 blob과 같은 경로)
     file = models.FileField(upload_to="uploads/%Y/%m/%d/")
+    blob = models.ForeignKey(
+        FileBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="uploads",
+    )
     type = models.CharField(max_length=10, choices=FileType.choices)
+    # 첨부 전(임시 저장 등)에도 올린 사람은 내려받을 수 있도록
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="uploaded_files",
+    )
+    # 업로드 후 백그라운드 처리 결과. 이미지: {"thumb": 경로, "medium": 경로}
+    variants = models.JSONField(default=dict, blank=True)
+    # 녹음: 재생 길이와 목록 표시용 파형(0~255 진폭 배열). PCM WAV만 계산된다.
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    waveform = models.JSONField(default=list, blank=True)
+    # None이면 아직 처리 전 (워커가 가져간다)
+    processed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['processed_at']),
+        ]
+
     def __str__(self):
         return f"{self.type} - {self.id}"
 
     @property
     def file_id(self) -> str:
-        return str(self.id)
\ No newline at end of file
+        return str(self.id)
+
+
+@receiver(post_delete, sender=UploadedFile)
+def release_file_blob(sender, instance, **kwargs):
+    # 파일 자체는 여기서 지우지 않는다 (ref_count 0인 blob은 정리 작업에서 유예 기간 후 삭제)
+    if instance.blob_id:
+        FileBlob.objects.filter(pk=instance.blob_id).update(ref_count=models.F("ref_count") - 1)
+
+
+class UploadSession(models.Model):
+    """재개 가능한 분할 업로드. 받은 조각은 임시 파일에 이어 쓰고, 완료되면 UploadedFile이 되고 삭제된다."""
+    upload_id = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    type = models.CharField(max_length=10, choices=UploadedFile.FileType.choices)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    # 앞에서부터 빈틈없이 받은 바이트 수 (다음 조각의 offset)
+    received = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"upload {self.upload_id} ({self.received}/{self.size})"
+
+
+class CalendarFeedToken(models.Model):
+    """외부 캘린더 앱 구독용 ICS 피드 토큰 (사용자당 1개, 재발급 시 교체)"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="calendar_feed_token",
+    )
+    token = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"feed token of user {self.user_id}"
@@ -0,0 +1,73 @@
+# calender/processing.py
+"""
+업로드 파일 후처리 (업로드 응답과 분리해 커밋 이후 백그라운드에서 실행).
+BACKGROUND_THREADS=False 환경이나 실패/중단분은 process_uploads 관리 명령이 processed_at이 빈 행을 다시 처리한다.
+"""
+import logging
+import wave
+from django.utils import timezone
+
+from utils.background import run_in_background
+from .audio import analyze_wav
+from .models import UploadedFile
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_processing(uploaded):
+    run_in_background(process_uploaded_file, uploaded.pk)
+
+
+def _image_variants(uploaded) -> dict:
+    from PIL import Image
+    from .images import generate_variants
+
+    try:
+        return generate_variants(uploaded)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # 깨진 파일/이미지가 아닌 파일은 원본만 제공 (다시 시도하지 않음)
+        logger.warning("image variants skipped: uploaded_file=%s (%s)", uploaded.pk, e)
+        return {}
+
+
+def _audio_metadata(uploaded) -> dict:
+    try:
+        with uploaded.file.open("rb") as fp:
+            return analyze_wav(fp)
+    except (wave.Error, EOFError, OSError, ValueError) as e:
+        # m4a 등 표준 라이브러리로 해석할 수 없는 형식은 원본만 제공
+        logger.info("audio metadata skipped: uploaded_file=%s (%s)", uploaded.pk, e)
+        return {}
+
+
+def process_uploaded_file(pk: int, force: bool = False) -> bool:
+    """
+    종류별 후처리 결과(이미지 파생본, 녹음 길이/파형)를 저장한다. 이미 처리된 행은 force가 아니면 건너뛴다.
+    Pillow가 없는 환경이면 미처리로 남겨 두고 False.
+    """
+    qs = UploadedFile.objects.select_related("blob").filter(pk=pk)
+    if not force:
+        qs = qs.filter(processed_at__isnull=True)
+    uploaded = qs.first()
+    if uploaded is None:
+        return False
+
+    fields = {}
+    try:
+        if uploaded.type == UploadedFile.FileType.IMAGE:
+            fields["variants"] = _image_variants(uploaded)
+        elif uploaded.type == UploadedFile.FileType.AUDIO:
+            fields.update(_audio_metadata(uploaded))
+    except ImportError as e:
+        logger.warning("upload processing unavailable: %s", e)
+        return False
+
+    UploadedFile.objects.filter(pk=pk).update(**fields, processed_at=timezone.now())
+    return True
+
+
+def ensure_variants(uploaded) -> dict:
+    """파생본 요청 시점에 아직 처리 전이면 그 자리에서 만든다 (백그라운드 처리의 대체 경로)"""
+    if uploaded.processed_at is None and process_uploaded_file(uploaded.pk):
+        uploaded.refresh_from_db(fields=["variants", "processed_at"])
+    return uploaded.variants or {}
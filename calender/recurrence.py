@@ -0,0 +1,127 @@
+# calender/recurrence.py
+"""
+반복 일정은 원본 한 행(repeat_rule, repeat_until, repeat_exceptions)으로만 저장하고
+조회 시 요청 구간 안의 발생분만 계산한다.
+"""
+import copy
+import heapq
+import itertools
+from datetime import datetime, time, timedelta
+from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY
+from django.db.models import Q
+
+from .models import CalendarEvent
+
+FREQ = {
+    CalendarEvent.RepeatRule.DAILY: DAILY,
+    CalendarEvent.RepeatRule.WEEKLY: WEEKLY,
+    CalendarEvent.RepeatRule.MONTHLY: MONTHLY,
+}
+
+# 반복 원본 행 조건 (repeat_until 없는 반복은 단일 일정으로 취급)
+SERIES = ~Q(repeat_rule=CalendarEvent.RepeatRule.NONE) & Q(repeat_until__isnull=False)
+
+
+def is_recurring(event) -> bool:
+    return event.repeat_rule in FREQ and event.repeat_until is not None
+
+
+def iter_occurrence_dates(event, start=None, end=None):
+    """[start, end] 구간의 발생 날짜를 오름차순으로 (제외 날짜 제외, 양 끝 포함)"""
+    if not is_recurring(event):
+        if (start is None or event.date >= start) and (end is None or event.date <= end):
+            yield event.date
+        return
+
+    until = event.repeat_until if end is None else min(end, event.repeat_until)
+    if until < event.date:
+        return
+    rule = rrule(
+        FREQ[event.repeat_rule],
+        dtstart=datetime.combine(event.date, time.min),
+        until=datetime.combine(until, time.min),
+    )
+    if start is not None and start > event.date:
+        dts = rule.xafter(datetime.combine(start, time.min), inc=True)
+    else:
+        dts = iter(rule)
+
+    skipped = set(event.repeat_exceptions or ())
+    for dt in dts:
+        d = dt.date()
+        if d.isoformat() not in skipped:
+            yield d
+
+
+def make_occurrence(event, occ_date):
+    """원본을 occ_date로 옮긴 사본 (저장하지 않는 읽기 전용 인스턴스)"""
+    occ = copy.copy(event)
+    delta = timedelta(days=(occ_date - event.date).days)
+    occ.date = occ_date
+    occ.start_at = event.start_at + delta
+    occ.end_at = event.end_at + delta
+    occ.occurrence_date = occ_date
+    return occ
+
+
+def occurrence_key(occ):
+    return (occ.date, occ.start_at, occ.id)
+
+
+def overlapping(qs, start=None, end=None):
+    """[start, end] 구간에 발생분이 있을 수 있는 행만 (단일 일정 + 구간과 겹치는 반복 원본)"""
+    single = ~SERIES
+    series = SERIES
+    if start is not None:
+        single &= Q(date__gte=start)
+        series &= Q(repeat_until__gte=start)
+    if end is not None:
+        single &= Q(date__lte=end)
+        series &= Q(date__lte=end)
+    return qs.filter(single | series)
+
+
+def expand(events, start=None, end=None) -> list:
+    occurrences = [
+        make_occurrence(event, d)
+        for event in events
+        for d in iter_occurrence_dates(event, start, end)
+    ]
+    occurrences.sort(key=occurrence_key)
+    return occurrences
+
+
+def _after_key(key):
+    """(date, start_at, id) 키셋 이후 조건"""
+    d, start_at, pk = key
+    return (Q(date__gt=d)
+            | Q(date=d, start_at__gt=start_at)
+            | Q(date=d, start_at=start_at, id__gt=pk))
+
+
+def iter_upcoming(qs, start, after=None, singles_limit=None):
+    """
+    start 이후 발생분을 (date, start_at, id) 순으로 끝없이 내보내는 스트림.
+    after가 주어지면 그 키 다음부터. 반복 원본별 발생 스트림을 k-way merge
+    """
+    singles = qs.filter(~SERIES, date__gte=start)
+    if after is not None:
+        singles = singles.filter(_after_key(after))
+        start = max(start, after[0])
+    singles = singles.order_by("date", "start_at", "id")
+    if singles_limit is not None:
+        singles = singles[:singles_limit]
+
+    streams = [
+        (make_occurrence(event, d) for d in iter_occurrence_dates(event, start))
+        for event in qs.filter(SERIES, repeat_until__gte=start)
+    ]
+    merged = heapq.merge(singles, *streams, key=occurrence_key)
+    if after is not None:
+        merged = itertools.dropwhile(lambda occ: occurrence_key(occ) <= after, merged)
+    return merged
+
+
+def upcoming(qs, start, limit: int, after=None) -> list:
+    """start(또는 after 키) 이후 가장 가까운 limit개 발생분"""
+    return list(itertools.islice(iter_upcoming(qs, start, after, singles_limit=limit), limit))
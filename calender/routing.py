@@ -0,0 +1,7 @@
+# calender/routing.py
+from django.urls import re_path
+from .consumers import CalendarRoomConsumer
+
+websocket_urlpatterns = [
+    re_path(r"^ws/rooms/(?P<room_id>\d+)/calendar/$", CalendarRoomConsumer.as_asgi()),
+]
@@ -1,8 +1,11 @@
 from rest_framework import serializers
-from .models import CalendarEvent, CalendarAttachment, UploadedFile
+from .models import CalendarEvent, CalendarAttachment, UploadedFile, UploadSession
+from .series import SCOPES
 from user.models import CustomUser as User
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timezone as dt_timezone
+from .images import VARIANT_SIZES
 
 
 class CalendarAttachmentInputSerializer(serializers.Serializer):
@@ -10,24 +13,56 @@ class CalendarAttachmentInputSerializer(serializers.Serializer):
     type = serializers.ChoiceField(choices=CalendarAttachment.AttachmentType.choices)
 
 
+def _absolute(context, name, *args) -> str:
+    """
+    reverse + build_absolute_uri 결과를 시리얼라이저 context(= 한 응답) 안에서 재사용한다.
+    반복 일정 전개나 여러 일정에 같은 첨부가 나오면 같은 주소를 다시 만들지 않는다.
+    """
+    memo = context.setdefault("_absolute_urls", {})
+    key = (name, *args)
+    if key not in memo:
+        url = reverse(name, args=args)
+        request = context.get("request")
+        memo[key] = request.build_absolute_uri(url) if request is not None else url
+    return memo[key]
+
+
+def file_url(uploaded, context) -> str:
+    """업로드 파일 내려받기 주소 (미디어 경로를 직접 노출하지 않고 권한 확인 엔드포인트를 거친다)"""
+    if uploaded is None:
+        return ""
+    return _absolute(context, "file-download", uploaded.pk)
+
+
+def variant_urls(uploaded, context) -> dict:
+    """이미지 크기별 주소. 파생본이 아직 없으면 그 요청에서 만들어지고, 만들 수 없으면 원본이 내려간다."""
+    if uploaded is None or uploaded.type != UploadedFile.FileType.IMAGE:
+        return {}
+    return {name: _absolute(context, "file-variant", uploaded.pk, name) for name in VARIANT_SIZES}
+
+
 class CalendarAttachmentSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()  
+    variants = serializers.SerializerMethodField()
+    duration_ms = serializers.SerializerMethodField()
+    waveform = serializers.SerializerMethodField()
+
     class Meta:
         model = CalendarAttachment
-        fields = ("id", "type", "url", "file_id")
+        fields = ("id", "type", "url", "variants", "duration_ms", "waveform", "file_id")
 
     def get_url(self, obj):
-        try:
-            uploaded = UploadedFile.objects.get(id=int(obj.file_id))
-        except (UploadedFile.DoesNotExist, ValueError, TypeError):
-            return ""
-
-        request = self.context.get("request")
-        if uploaded.file and hasattr(uploaded.file, "url"):
-            if request is not None:
-                return request.build_absolute_uri(uploaded.file.url)
-            return uploaded.file.url
-        return ""
+        # uploaded_file은 조회 시 select_related로 함께 가져온다 (추가 쿼리 없음)
+        return file_url(obj.uploaded_file, self.context)
+
+    def get_variants(self, obj):
+        return variant_urls(obj.uploaded_file, self.context)
+
+    def get_duration_ms(self, obj):
+        return obj.uploaded_file.duration_ms if obj.uploaded_file else None
+
+    def get_waveform(self, obj):
+        return obj.uploaded_file.waveform if obj.uploaded_file else []
 
 
 class AssigneeSerializer(serializers.ModelSerializer):
@@ -38,6 +73,8 @@ class AssigneeSerializer(serializers.ModelSerializer):
 
 class CalendarEventSummarySerializer(serializers.ModelSerializer):
     assignee = AssigneeSerializer(read_only=True)
+    # 반복 발생분은 원본 id + occurrence_date로 수정/삭제 대상을 지정한다
+    occurrence_date = serializers.SerializerMethodField()
     start_at = serializers.SerializerMethodField()
     end_at = serializers.SerializerMethodField()
 
@@ -51,6 +88,9 @@ class CalendarEventSummarySerializer(serializers.ModelSerializer):
             "end_at",
             "assignee",
             "is_all_day",
+            "repeat_rule",
+            "series_id",
+            "occurrence_date",
         )
 
     def to_local(self, dt):
@@ -68,6 +108,10 @@ class CalendarEventSummarySerializer(serializers.ModelSerializer):
     def get_end_at(self, obj):
         return self.to_local(obj.end_at)
 
+    def get_occurrence_date(self, obj):
+        occ = getattr(obj, "occurrence_date", None) or obj.original_date or obj.date
+        return occ.isoformat()
+
 
 
 class CalendarEventSerializer(serializers.ModelSerializer):
@@ -90,6 +134,9 @@ class CalendarEventSerializer(serializers.ModelSerializer):
             "is_all_day",
             "repeat_rule",
             "repeat_until",
+            "repeat_exceptions",
+            "series_id",
+            "original_date",
             "description",
             "attachments",
             "assignee",
@@ -123,6 +170,8 @@ class CalendarEventCreateUpdateSerializer(serializers.Serializer):
     description = serializers.CharField(required=False, max_length=50, allow_blank=True)
     attachments = CalendarAttachmentInputSerializer(many=True, required=False, allow_null=True)
     assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    # true면 담당자의 다른 일정/확정 근무와 겹칠 때 저장하지 않고 409로 알려준다
+    check_conflicts = serializers.BooleanField(required=False, default=False)
 
     def validate(self, attrs):
         instance = self.instance
@@ -150,18 +199,80 @@ class CalendarEventCreateUpdateSerializer(serializers.Serializer):
         return attrs
 
 
+class ConflictQuerySerializer(serializers.Serializer):
+    assignee_id = serializers.IntegerField(required=False)
+    start_at = serializers.DateTimeField()
+    end_at = serializers.DateTimeField()
+    exclude_event_id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if attrs["start_at"] >= attrs["end_at"]:
+            raise serializers.ValidationError({
+                "error_code": "CALENDAR_TIME_RANGE_INVALID",
+                "message": "시작 시간이 종료 시간보다 늦을 수 없습니다.",
+                "detail": {"fields": ["start_at", "end_at"]},
+            })
+        return attrs
+
+
+# 한 번의 묶음 요청에 담을 수 있는 작업 수
+BATCH_MAX_OPERATIONS = 100
+
+
+class CalendarBatchOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=("create", "update", "delete"))
+    # update/delete 대상 (반복 일정은 scope/occurrence_date로 범위 지정, 단건 API의 쿼리와 같은 의미)
+    id = serializers.IntegerField(required=False)
+    scope = serializers.ChoiceField(choices=SCOPES, required=False)
+    occurrence_date = serializers.DateField(required=False)
+    # create/update 내용 (CalendarEventCreateUpdateSerializer 형식, 작업별로 따로 검증)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and not attrs.get("id"):
+            raise serializers.ValidationError({"id": ["update/delete 작업에는 id가 필요합니다."]})
+        return attrs
+
+
+class CalendarBatchSerializer(serializers.Serializer):
+    operations = CalendarBatchOperationSerializer(many=True, allow_empty=False, max_length=BATCH_MAX_OPERATIONS)
+
+
 class UploadedFileSerializer(serializers.ModelSerializer):
     file_id = serializers.ReadOnlyField()
     url = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
 
     class Meta:
         model = UploadedFile
-        fields = ["file_id", "type", "url"]
+        fields = ["file_id", "type", "url", "variants", "duration_ms", "waveform"]
 
     def get_url(self, obj):
-        request = self.context.get("request")
-        if obj.file and hasattr(obj.file, "url"):
-            if request is not None:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return ""
+        return file_url(obj, self.context)
+
+    def get_variants(self, obj):
+        return variant_urls(obj, self.context)
+
+
+class UploadSessionCreateSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=UploadedFile.FileType.choices)
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+
+    def validate_size(self, value):
+        max_size = self.context.get("max_size")
+        if max_size and value > max_size:
+            raise serializers.ValidationError(f"최대 {max_size} 바이트까지 업로드할 수 있습니다.")
+        return value
+
+
+class UploadSessionCompleteSerializer(serializers.Serializer):
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$")
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    offset = serializers.IntegerField(source="received", read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ("upload_id", "type", "filename", "size", "offset", "created_at", "updated_at")
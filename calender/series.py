@@ -0,0 +1,275 @@
+# calender/series.py
+"""
+반복 일정 수정/삭제 범위 처리.
+- this: 해당 발생분만 (원본에 제외 날짜 추가 + 필요 시 개별 수정본 생성)
+- following: 해당 발생분부터 (원본을 전날에서 끊고 새 원본으로 분리)
+- all: 원본과 개별 수정본 전체 (한 번의 UPDATE/DELETE)
+"""
+import copy
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from utils.cache import bump_room_version
+from .models import CalendarEvent, CalendarAttachment
+from .conflicts import occurrence_intervals
+from .recurrence import is_recurring, iter_occurrence_dates, make_occurrence
+from .utils import build_attachments
+
+SCOPE_THIS = "this"
+SCOPE_FOLLOWING = "following"
+SCOPE_ALL = "all"
+SCOPES = (SCOPE_THIS, SCOPE_FOLLOWING, SCOPE_ALL)
+
+# 발생 날짜 기준으로 주어지므로 원본에 반영할 때 날짜 차이만큼 옮겨야 하는 필드
+TEMPORAL_FIELDS = ("date", "start_at", "end_at")
+# 시리즈 규칙 자체에 해당해 원본에만 반영하는 필드
+RULE_FIELDS = ("repeat_rule", "repeat_until")
+# 개별 수정본까지 한 번에 반영하는 필드
+COMMON_FIELDS = ("title", "description", "is_all_day", "assignee")
+
+# 새 행을 만들 때 원본에서 그대로 가져오는 필드
+COPY_FIELDS = ("room_id", "title", "start_at", "end_at", "is_all_day", "description", "assignee_id")
+
+
+def resolve_target(event, occurrence_date=None):
+    """
+    (원본, 발생 날짜, 개별 수정본)을 반환한다. 반복 일정이 아니면 원본은 None.
+    발생 날짜가 시리즈에 없으면 ValueError.
+    """
+    if event.series_id:
+        return event.series, event.original_date, event
+    if not is_recurring(event):
+        return None, event.date, event
+
+    occ_date = occurrence_date or event.date
+    if next(iter_occurrence_dates(event, occ_date, occ_date), None) is None:
+        raise ValueError(occ_date)
+    return event, occ_date, None
+
+
+def default_scope(event) -> str:
+    return SCOPE_THIS if event.series_id else SCOPE_ALL
+
+
+def _series_rows(master):
+    return CalendarEvent.objects.filter(Q(pk=master.pk) | Q(series=master))
+
+
+def _shift(changes: dict, days: int) -> dict:
+    """발생 날짜 기준 값을 days만큼 앞당겨 원본 기준으로 바꾼다"""
+    delta = timedelta(days=days)
+    return {f: changes[f] - delta for f in TEMPORAL_FIELDS if f in changes}
+
+
+def _pick(changes: dict, fields) -> dict:
+    return {f: changes[f] for f in fields if f in changes}
+
+
+def _copy_event(source, **overrides) -> CalendarEvent:
+    values = {f: getattr(source, f) for f in COPY_FIELDS}
+    # Model.__init__은 assignee 다음에 assignee_id를 적용하므로, 남겨 두면 바꾼 담당자를 원본 값이 덮어쓴다
+    if "assignee" in overrides:
+        values.pop("assignee_id")
+    values.update(overrides)
+    return CalendarEvent(**values)
+
+
+def _shift_exceptions(exceptions, moved: timedelta) -> list:
+    """원본 날짜를 옮길 때 제외 날짜(ISO 문자열)도 같은 만큼 옮긴다"""
+    return sorted((date.fromisoformat(d) + moved).isoformat() for d in exceptions or [])
+
+
+def _replace_attachments(event, attachments):
+    CalendarAttachment.objects.filter(event=event).delete()
+    CalendarAttachment.objects.bulk_create(build_attachments(event, attachments))
+
+
+def _copy_attachments(source, target):
+    CalendarAttachment.objects.bulk_create([
+        CalendarAttachment(
+            event=target, file_id=att.file_id, uploaded_file_id=att.uploaded_file_id, type=att.type, url=att.url,
+        )
+        for att in source.attachments.all()
+    ])
+
+
+def _apply(event, changes: dict, attachments=None):
+    for field, value in changes.items():
+        setattr(event, field, value)
+    if changes:
+        event.save()
+    if attachments is not None:
+        _replace_attachments(event, attachments)
+    return event
+
+
+def _split_exceptions(master, occ_date):
+    before, after = [], []
+    for d in master.repeat_exceptions or []:
+        (after if d >= occ_date.isoformat() else before).append(d)
+    return before, after
+
+
+def _update_all(master, occ_date, changes, attachments):
+    now = timezone.now()
+    common = _pick(changes, COMMON_FIELDS)
+    own = {**_shift(changes, (occ_date - master.date).days), **_pick(changes, RULE_FIELDS)}
+    if own.get("repeat_rule") == CalendarEvent.RepeatRule.NONE:
+        own["repeat_until"] = None
+    # 원본 날짜가 바뀌면 시리즈 전체가 옮겨지므로 제외 날짜와 개별 수정본의 원래 날짜도 같은 날수만큼 옮긴다
+    moved = own["date"] - master.date if "date" in own else timedelta(0)
+    if moved:
+        own["repeat_exceptions"] = _shift_exceptions(master.repeat_exceptions, moved)
+
+    if common:
+        _series_rows(master).update(**common, updated_at=now)
+    if own:
+        CalendarEvent.objects.filter(pk=master.pk).update(**own, updated_at=now)
+    if moved:
+        overrides = list(CalendarEvent.objects.filter(series=master).only("pk", "original_date"))
+        for override in overrides:
+            override.original_date += moved
+            override.updated_at = now
+        CalendarEvent.objects.bulk_update(overrides, ["original_date", "updated_at"])
+    if attachments is not None:
+        _replace_attachments(master, attachments)
+    # QuerySet.update는 post_save를 보내지 않으므로 캐시 버전을 직접 올린다
+    bump_room_version(master.room_id, "calendar")
+
+    master.refresh_from_db()
+    return master
+
+
+def _update_this(master, occ_date, override, changes, attachments):
+    if override is not None:
+        return _apply(override, changes, attachments)
+
+    offset = timedelta(days=(occ_date - master.date).days)
+    values = {
+        "date": occ_date,
+        "start_at": master.start_at + offset,
+        "end_at": master.end_at + offset,
+        **{f: changes[f] for f in changes if f not in RULE_FIELDS},
+    }
+    override = _copy_event(master, series=master, original_date=occ_date, **values)
+    override.save()
+    if attachments is None:
+        _copy_attachments(master, override)
+    else:
+        _replace_attachments(override, attachments)
+
+    master.repeat_exceptions = sorted(set(master.repeat_exceptions or []) | {occ_date.isoformat()})
+    master.save(update_fields=["repeat_exceptions", "updated_at"])
+    return override
+
+
+def _update_following(master, occ_date, changes, attachments):
+    if occ_date <= master.date:
+        return _update_all(master, occ_date, changes, attachments)
+
+    before, after = _split_exceptions(master, occ_date)
+    offset = timedelta(days=(occ_date - master.date).days)
+    values = {
+        "date": occ_date,
+        "start_at": master.start_at + offset,
+        "end_at": master.end_at + offset,
+        "repeat_rule": master.repeat_rule,
+        "repeat_until": master.repeat_until,
+        "repeat_exceptions": after,
+        **changes,
+    }
+    if values["repeat_rule"] == CalendarEvent.RepeatRule.NONE:
+        values["repeat_until"] = None
+    new_master = _copy_event(master, **values)
+    new_master.save()
+    if attachments is None:
+        _copy_attachments(master, new_master)
+    else:
+        _replace_attachments(new_master, attachments)
+
+    # 이후 개별 수정본은 새 원본으로 옮기고 공통 필드를 함께 반영
+    now = timezone.now()
+    CalendarEvent.objects.filter(series=master, original_date__gte=occ_date).update(
+        series=new_master, **_pick(changes, COMMON_FIELDS), updated_at=now,
+    )
+
+    master.repeat_until = occ_date - timedelta(days=1)
+    master.repeat_exceptions = before
+    master.save(update_fields=["repeat_until", "repeat_exceptions", "updated_at"])
+    return new_master
+
+
+def preview_intervals(event, scope, occurrence_date, changes: dict):
+    """
+    수정 결과로 생길 발생 구간들과, 겹침 검사에서 제외할 기존 일정 조건을 계산한다 (저장하지 않음).
+    발생 날짜가 시리즈에 없으면 ValueError.
+    """
+    master, occ_date, override = resolve_target(event, occurrence_date)
+    if master is None:
+        preview = copy.copy(event)
+        for field, value in changes.items():
+            setattr(preview, field, value)
+        return occurrence_intervals(preview), Q(pk=event.pk)
+
+    exclude = Q(pk=master.pk) | Q(series=master)
+    if scope == SCOPE_THIS:
+        preview = copy.copy(override) if override is not None else make_occurrence(master, occ_date)
+        preview.repeat_rule = CalendarEvent.RepeatRule.NONE
+        for field, value in changes.items():
+            if field not in RULE_FIELDS:
+                setattr(preview, field, value)
+        return occurrence_intervals(preview), exclude
+
+    preview = copy.copy(master)
+    values = {**_pick(changes, COMMON_FIELDS), **_pick(changes, RULE_FIELDS),
+              **_shift(changes, (occ_date - master.date).days)}
+    for field, value in values.items():
+        setattr(preview, field, value)
+    if scope == SCOPE_ALL and "date" in values:
+        preview.repeat_exceptions = _shift_exceptions(master.repeat_exceptions, values["date"] - master.date)
+    start = occ_date if scope == SCOPE_FOLLOWING else None
+    return occurrence_intervals(preview, start), exclude
+
+
+def update_occurrences(event, scope, occurrence_date, changes: dict, attachments=None):
+    """
+    changes는 모델 필드 → 값 (date/start_at/end_at은 편집한 발생분 기준).
+    attachments가 None이 아니면 대상 행의 첨부를 교체한다. 결과 행을 반환.
+    """
+    master, occ_date, override = resolve_target(event, occurrence_date)
+    with transaction.atomic():
+        if master is None:
+            return _apply(event, changes, attachments)
+        if scope == SCOPE_THIS:
+            return _update_this(master, occ_date, override, changes, attachments)
+        if scope == SCOPE_FOLLOWING:
+            return _update_following(master, occ_date, changes, attachments)
+        return _update_all(master, occ_date, changes, attachments)
+
+
+def delete_occurrences(event, scope, occurrence_date=None) -> int:
+    """삭제된 행 수를 반환한다 (제외 날짜만 추가한 경우 0)"""
+    master, occ_date, override = resolve_target(event, occurrence_date)
+    with transaction.atomic():
+        if master is None:
+            return event.delete()[1].get(CalendarEvent._meta.label, 0)
+
+        if scope == SCOPE_ALL or (scope == SCOPE_FOLLOWING and occ_date <= master.date):
+            return _series_rows(master).delete()[1].get(CalendarEvent._meta.label, 0)
+
+        if scope == SCOPE_THIS:
+            if override is not None:
+                # 원본의 제외 날짜는 그대로 두어야 원래 발생분이 다시 나타나지 않는다
+                return override.delete()[1].get(CalendarEvent._meta.label, 0)
+            master.repeat_exceptions = sorted(set(master.repeat_exceptions or []) | {occ_date.isoformat()})
+            master.save(update_fields=["repeat_exceptions", "updated_at"])
+            return 0
+
+        before, _ = _split_exceptions(master, occ_date)
+        deleted = CalendarEvent.objects.filter(series=master, original_date__gte=occ_date).delete()
+        master.repeat_until = occ_date - timedelta(days=1)
+        master.repeat_exceptions = before
+        master.save(update_fields=["repeat_until", "repeat_exceptions", "updated_at"])
+        return deleted[1].get(CalendarEvent._meta.label, 0)
@@ -0,0 +1,66 @@
+# calender/summary.py
+"""
+월간 달력 그리드용 날짜별 요약 (일정 개수 + 앞쪽 몇 개 제목).
+직렬화 없이 값만 조회하고, 방의 calendar 버전으로 캐시한다.
+"""
+import calendar
+from datetime import date
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from utils.cache import cached_room_section
+from .models import CalendarEvent
+from .recurrence import SERIES, iter_occurrence_dates
+
+SUMMARY_TITLES = 3
+
+
+def month_range(year: int, month: int):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _load_month_summary(room_id: int, start: date, end: date) -> list[dict]:
+    days = {}
+
+    # 단일 일정: 날짜별 개수와 상위 제목을 윈도 함수로 한 번에
+    by_day = [F("date")]
+    rows = (
+        CalendarEvent.objects
+        .filter(~SERIES, room_id=room_id, date__range=(start, end))
+        .annotate(
+            rank=Window(RowNumber(), partition_by=by_day, order_by=[F("start_at").asc(), F("id").asc()]),
+            day_count=Window(Count("id"), partition_by=by_day),
+        )
+        .filter(rank__lte=SUMMARY_TITLES)
+        .values_list("date", "start_at", "id", "title", "day_count")
+    )
+    for day, start_at, pk, title, day_count in rows:
+        entry = days.setdefault(day, {"count": day_count, "titles": []})
+        entry["titles"].append((start_at.time(), pk, title))
+
+    # 반복 일정: 이 달과 겹치는 원본만 가져와 발생 날짜만 계산
+    masters = (CalendarEvent.objects
+               .filter(SERIES, room_id=room_id, date__lte=end, repeat_until__gte=start)
+               .only("id", "title", "date", "start_at", "repeat_rule", "repeat_until", "repeat_exceptions"))
+    for master in masters:
+        for day in iter_occurrence_dates(master, start, end):
+            entry = days.setdefault(day, {"count": 0, "titles": []})
+            entry["count"] += 1
+            entry["titles"].append((master.start_at.time(), master.id, master.title))
+
+    return [
+        {
+            "date": day.isoformat(),
+            "count": entry["count"],
+            "titles": [title for *_, title in sorted(entry["titles"])[:SUMMARY_TITLES]],
+        }
+        for day, entry in sorted(days.items())
+    ]
+
+
+def get_month_summary(room_id: int, year: int, month: int) -> list[dict]:
+    start, end = month_range(year, month)
+    return cached_room_section(
+        room_id, "calendar", lambda: _load_month_summary(room_id, start, end),
+        "month_summary", f"{year:04d}-{month:02d}",
+    )
@@ -0,0 +1,102 @@
+# calender/sync.py
+"""
+일정 증분 동기화.
+sync_token은 (updated_at, id) / (deleted_at, id) 두 커서를 서명해 담은 불투명 문자열이다.
+클라이언트는 토큰이 없으면 전체를, 있으면 그 이후 변경분만 받아 로컬 저장소에 반영한다.
+"""
+from datetime import datetime, timedelta
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import CalendarEvent, CalendarEventTombstone
+
+SYNC_SALT = "calender.sync"
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 500
+# 이보다 오래된 삭제 기록은 정리되므로, 그보다 오래전에 발급된 토큰은 전체 재동기화가 필요하다
+TOMBSTONE_RETENTION = timedelta(days=90)
+
+
+class SyncTokenExpired(Exception):
+    pass
+
+
+def encode_token(room_id: int, event_cursor, tombstone_cursor) -> str:
+    return signing.dumps(
+        {
+            "r": room_id,
+            "e": [event_cursor[0].isoformat(), event_cursor[1]],
+            "t": [tombstone_cursor[0].isoformat(), tombstone_cursor[1]],
+        },
+        salt=SYNC_SALT,
+        compress=True,
+    )
+
+
+def decode_token(token: str, room_id: int):
+    """((updated_at, id), (deleted_at, id)). 위조/다른 방 토큰이면 ValueError, 만료면 SyncTokenExpired"""
+    try:
+        data = signing.loads(token, salt=SYNC_SALT, max_age=TOMBSTONE_RETENTION)
+    except signing.SignatureExpired:
+        raise SyncTokenExpired()
+    except signing.BadSignature as e:
+        raise ValueError(str(e))
+    try:
+        if data["r"] != room_id:
+            raise ValueError("room mismatch")
+        event_cursor = (datetime.fromisoformat(data["e"][0]), int(data["e"][1]))
+        tombstone_cursor = (datetime.fromisoformat(data["t"][0]), int(data["t"][1]))
+    except (KeyError, TypeError, IndexError) as e:
+        raise ValueError(str(e))
+    return event_cursor, tombstone_cursor
+
+
+def _after(field: str, cursor):
+    value, pk = cursor
+    return Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+
+
+def sync_page(room_id: int, token=None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    token 이후 변경된 일정과 삭제된 일정 id를 (시각, id) 순으로 limit개까지.
+    반환: {"created", "updated", "deleted", "sync_token", "has_more"}
+    """
+    if token:
+        event_cursor, tombstone_cursor = decode_token(token, room_id)
+        since = event_cursor[0]
+    else:
+        # 첫 동기화는 현재 상태 전체만 필요하므로 기존 삭제 기록은 건너뛴다
+        event_cursor, tombstone_cursor = (datetime.min, 0), (timezone.now(), 0)
+        since = None
+
+    events = CalendarEvent.objects.with_details().filter(room_id=room_id)
+    if since is not None:
+        events = events.filter(_after("updated_at", event_cursor))
+    events = list(events.order_by("updated_at", "id")[:limit + 1])
+    tombstones = list(
+        CalendarEventTombstone.objects
+        .filter(_after("deleted_at", tombstone_cursor), room_id=room_id)
+        .order_by("deleted_at", "id")
+        .values_list("deleted_at", "id", "event_id")[:limit + 1]
+    )
+    has_more = len(events) > limit or len(tombstones) > limit
+    events, tombstones = events[:limit], tombstones[:limit]
+
+    if events:
+        event_cursor = (events[-1].updated_at, events[-1].id)
+    if tombstones:
+        tombstone_cursor = tombstones[-1][:2]
+
+    return {
+        "created": [e for e in events if since is None or e.created_at > since],
+        "updated": [e for e in events if since is not None and e.created_at <= since],
+        "deleted": [event_id for _, _, event_id in tombstones],
+        "sync_token": encode_token(room_id, event_cursor, tombstone_cursor),
+        "has_more": has_more,
+    }
+
+
+def prune_tombstones(now=None) -> int:
+    cutoff = (now or timezone.now()) - TOMBSTONE_RETENTION
+    return CalendarEventTombstone.objects.filter(deleted_at__lt=cutoff).delete()[0]
@@ -1,3 +1,1020 @@
-from django.test import TestCase
+import hashlib
+import importlib
+import io
+import os
+import shutil
+import struct
+import tempfile
+import wave
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from dateutil.rrule import rrulestr
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from room.models import Room, RoomMembership
+from schedule.models import Schedule, ScheduleConfirmedAssignment
+from user.models import CustomUser as User
+from . import serializers as calendar_serializers
+from . import upload_sessions
+from .audio import WAVEFORM_POINTS, analyze_wav
+from .broadcast import calendar_group
+from .delivery import _parse_range
+from .images import VARIANT_SIZES
+from .models import CalendarAttachment, CalendarEvent, FileBlob, UploadedFile, UploadSession
+from .processing import process_uploaded_file
+from .recurrence import iter_occurrence_dates, make_occurrence
+from .series import SCOPE_ALL, SCOPE_THIS, update_occurrences
+from .sync import decode_token, encode_token
+from .utils import build_attachments, resolve_attachment_files
+
+collapse = importlib.import_module("calender.migrations.0004_collapse_materialized_repeats")
+
+
+def _event(d, rule="NONE", until=None, exceptions=None, **kwargs):
+    return CalendarEvent(
+        date=d,
+        title=kwargs.pop("title", "약 먹기"),
+        start_at=datetime.combine(d, time(1)),
+        end_at=datetime.combine(d, time(2)),
+        repeat_rule=rule,
+        repeat_until=until,
+        repeat_exceptions=exceptions or [],
+        **kwargs,
+    )
+
+
+class RecurrenceTests(SimpleTestCase):
+    def test_daily_expansion_is_inclusive_and_clipped_to_window(self):
+        event = _event(date(2026, 10, 1), "DAILY", date(2026, 10, 10))
+        self.assertEqual(
+            list(iter_occurrence_dates(event, date(2026, 10, 8), date(2026, 10, 20))),
+            [date(2026, 10, 8), date(2026, 10, 9), date(2026, 10, 10)],
+        )
+
+    def test_exceptions_are_skipped(self):
+        event = _event(date(2026, 10, 1), "WEEKLY", date(2026, 10, 29), exceptions=["2026-10-15"])
+        self.assertEqual(
+            list(iter_occurrence_dates(event)),
+            [date(2026, 10, 1), date(2026, 10, 8), date(2026, 10, 22), date(2026, 10, 29)],
+        )
+
+    def test_monthly_on_31st_skips_short_months(self):
+        event = _event(date(2026, 1, 31), "MONTHLY", date(2026, 6, 30))
+        self.assertEqual(
+            list(iter_occurrence_dates(event)),
+            [date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31)],
+        )
+
+    def test_repeat_without_until_is_a_single_event(self):
+        event = _event(date(2026, 10, 1), "DAILY", None)
+        self.assertEqual(list(iter_occurrence_dates(event)), [date(2026, 10, 1)])
+        self.assertEqual(list(iter_occurrence_dates(event, date(2026, 10, 2))), [])
+
+    def test_make_occurrence_moves_times_by_whole_days(self):
+        event = _event(date(2026, 10, 1), "DAILY", date(2026, 10, 10))
+        occ = make_occurrence(event, date(2026, 10, 4))
+        self.assertEqual((occ.date, occ.start_at), (date(2026, 10, 4), datetime(2026, 10, 4, 1)))
+        self.assertEqual(event.date, date(2026, 10, 1))
+
+
+class RoomTestMixin:
+    def setUp(self):
+        # 방 id가 테스트마다 재사용되므로 이전 테스트의 캐시를 비운다
+        cache.clear()
+        self.owner = User.objects.create(email="owner@example.com", name="owner")
+        self.room = Room.objects.create(owner=self.owner, patient="환자", invite_code="TESTCODE")
+        RoomMembership.objects.create(room=self.room, user=self.owner, role=RoomMembership.Role.OWNER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def save_event(self, d, rule="NONE", until=None, **kwargs):
+        event = _event(d, rule, until, room=self.room, **kwargs)
+        event.save()
+        return event
+
+
+class CollapseMaterializedRepeatsTests(RoomTestMixin, TestCase):
+    """0004: 예전에 복제해 둔 반복 일정을 원본 한 행으로 합칠 때 보이는 날짜가 바뀌지 않아야 한다"""
+
+    def materialize(self, start, rule, until, step):
+        master = self.save_event(start, rule, until)
+        copies, current = [], start
+        while (current := current + step) <= until:
+            copies.append(self.save_event(current))
+        return master, copies
+
+    def materialized_dates(self):
+        """예전 조회: 원본과 복제본이 각자 자기 날짜에 한 번씩"""
+        return sorted(CalendarEvent.objects.filter(room=self.room).values_list("date", flat=True))
+
+    def visible_dates(self):
+        """지금 조회: 반복 원본은 전개"""
+        dates = []
+        for event in CalendarEvent.objects.filter(room=self.room):
+            dates.extend(iter_occurrence_dates(event))
+        return sorted(dates)
+
+    def test_daily_copies_are_collapsed_and_edited_copies_kept(self):
+        master, copies = self.materialize(date(2026, 10, 1), "DAILY", date(2026, 10, 5), timedelta(days=1))
+        edited = copies[1]
+        CalendarEvent.objects.filter(pk=edited.pk).update(
+            description="시간 변경", updated_at=edited.created_at + timedelta(minutes=1),
+        )
+        before = self.materialized_dates()
+
+        collapse.collapse_materialized_repeats(apps, None)
+
+        master.refresh_from_db()
+        self.assertEqual(master.repeat_rule, "DAILY")
+        self.assertEqual(master.repeat_exceptions, [edited.date.isoformat()])
+        self.assertEqual(
+            set(CalendarEvent.objects.filter(room=self.room).values_list("pk", flat=True)), {master.pk, edited.pk},
+        )
+        self.assertEqual(self.visible_dates(), before)
+
+    def test_deleted_and_moved_copies_do_not_come_back(self):
+        master, copies = self.materialize(date(2026, 10, 1), "DAILY", date(2026, 10, 5), timedelta(days=1))
+        deleted, moved = copies[1], copies[2]
+        deleted.delete()
+        CalendarEvent.objects.filter(pk=moved.pk).update(
+            date=date(2026, 10, 20), updated_at=moved.created_at + timedelta(minutes=1),
+        )
+        before = self.materialized_dates()
+        self.assertNotIn(date(2026, 10, 3), before)
+
+        collapse.collapse_materialized_repeats(apps, None)
+
+        master.refresh_from_db()
+        self.assertEqual(master.repeat_exceptions, ["2026-10-03", "2026-10-04"])
+        self.assertEqual(self.visible_dates(), before)
+
+    def test_monthly_from_31st_stays_materialized(self):
+        from dateutil.relativedelta import relativedelta
+
+        start = date(2026, 1, 31)
+        master, copies = self.materialize(start, "MONTHLY", date(2026, 6, 30), relativedelta(months=1))
+        before = self.materialized_dates()
+        self.assertIn(date(2026, 2, 28), before)
+
+        collapse.collapse_materialized_repeats(apps, None)
+
+        master.refresh_from_db()
+        self.assertEqual((master.repeat_rule, master.repeat_until), ("NONE", None))
+        self.assertEqual(CalendarEvent.objects.filter(room=self.room).count(), 1 + len(copies))
+        self.assertEqual(self.visible_dates(), before)
+
+
+class SeriesUpdateTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create(email="member@example.com", name="member")
+        self.master = self.save_event(date(2026, 10, 1), "DAILY", date(2026, 10, 10), assignee=self.owner)
+
+    def test_this_scope_keeps_new_assignee(self):
+        override = update_occurrences(self.master, SCOPE_THIS, date(2026, 10, 3), {"assignee": self.member})
+        override.refresh_from_db()
+        self.assertEqual(override.assignee_id, self.member.id)
+
+    def test_all_scope_date_move_shifts_exceptions_and_overrides(self):
+        override = update_occurrences(self.master, SCOPE_THIS, date(2026, 10, 3), {"title": "변경"})
+        self.master.refresh_from_db()
+        self.master.repeat_exceptions = sorted(self.master.repeat_exceptions + ["2026-10-05"])
+        self.master.save()
+
+        update_occurrences(self.master, SCOPE_ALL, date(2026, 10, 1), {
+            "date": date(2026, 10, 3),
+            "start_at": datetime(2026, 10, 3, 1),
+            "end_at": datetime(2026, 10, 3, 2),
+        })
+
+        self.master.refresh_from_db()
+        override.refresh_from_db()
+        self.assertEqual(self.master.repeat_exceptions, ["2026-10-05", "2026-10-07"])
+        self.assertEqual(override.original_date, date(2026, 10, 5))
+        self.assertNotIn(date(2026, 10, 7), list(iter_occurrence_dates(self.master)))
+
+    def event_rows(self):
+        res = self.client.get(
+            f"/rooms/{self.room.id}/calendar/events/?start_date=2026-10-01&end_date=2026-10-31&include_time=1"
+        )
+        self.assertEqual(res.status_code, 200)
+        return [(e["date"], e["title"]) for e in res.data["events"]]
+
+    def test_patch_and_delete_with_scope_through_endpoint(self):
+        url = f"/calendar/events/{self.master.pk}/"
+        res = self.client.patch(url + "?scope=this&occurrence_date=2026-10-03", {"title": "변경"}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual((res.data["series_id"], res.data["original_date"]), (self.master.pk, "2026-10-03"))
+
+        res = self.client.delete(url + "?scope=following&occurrence_date=2026-10-06")
+        self.assertEqual(res.status_code, 200, res.data)
+
+        rows = self.event_rows()
+        self.assertEqual([d for d, _ in rows], [f"2026-10-0{i}" for i in range(1, 6)])
+        self.assertEqual(rows[2], ("2026-10-03", "변경"))
+
+        res = self.client.delete(url + "?scope=bad")
+        self.assertEqual(res.status_code, 400)
+
+
+class AttachmentSerializationTests(RoomTestMixin, TestCase):
+    def attach(self, event, count):
+        for i in range(count):
+            uploaded = UploadedFile.objects.create(file=f"{i}.png", type="IMAGE", uploaded_by=self.owner)
+            CalendarAttachment.objects.create(event=event, file_id=str(uploaded.pk), uploaded_file=uploaded, type="IMAGE")
+
+    def test_detail_query_count_does_not_grow_with_attachments(self):
+        one, many = self.save_event(date(2026, 10, 1)), self.save_event(date(2026, 10, 2))
+        self.attach(one, 1)
+        self.attach(many, 5)
+
+        def detail(event):
+            res = self.client.get(f"/calendar/events/{event.pk}/")
+            self.assertEqual(res.status_code, 200)
+            return res
+
+        with CaptureQueriesContext(connection) as single:
+            detail(one)
+        with CaptureQueriesContext(connection) as multiple:
+            res = detail(many)
+        self.assertEqual(len(single), len(multiple))
+
+        attachment = res.data["attachments"][0]
+        self.assertEqual(attachment["url"], f"http://testserver/files/{attachment['file_id']}/")
+        self.assertTrue(attachment["variants"])
+
+    def test_urls_are_built_once_per_response(self):
+        uploaded = UploadedFile.objects.create(file="a.png", type="IMAGE", uploaded_by=self.owner)
+        context = {"request": RequestFactory().get("/")}
+        with mock.patch.object(calendar_serializers, "reverse", wraps=calendar_serializers.reverse) as reverse:
+            for _ in range(3):
+                calendar_serializers.file_url(uploaded, context)
+                calendar_serializers.variant_urls(uploaded, context)
+        self.assertEqual(reverse.call_count, 1 + len(calendar_serializers.VARIANT_SIZES))
+
+
+class MonthSummaryTests(RoomTestMixin, TestCase):
+    def summary(self, month="2026-10"):
+        return self.client.get(f"/rooms/{self.room.id}/calendar/summary/", {"month": month})
+
+    def test_counts_single_and_repeating_events_per_day(self):
+        for hour, title in ((15, "오후"), (9, "아침"), (11, "점심"), (20, "저녁")):
+            event = _event(date(2026, 10, 5), title=title, room=self.room)
+            event.start_at = event.end_at = datetime(2026, 10, 5, hour)
+            event.save()
+        self.save_event(date(2026, 9, 28), "WEEKLY", date(2026, 10, 12), title="약")
+
+        res = self.summary()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["month"], "2026-10")
+        self.assertEqual(res.data["days"], [
+            {"date": "2026-10-05", "count": 5, "titles": ["약", "아침", "점심"]},
+            {"date": "2026-10-12", "count": 1, "titles": ["약"]},
+        ])
+
+    def test_cached_summary_is_invalidated_by_new_event(self):
+        self.assertEqual(self.summary().data["days"], [])
+        self.save_event(date(2026, 10, 6))
+        self.assertEqual(self.summary().data["days"][0]["date"], "2026-10-06")
+
+    def test_invalid_month_is_rejected(self):
+        for month in ("2026-13", "abc", "2026-10-01"):
+            with self.subTest(month):
+                res = self.summary(month)
+                self.assertEqual(res.status_code, 400)
+                self.assertEqual(res.data["error_code"], "CALENDAR_INVALID_QUERY")
+
+
+class SyncTokenTests(SimpleTestCase):
+    def test_round_trip(self):
+        cursors = ((datetime(2026, 10, 1, 12, 30, 0, 123456), 42), (datetime(2026, 10, 2), 7))
+        self.assertEqual(decode_token(encode_token(5, *cursors), 5), cursors)
+
+    def test_other_room_or_tampered_token_is_rejected(self):
+        token = encode_token(5, (datetime(2026, 10, 1), 1), (datetime(2026, 10, 1), 1))
+        with self.assertRaises(ValueError):
+            decode_token(token, 6)
+        with self.assertRaises(ValueError):
+            decode_token(token[:-2] + "xx", 5)
+
+
+class SyncEndpointTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f"/rooms/{self.room.id}/calendar/sync/"
+
+    def sync(self, token=None, **params):
+        if token:
+            params["sync_token"] = token
+        res = self.client.get(self.url, params)
+        self.assertEqual(res.status_code, 200, res.data)
+        return res.data
+
+    def test_full_sync_in_pages_then_incremental_changes(self):
+        events = [self.save_event(date(2026, 10, 20), title=f"e{i}") for i in range(5)]
+
+        titles, token = [], None
+        while True:
+            page = self.sync(token, limit=2)
+            titles += [e["title"] for e in page["created"]]
+            token = page["sync_token"]
+            if not page["has_more"]:
+                break
+        self.assertEqual(sorted(titles), [f"e{i}" for i in range(5)])
+
+        page = self.sync(token)
+        self.assertEqual((page["created"], page["updated"], page["deleted"]), ([], [], []))
+
+        res = self.client.patch(f"/calendar/events/{events[1].pk}/", {"title": "E1"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.client.delete(f"/calendar/events/{events[2].pk}/").status_code, 200)
+        self.save_event(date(2026, 10, 21), title="new")
+
+        page = self.sync(token)
+        self.assertEqual([e["title"] for e in page["created"]], ["new"])
+        self.assertEqual([e["title"] for e in page["updated"]], ["E1"])
+        self.assertEqual(page["deleted"], [events[2].pk])
+
+    def test_invalid_or_foreign_tokens_are_rejected(self):
+        token = self.sync()["sync_token"]
+        other = Room.objects.create(owner=self.owner, patient="다른 환자", invite_code="OTHERCODE")
+        RoomMembership.objects.create(room=other, user=self.owner, role=RoomMembership.Role.OWNER)
+
+        res = self.client.get(f"/rooms/{other.id}/calendar/sync/", {"sync_token": token})
+        self.assertEqual((res.status_code, res.data["error_code"]), (400, "CALENDAR_SYNC_TOKEN_INVALID"))
+        res = self.client.get(self.url, {"sync_token": "garbage"})
+        self.assertEqual(res.status_code, 400)
+        res = self.client.get(self.url, {"limit": 0})
+        self.assertEqual((res.status_code, res.data["error_code"]), (400, "CALENDAR_INVALID_QUERY"))
+
+
+
+class CalendarFeedTests(RoomTestMixin, TestCase):
+    def feed(self):
+        url = self.client.get("/calendar/feed/").data["url"]
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "text/calendar; charset=utf-8")
+        return b"".join(res.streaming_content).decode().replace("\r\n ", "")
+
+    def vevent(self, event):
+        body = self.feed()
+        start = body.index(f"UID:event-{event.pk}@careon")
+        return body[start:body.index("END:VEVENT", start)].split("\r\n")
+
+    def client_starts(self, lines):
+        """구독 앱이 VEVENT를 전개한 결과 (UTC naive)"""
+        rule = "\n".join(line for line in lines if line.split(":")[0] in ("DTSTART", "RRULE", "RDATE", "EXDATE"))
+        return [dt.replace(tzinfo=None) for dt in rrulestr(rule, forceset=True)]
+
+    def server_starts(self, event):
+        return [make_occurrence(event, d).start_at for d in iter_occurrence_dates(event)]
+
+    def early_morning(self, d, rule, until, exceptions=None):
+        """현지 오전 8시 일정: UTC로는 전날 23시"""
+        event = self.save_event(d, rule, until, exceptions=exceptions)
+        event.start_at = datetime.combine(d - timedelta(days=1), time(23))
+        event.end_at = event.start_at + timedelta(hours=1)
+        event.save()
+        return event
+
+    def test_early_morning_daily_event_uses_utc_occurrence_times(self):
+        event = self.early_morning(date(2026, 10, 2), "DAILY", date(2026, 10, 5), ["2026-10-03"])
+        lines = self.vevent(event)
+
+        self.assertIn("DTSTART:20261001T230000Z", lines)
+        self.assertIn("RRULE:FREQ=DAILY;UNTIL=20261004T230000Z", lines)
+        self.assertIn("EXDATE:20261002T230000Z", lines)
+        self.assertEqual(self.client_starts(lines), self.server_starts(event))
+        self.assertEqual(len(self.server_starts(event)), 3)
+
+    def test_early_morning_monthly_event_matches_local_day_of_month(self):
+        for start in (date(2026, 1, 31), date(2026, 1, 1), date(2026, 1, 29)):
+            with self.subTest(start):
+                event = self.early_morning(start, "MONTHLY", date(2026, 12, 31))
+                lines = self.vevent(event)
+                self.assertEqual(self.client_starts(lines), self.server_starts(event))
+
+    def test_revoked_token_returns_404(self):
+        url = self.client.get("/calendar/feed/").data["url"]
+        self.assertEqual(self.client.delete("/calendar/feed/").status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+
+class UpcomingEventsTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tomorrow = timezone.now().date() + timedelta(days=1)
+        self.other = Room.objects.create(owner=self.owner, patient="다른 환자", invite_code="OTHERCODE")
+        RoomMembership.objects.create(room=self.other, user=self.owner, role=RoomMembership.Role.OWNER)
+
+    def collect(self, url):
+        rows = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200, res.data)
+            rows += [(r["type"], r["room_id"], r["date"], r["title"]) for r in res.data["results"]]
+            url = res.data["next"]
+        return rows
+
+    def test_merges_rooms_and_pages_without_gaps(self):
+        for k in range(3):
+            d = self.tomorrow + timedelta(days=k)
+            self.save_event(d, title=f"a{k}")
+            other = _event(d, title=f"b{k}", room=self.other)
+            other.start_at += timedelta(hours=1)
+            other.save()
+        self.save_event(self.tomorrow, "DAILY", self.tomorrow + timedelta(days=1), title="반복")
+        stranger = User.objects.create(email="stranger@example.com")
+        foreign = Room.objects.create(owner=stranger, patient="남의 방", invite_code="FOREIGN1")
+        _event(self.tomorrow, title="남의 일정", room=foreign).save()
+
+        rows = self.collect("/calendar/upcoming/?limit=2")
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(len(set(rows)), 8)
+        self.assertEqual([title for *_, title in rows[:3]], ["a0", "반복", "b0"])
+        self.assertNotIn("남의 일정", [title for *_, title in rows])
+
+    def test_include_shifts_adds_confirmed_shifts(self):
+        sunday = self.tomorrow - timedelta(days=(self.tomorrow.weekday() + 1) % 7)
+        schedule = Schedule.objects.create(
+            room=self.room, start_date=sunday, end_date=sunday + timedelta(days=6), created_by=self.owner,
+        )
+        for hour in (9, 10):
+            ScheduleConfirmedAssignment.objects.create(
+                schedule=schedule, day=(self.tomorrow - sunday).days, hour=hour,
+                assignee=self.owner, finalized_by=self.owner,
+            )
+
+        self.assertEqual(self.collect("/calendar/upcoming/"), [])
+        rows = self.collect("/calendar/upcoming/?include_shifts=true")
+        self.assertEqual(rows, [("shift", self.room.id, self.tomorrow.isoformat(), "근무 (환자)")])
+
+    def test_invalid_cursor_is_rejected(self):
+        res = self.client.get("/calendar/upcoming/?cursor=zzz")
+        self.assertEqual((res.status_code, res.data["error_code"]), (400, "CALENDAR_INVALID_QUERY"))
+
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    BACKGROUND_THREADS=False,
+)
+class CalendarBroadcastTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(calendar_group(self.room.id), self.channel)
+
+    def receive(self):
+        message = async_to_sync(self.layer.receive)(self.channel)
+        self.assertEqual(message["type"], "calendar.update")
+        return message["payload"]
+
+    def test_changes_are_sent_to_room_group_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(f"/rooms/{self.room.id}/calendar/events/", {
+                "date": "2026-10-20", "title": "약",
+                "start_at": "2026-10-20T09:00:00", "end_at": "2026-10-20T09:30:00",
+                "repeat_rule": "DAILY", "repeat_until": "2026-10-25",
+            }, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        event_id = res.data["id"]
+        created = self.receive()
+        self.assertEqual((created["event"], created["room_id"]), ("calendar.created", self.room.id))
+        self.assertEqual(created["data"]["id"], event_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/calendar/events/{event_id}/?scope=this&occurrence_date=2026-10-22",
+                              {"title": "변경"}, format="json")
+        updated = self.receive()
+        self.assertEqual(updated["event"], "calendar.updated")
+        self.assertEqual((updated["event_id"], updated["scope"], updated["fields"]), (event_id, "this", ["title"]))
+        self.assertEqual(updated["data"]["series_id"], event_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/calendar/events/{event_id}/?scope=all")
+        deleted = self.receive()
+        self.assertEqual((deleted["event"], deleted["event_id"], deleted["scope"]), ("calendar.deleted", event_id, "all"))
+
+
+
+class AssigneeConflictTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create(email="member@example.com", name="member")
+        RoomMembership.objects.create(room=self.room, user=self.member)
+        # 요청자(owner)가 속하지 않은 담당자의 방
+        self.private_room = Room.objects.create(owner=self.member, patient="개인", invite_code="PRIVATE1")
+        RoomMembership.objects.create(room=self.private_room, user=self.member, role=RoomMembership.Role.OWNER)
+
+        self.shared = self.add(self.room, "공유 일정", 5)
+        self.hidden = self.add(self.private_room, "비공개 일정", 5)
+
+    def add(self, room, title, hour, minutes=60):
+        start_at = datetime(2026, 10, 20, hour)
+        return CalendarEvent.objects.create(
+            room=room, date=date(2026, 10, 20), title=title, assignee=self.member,
+            start_at=start_at, end_at=start_at + timedelta(minutes=minutes),
+        )
+
+    def post(self, hour, **extra):
+        start_at = datetime(2026, 10, 20, hour)
+        return self.client.post(f"/rooms/{self.room.id}/calendar/events/", {
+            "date": "2026-10-20", "title": "새 일정",
+            "start_at": start_at.isoformat(), "end_at": (start_at + timedelta(minutes=30)).isoformat(),
+            "assignee_id": self.member.id, "check_conflicts": True, **extra,
+        }, format="json")
+
+    def assert_redacted(self, conflicts):
+        by_private = {bool(item.get("private")): item for item in conflicts}
+        self.assertEqual(by_private[False]["title"], "공유 일정")
+        self.assertNotIn("title", by_private[True])
+        self.assertNotIn("room_id", by_private[True])
+
+    def test_create_conflict_returns_409_with_other_rooms_redacted(self):
+        res = self.post(5)
+        self.assertEqual((res.status_code, res.data["error_code"]), (409, "CALENDAR_ASSIGNEE_CONFLICT"))
+        self.assertEqual(len(res.data["detail"]["conflicts"]), 2)
+        self.assert_redacted(res.data["detail"]["conflicts"])
+        self.assertFalse(CalendarEvent.objects.filter(title="새 일정").exists())
+
+        self.assertEqual(self.post(12).status_code, 200)
+
+    def test_patch_conflict_excludes_the_event_itself(self):
+        free = self.add(self.room, "빈 시간", 12)
+        url = f"/calendar/events/{free.pk}/"
+        res = self.client.patch(url, {"title": "이름만 변경", "check_conflicts": True}, format="json")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.patch(url, {
+            "start_at": "2026-10-20T05:30:00", "end_at": "2026-10-20T06:30:00", "check_conflicts": True,
+        }, format="json")
+        self.assertEqual(res.status_code, 409)
+        self.assert_redacted(res.data["detail"]["conflicts"])
+
+    def test_too_many_occurrences_are_rejected(self):
+        res = self.post(12, repeat_rule="DAILY", repeat_until="2029-10-20")
+        self.assertEqual((res.status_code, res.data["error_code"]), (400, "CALENDAR_CONFLICT_CHECK_TOO_LARGE"))
+
+    def test_conflicts_endpoint_redacts_rooms_of_other_members(self):
+        query = f"?assignee_id={self.member.id}&start_at=2026-10-20T00:00:00&end_at=2026-10-21T00:00:00"
+        res = self.client.get("/calendar/conflicts/" + query)
+        self.assertEqual(res.status_code, 200)
+        self.assert_redacted(res.data["conflicts"])
+        self.assertEqual(len(res.data["overlaps"]), 1)
+
+        # 본인 일정은 모두 보인다
+        member_client = APIClient()
+        member_client.force_authenticate(self.member)
+        titles = {item["title"] for item in member_client.get("/calendar/conflicts/" + query).data["conflicts"]}
+        self.assertEqual(titles, {"공유 일정", "비공개 일정"})
+
+        stranger = APIClient()
+        stranger.force_authenticate(User.objects.create(email="stranger@example.com"))
+        self.assertEqual(stranger.get("/calendar/conflicts/" + query).status_code, 403)
+
+
+
+class CalendarBatchTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f"/rooms/{self.room.id}/calendar/batch/"
+        self.single = self.save_event(date(2026, 10, 20), title="단일")
+        self.master = self.save_event(date(2026, 10, 20), "DAILY", date(2026, 10, 30), title="반복")
+
+    def create_op(self, d, title, **data):
+        start_at = datetime.combine(d, time(9))
+        return {"op": "create", "data": {
+            "date": d.isoformat(), "title": title, "start_at": start_at.isoformat(),
+            "end_at": (start_at + timedelta(hours=1)).isoformat(), **data,
+        }}
+
+    def creates(self, count):
+        return [self.create_op(date(2026, 11, 1) + timedelta(days=i), f"new{i}") for i in range(count)]
+
+    def test_invalid_operation_rejects_whole_batch(self):
+        before = CalendarEvent.objects.count()
+        res = self.client.post(self.url, {"operations": [
+            self.create_op(date(2026, 10, 21), "ok"),
+            {"op": "create", "data": {"title": "날짜 없음"}},
+            {"op": "update", "id": self.single.pk, "data": {"assignee_id": 999999}},
+            {"op": "delete", "id": self.master.pk, "scope": "this", "occurrence_date": "2026-11-05"},
+            {"op": "delete", "id": self.single.pk},
+        ]}, format="json")
+        self.assertEqual((res.status_code, res.data["error_code"]), (400, "CALENDAR_BATCH_INVALID"))
+        self.assertEqual(
+            [(e["index"], e["error_code"]) for e in res.data["detail"]["operations"]],
+            [(1, "CALENDAR_VALIDATION_ERROR"), (2, "ASSIGNEE_NOT_FOUND"),
+             (3, "CALENDAR_OCCURRENCE_NOT_FOUND"), (4, "CALENDAR_BATCH_DUPLICATE_TARGET")],
+        )
+        self.assertEqual(CalendarEvent.objects.count(), before)
+
+    def test_mixed_operations_are_applied_together(self):
+        res = self.client.post(self.url, {"operations": [
+            *self.creates(2),
+            {"op": "update", "id": self.single.pk, "data": {"title": "단일!"}},
+            {"op": "update", "id": self.master.pk, "scope": "this", "occurrence_date": "2026-10-22",
+             "data": {"title": "22일만"}},
+        ]}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        results = res.data["results"]
+        self.assertEqual([r["event"]["title"] for r in results], ["new0", "new1", "단일!", "22일만"])
+        self.assertEqual(results[3]["event"]["series_id"], self.master.pk)
+
+        res = self.client.post(self.url, {"operations": [
+            {"op": "delete", "id": self.single.pk},
+            {"op": "delete", "id": self.master.pk, "scope": "following", "occurrence_date": "2026-10-25"},
+        ]}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertFalse(CalendarEvent.objects.filter(pk=self.single.pk).exists())
+        self.master.refresh_from_db()
+        self.assertEqual(self.master.repeat_until, date(2026, 10, 24))
+
+    def test_query_count_does_not_grow_with_creates(self):
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.client.post(self.url, {"operations": self.creates(2)}, format="json").status_code, 200)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(self.client.post(self.url, {"operations": self.creates(20)}, format="json").status_code, 200)
+        self.assertEqual(len(few), len(many))
+
+
+
+class TempMediaMixin:
+    """업로드 파일과 분할 업로드 임시 파일을 임시 디렉터리에 저장하고 테스트가 끝나면 지운다"""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.session_dir = os.path.join(media_root, "upload_sessions")
+        override = self.settings(MEDIA_ROOT=media_root, UPLOAD_SESSION_DIR=self.session_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def upload(self, data, name="voice.m4a", file_type="AUDIO"):
+        return self.client.post(
+            "/files/upload/", {"file": SimpleUploadedFile(name, data), "type": file_type}, format="multipart",
+        )
+
+
+class FileBlobTests(TempMediaMixin, RoomTestMixin, TestCase):
+    def test_same_content_shares_one_blob(self):
+        first = self.upload(b"x" * 5000)
+        second = self.upload(b"x" * 5000, "again.m4a")
+        other = self.upload(b"y" * 5000)
+        self.assertEqual([r.status_code for r in (first, second, other)], [201, 201, 201])
+        self.assertNotEqual(first.data["file_id"], second.data["file_id"])
+
+        blob = FileBlob.objects.get(uploads=first.data["file_id"])
+        self.assertEqual((blob.ref_count, blob.size), (2, 5000))
+        self.assertEqual(UploadedFile.objects.get(pk=second.data["file_id"]).blob, blob)
+        self.assertEqual(len(os.listdir(os.path.dirname(blob.file.path))), 1)
+        self.assertEqual(FileBlob.objects.count(), 2)
+
+    def test_deleting_an_upload_releases_its_reference(self):
+        file_id = self.upload(b"x" * 5000).data["file_id"]
+        self.upload(b"x" * 5000)
+        blob = FileBlob.objects.get()
+
+        UploadedFile.objects.filter(pk=file_id).delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        # 파일은 정리 작업(gc_uploads) 전까지 남아 있다
+        self.assertTrue(os.path.exists(blob.file.path))
+
+    def test_upload_without_file_is_rejected(self):
+        res = self.client.post("/files/upload/", {"type": "AUDIO"}, format="multipart")
+        self.assertEqual(res.status_code, 400)
+
+
+
+class UploadSessionTests(TempMediaMixin, RoomTestMixin, TestCase):
+    def start(self, size, client=None):
+        res = (client or self.client).post(
+            "/files/uploads/", {"type": "AUDIO", "filename": "memo.m4a", "size": size}, format="json",
+        )
+        return res
+
+    def put(self, upload_id, offset, chunk):
+        return self.client.generic(
+            "PUT", f"/files/uploads/{upload_id}/?offset={offset}", chunk, content_type="application/octet-stream",
+        )
+
+    def complete(self, upload_id, sha256):
+        return self.client.post(f"/files/uploads/{upload_id}/complete/", {"sha256": sha256}, format="json")
+
+    def test_chunks_resume_and_complete(self):
+        data = os.urandom(3000)
+        upload_id = self.start(len(data)).data["upload_id"]
+        checksum = hashlib.sha256(data).hexdigest()
+
+        self.assertEqual(self.put(upload_id, 0, data[:1000]).data["offset"], 1000)
+        self.assertEqual(self.put(upload_id, 2000, data[2000:]).status_code, 409)
+        self.assertEqual(self.put(upload_id, 0, data[:1000]).data["offset"], 1000)
+        self.assertEqual(self.complete(upload_id, checksum).status_code, 409)
+        self.assertEqual(self.put(upload_id, 1000, data[1000:]).data["offset"], 3000)
+        self.assertEqual(self.client.get(f"/files/uploads/{upload_id}/").data["offset"], 3000)
+
+        res = self.complete(upload_id, checksum.upper())
+        self.assertEqual(res.status_code, 201, res.data)
+        self.assertEqual(FileBlob.objects.get(uploads=res.data["file_id"]).size, len(data))
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.session_dir), [])
+        self.assertEqual(self.complete(upload_id, checksum).status_code, 404)
+
+    def test_checksum_mismatch_discards_session(self):
+        upload_id = self.start(3).data["upload_id"]
+        self.put(upload_id, 0, b"abc")
+        res = self.complete(upload_id, "0" * 64)
+        self.assertEqual((res.status_code, res.data["error_code"]), (422, "UPLOAD_CHECKSUM_MISMATCH"))
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.session_dir), [])
+
+    def test_file_is_stored_outside_the_session_lock(self):
+        upload_id = self.start(3).data["upload_id"]
+        self.put(upload_id, 0, b"abc")
+        # 테스트 자체가 열어 둔 트랜잭션보다 더 깊이 들어가 있지 않아야 한다
+        depth = len(connection.atomic_blocks)
+        seen = []
+
+        def store(*args, **kwargs):
+            seen.append(len(connection.atomic_blocks))
+            return create_uploaded_file(*args, **kwargs)
+
+        create_uploaded_file = upload_sessions.create_uploaded_file
+        with mock.patch.object(upload_sessions, "create_uploaded_file", side_effect=store):
+            self.assertEqual(self.complete(upload_id, hashlib.sha256(b"abc").hexdigest()).status_code, 201)
+        self.assertEqual(seen, [depth])
+
+    def test_chunk_after_temp_file_was_collected_returns_404(self):
+        upload_id = self.start(3).data["upload_id"]
+        # gc_uploads가 오래된 세션의 임시 파일을 먼저 지운 경우
+        os.remove(os.path.join(self.session_dir, upload_id))
+        res = self.put(upload_id, 0, b"abc")
+        self.assertEqual((res.status_code, res.data["error_code"]), (404, "UPLOAD_NOT_FOUND"))
+
+    def test_open_sessions_are_capped_per_user(self):
+        for _ in range(upload_sessions.MAX_OPEN_SESSIONS):
+            self.assertEqual(self.start(10).status_code, 201)
+        res = self.start(10)
+        self.assertEqual((res.status_code, res.data["error_code"]), (429, "UPLOAD_TOO_MANY_SESSIONS"))
+
+        other = APIClient()
+        other.force_authenticate(User.objects.create(email="other@example.com"))
+        self.assertEqual(self.start(10, other).status_code, 201)
+
+
+
+class ImageVariantTests(TempMediaMixin, RoomTestMixin, TestCase):
+    def png(self, size=(2000, 1000)):
+        from PIL import Image
+
+        buf = io.BytesIO()
+        Image.new("RGBA", size, (255, 0, 0, 128)).save(buf, "PNG")
+        return buf.getvalue()
+
+    def variant(self, file_id, name):
+        res = self.client.get(f"/files/{file_id}/variants/{name}/")
+        return res, b"".join(res.streaming_content) if res.status_code == 200 else b""
+
+    def test_variants_are_resized_jpegs(self):
+        from PIL import Image
+
+        file_id = self.upload(self.png(), "photo.png", "IMAGE").data["file_id"]
+        for name, edge in VARIANT_SIZES.items():
+            with self.subTest(name):
+                res, body = self.variant(file_id, name)
+                self.assertEqual(res["Content-Type"], "image/jpeg")
+                with Image.open(io.BytesIO(body)) as img:
+                    self.assertEqual((img.format, img.size), ("JPEG", (edge, edge // 2)))
+
+        res, _ = self.variant(file_id, "huge")
+        self.assertEqual(res.status_code, 404)
+
+    def test_same_image_shares_variants(self):
+        first = self.upload(self.png(), "a.png", "IMAGE").data["file_id"]
+        second = self.upload(self.png(), "b.png", "IMAGE").data["file_id"]
+        self.assertTrue(process_uploaded_file(int(first)))
+        self.assertTrue(process_uploaded_file(int(second)))
+        self.assertEqual(UploadedFile.objects.get(pk=first).variants, UploadedFile.objects.get(pk=second).variants)
+
+    def test_unreadable_image_falls_back_to_original(self):
+        file_id = self.upload(b"not an image", "broken.jpg", "IMAGE").data["file_id"]
+        with self.assertLogs("calender.processing", "WARNING"):
+            res, body = self.variant(file_id, "thumb")
+        self.assertEqual((res.status_code, body), (200, b"not an image"))
+
+
+
+def _wav(nframes, width=2, channels=1, rate=8000):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        if width == 2:
+            w.writeframes(b"".join(struct.pack("<h", (i * 997) % 30000) for i in range(nframes * channels)))
+        else:
+            w.writeframes(bytes((i * 7) % 256 for i in range(nframes * channels)))
+    buf.seek(0)
+    return buf
+
+
+class AnalyzeWavTests(SimpleTestCase):
+    def test_always_returns_points_peaks(self):
+        for nframes in (1, 37, 150, 8001):
+            result = analyze_wav(_wav(nframes))
+            self.assertEqual(len(result["waveform"]), WAVEFORM_POINTS, nframes)
+            self.assertTrue(all(0 <= v <= 255 for v in result["waveform"]))
+
+    def test_duration_and_channels(self):
+        result = analyze_wav(_wav(16000, width=1, channels=2))
+        self.assertEqual(result["duration_ms"], 2000)
+        self.assertEqual(len(result["waveform"]), WAVEFORM_POINTS)
+
+    def test_silence_and_empty(self):
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\0\0" * 500)
+        buf.seek(0)
+        self.assertEqual(analyze_wav(buf)["waveform"], [0] * WAVEFORM_POINTS)
+        self.assertEqual(analyze_wav(_wav(0)), {"duration_ms": 0, "waveform": []})
+
+
+class AudioProcessingTests(TempMediaMixin, RoomTestMixin, TestCase):
+    def test_attachment_exposes_duration_and_waveform_after_processing(self):
+        file_id = self.upload(_wav(8000).getvalue(), "memo.wav").data["file_id"]
+        self.assertTrue(process_uploaded_file(int(file_id)))
+
+        res = self.client.post(f"/rooms/{self.room.id}/calendar/events/", {
+            "date": "2026-10-20", "title": "녹음", "start_at": "2026-10-20T01:00:00", "end_at": "2026-10-20T02:00:00",
+            "attachments": [{"file_id": file_id, "type": "AUDIO"}],
+        }, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        attachment, = res.data["attachments"]
+        self.assertEqual(attachment["duration_ms"], 1000)
+        self.assertEqual(len(attachment["waveform"]), WAVEFORM_POINTS)
+
+
+
+class AttachmentFileTests(RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create(email="other@example.com", name="other")
+        self.mine = UploadedFile.objects.create(file="a.wav", type="AUDIO", uploaded_by=self.owner)
+        self.theirs = UploadedFile.objects.create(file="b.wav", type="AUDIO", uploaded_by=self.other)
+
+    def test_only_own_or_same_room_files_are_linked(self):
+        attachments = [
+            {"file_id": str(self.mine.pk), "type": "AUDIO"},
+            {"file_id": str(self.theirs.pk), "type": "AUDIO"},
+            {"file_id": "external", "type": "AUDIO"},
+        ]
+        denied, = resolve_attachment_files(self.owner, self.room, [attachments])
+        self.assertEqual(denied, [str(self.theirs.pk)])
+
+        objs = build_attachments(self.save_event(date(2026, 10, 1)), attachments)
+        self.assertEqual([obj.uploaded_file_id for obj in objs], [self.mine.pk, None, None])
+
+    def test_file_already_in_room_can_be_reused(self):
+        event = self.save_event(date(2026, 10, 1))
+        CalendarAttachment.objects.create(event=event, file_id=str(self.theirs.pk), uploaded_file=self.theirs, type="AUDIO")
+        denied, = resolve_attachment_files(self.owner, self.room, [[{"file_id": str(self.theirs.pk), "type": "AUDIO"}]])
+        self.assertEqual(denied, [])
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(_parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(_parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(_parse_range("bytes=-10", 1000), (990, 999))
+        self.assertEqual(_parse_range("bytes=990-5000", 1000), (990, 999))
+        self.assertEqual(_parse_range("bytes=-5000", 1000), (0, 999))
+
+    def test_unparseable_range_is_ignored(self):
+        for header in ("", "bytes=-", "items=0-1", "bytes=0-1,5-6"):
+            self.assertIsNone(_parse_range(header, 1000))
+
+    def test_unsatisfiable_range(self):
+        for header in ("bytes=1000-", "bytes=5-1", "bytes=-0"):
+            with self.assertRaises(ValueError):
+                _parse_range(header, 1000)
+
+
+class FileAccessTests(TempMediaMixin, RoomTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = User.objects.create(email="member@example.com", name="member")
+        RoomMembership.objects.create(room=self.room, user=self.member)
+        self.member_client = APIClient()
+        self.member_client.force_authenticate(self.member)
+        self.data = bytes(range(256)) * 4
+        self.file_id = self.upload(self.data).data["file_id"]
+
+    def attach(self, client, file_id):
+        return client.post(f"/rooms/{self.room.id}/calendar/events/", {
+            "date": "2026-10-20", "title": "첨부", "start_at": "2026-10-20T01:00:00", "end_at": "2026-10-20T02:00:00",
+            "attachments": [{"file_id": file_id, "type": "AUDIO"}],
+        }, format="json")
+
+    def download(self, client, **headers):
+        res = client.get(f"/files/{self.file_id}/", **headers)
+        return res, b"".join(res.streaming_content) if res.status_code in (200, 206) else b""
+
+    def test_room_members_can_download_only_after_attachment(self):
+        res, body = self.download(self.client)
+        self.assertEqual((res.status_code, body), (200, self.data))
+        self.assertEqual(self.download(self.member_client)[0].status_code, 404)
+
+        self.assertEqual(self.attach(self.client, self.file_id).status_code, 200)
+        res, body = self.download(self.member_client)
+        self.assertEqual((res.status_code, body), (200, self.data))
+
+    def test_others_uploads_cannot_be_attached(self):
+        res = self.attach(self.member_client, self.file_id)
+        self.assertEqual((res.status_code, res.data["error_code"]), (400, "ATTACHMENT_FILE_FORBIDDEN"))
+        self.assertEqual(res.data["detail"]["file_id"], [self.file_id])
+
+    def test_range_requests(self):
+        res, body = self.download(self.client, HTTP_RANGE="bytes=10-19")
+        self.assertEqual((res.status_code, body), (206, self.data[10:20]))
+        self.assertEqual(res["Content-Range"], f"bytes 10-19/{len(self.data)}")
+
+        res, _ = self.download(self.client, HTTP_RANGE=f"bytes={len(self.data)}-")
+        self.assertEqual(res.status_code, 416)
+
+
+
+class GcUploadsTests(TempMediaMixin, RoomTestMixin, TestCase):
+    def age(self, file_id, days=2):
+        old = timezone.now() - timedelta(days=days)
+        uploaded = UploadedFile.objects.get(pk=file_id)
+        UploadedFile.objects.filter(pk=file_id).update(created_at=old)
+        FileBlob.objects.filter(pk=uploaded.blob_id).update(created_at=old)
+        return uploaded.blob
+
+    def gc(self, *args):
+        call_command("gc_uploads", *args, stdout=io.StringIO())
+
+    def test_collects_old_unattached_uploads_and_their_blobs(self):
+        orphan = self.upload(b"orphan").data["file_id"]
+        attached = self.upload(b"attached").data["file_id"]
+        fresh = self.upload(b"fresh").data["file_id"]
+        orphan_blob = self.age(orphan)
+        self.age(attached)
+        event = self.save_event(date(2026, 10, 1))
+        CalendarAttachment.objects.create(event=event, file_id=attached, uploaded_file_id=attached, type="AUDIO")
+
+        self.gc("--dry-run")
+        self.assertEqual(UploadedFile.objects.count(), 3)
+
+        self.gc()
+        self.assertEqual(
+            set(UploadedFile.objects.values_list("pk", flat=True)), {int(attached), int(fresh)},
+        )
+        self.assertFalse(FileBlob.objects.filter(pk=orphan_blob.pk).exists())
+        self.assertFalse(os.path.exists(orphan_blob.file.path))
+
+    def test_shared_blob_is_kept_while_referenced(self):
+        old = self.upload(b"same").data["file_id"]
+        self.upload(b"same")
+        blob = self.age(old)
+
+        self.gc()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(os.path.exists(blob.file.path))
+
+    def test_collects_stale_sessions_and_leftover_temp_files(self):
+        upload_id = self.client.post(
+            "/files/uploads/", {"type": "AUDIO", "filename": "memo.m4a", "size": 10}, format="json",
+        ).data["upload_id"]
+        UploadSession.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        leftover = os.path.join(self.session_dir, "leftover.complete")
+        open(leftover, "wb").close()
+        old = (timezone.now() - timedelta(days=2)).timestamp()
+        os.utime(leftover, (old, old))
+
+        self.gc()
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.session_dir), [])
+        res = self.client.generic("PUT", f"/files/uploads/{upload_id}/?offset=0", b"x",
+                                  content_type="application/octet-stream")
+        self.assertEqual(res.status_code, 404)
@@ -0,0 +1,90 @@
+# calender/upcoming.py
+"""
+사용자가 속한 모든 방의 다가오는 일정(+ 선택적으로 본인 확정 근무)을 한 목록으로.
+일정은 멤버십 서브쿼리로 한 번에 조회하고, 반복 발생분/근무 스트림과 k-way merge 한다.
+정렬 키는 (date, start_at, 종류, id)이며 커서는 마지막 키를 담는다.
+"""
+import base64
+import binascii
+import heapq
+import itertools
+import json
+import sys
+from datetime import date, datetime
+from django.utils import timezone
+
+from room.models import RoomMembership
+from schedule.shifts import LOCAL_TZ, iter_shift_runs, utc_naive
+from .models import CalendarEvent
+from .recurrence import iter_upcoming, occurrence_key
+
+KIND_EVENT = 0
+KIND_SHIFT = 1
+
+
+def encode_cursor(key) -> str:
+    d, start_at, kind, pk = key
+    raw = json.dumps([d.isoformat(), start_at.isoformat(), kind, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """잘못된 커서면 ValueError"""
+    try:
+        d, start_at, kind, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return date.fromisoformat(d), datetime.fromisoformat(start_at), int(kind), int(pk)
+    except (TypeError, json.JSONDecodeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(str(e))
+
+
+def _member_rooms(user):
+    # 서브쿼리로 사용 (방 목록을 따로 읽지 않고 일정/근무 조회에 join)
+    return (RoomMembership.objects
+            .filter(user=user, room__deleting_at__isnull=True)
+            .values("room_id"))
+
+
+def _event_items(user, today, after, limit):
+    qs = CalendarEvent.objects.filter(room_id__in=_member_rooms(user)).select_related("assignee")
+
+    event_after = None
+    if after is not None:
+        # 같은 시각의 일정은 근무보다 먼저 나오므로, 커서가 근무면 그 시각의 일정은 모두 지나간 것
+        d, start_at, kind, pk = after
+        event_after = (d, start_at, pk if kind == KIND_EVENT else sys.maxsize)
+    for occ in iter_upcoming(qs, today, event_after, singles_limit=limit):
+        yield (*occurrence_key(occ)[:2], KIND_EVENT, occ.id), occ
+
+
+def _shift_items(user, today):
+    for run in iter_shift_runs(user, _member_rooms(user), today):
+        if run["date"] < today:
+            continue
+        # 일정 start_at과 같은 기준(UTC naive)으로 맞춰 정렬한다
+        yield (run["date"], utc_naive(run["start"]), KIND_SHIFT, run["schedule_id"] * 24 + run["first_hour"]), run
+
+
+def user_upcoming(user, limit: int, after=None, include_shifts: bool = False):
+    """(항목 [(key, 일정 발생분 또는 근무 구간)], 다음 페이지 존재 여부)"""
+    today = timezone.now().date()
+    streams = [_event_items(user, today, after, limit + 1)]
+    if include_shifts:
+        streams.append(_shift_items(user, today))
+
+    merged = heapq.merge(*streams, key=lambda item: item[0])
+    if after is not None:
+        merged = itertools.dropwhile(lambda item: item[0] <= after, merged)
+    items = list(itertools.islice(merged, limit + 1))
+    return items[:limit], len(items) > limit
+
+
+def shift_payload(run) -> dict:
+    return {
+        "type": "shift",
+        "room_id": run["room_id"],
+        "schedule_id": run["schedule_id"],
+        "date": run["date"].isoformat(),
+        "title": f"근무 ({run['room_name']})",
+        "start_at": run["start"].replace(tzinfo=LOCAL_TZ).isoformat(),
+        "end_at": run["end"].replace(tzinfo=LOCAL_TZ).isoformat(),
+    }
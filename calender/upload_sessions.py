@@ -0,0 +1,152 @@
+# calender/upload_sessions.py
+"""
+재개 가능한 분할 업로드 (init → PUT 조각(offset) → complete).
+조각은 요청 본문을 작은 단위로 읽어 임시 파일의 offset 위치에 바로 쓰므로(os.pwrite) 파일 전체가 메모리에 올라가지 않는다.
+연결이 끊기면 클라이언트는 상태 조회로 받은 offset부터 다시 보내면 된다.
+"""
+import hashlib
+import os
+import secrets
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .blobs import create_uploaded_file
+from .models import UploadSession
+
+# 클라이언트에 권하는 조각 크기와 허용하는 최대 크기 (nginx client_max_body_size 10M 아래)
+CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_UPLOAD_SIZE = 200 * 1024 * 1024
+READ_CHUNK = 64 * 1024
+# 사용자별 동시에 열 수 있는 세션 수와 그 세션들이 예고한 크기 합계 (임시 파일이 디스크를 채우지 않게)
+MAX_OPEN_SESSIONS = 5
+MAX_PENDING_BYTES = 2 * MAX_UPLOAD_SIZE
+
+
+class OffsetMismatch(Exception):
+    """받은 위치 뒤에 빈틈이 생기거나 전체 크기를 넘는 조각"""
+
+
+class UploadIncomplete(Exception):
+    pass
+
+
+class TooManySessions(Exception):
+    """열린 세션 수 또는 예고한 크기 합계가 사용자별 상한을 넘는다"""
+
+
+class SessionNotFound(Exception):
+    """동시에 온 다른 complete/취소나 정리 작업(gc_uploads)이 먼저 세션을 정리했다"""
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+def session_path(session) -> str:
+    return os.path.join(settings.UPLOAD_SESSION_DIR, session.upload_id)
+
+
+def start_session(user, file_type: str, filename: str, size: int) -> UploadSession:
+    """상한을 넘으면 TooManySessions (끝나지 않은 세션은 완료/취소하거나 gc_uploads가 정리할 때까지 계속 센다)"""
+    os.makedirs(settings.UPLOAD_SESSION_DIR, exist_ok=True)
+    with transaction.atomic():
+        # 같은 사용자의 동시 시작이 둘 다 상한 검사를 통과하지 않도록 사용자 행을 잠근다
+        get_user_model().objects.select_for_update().filter(pk=user.pk).first()
+        open_sessions = UploadSession.objects.filter(user=user).aggregate(count=Count("id"), pending=Sum("size"))
+        if open_sessions["count"] >= MAX_OPEN_SESSIONS or (open_sessions["pending"] or 0) + size > MAX_PENDING_BYTES:
+            raise TooManySessions()
+
+        session = UploadSession(
+            upload_id=secrets.token_urlsafe(24), user=user, type=file_type, filename=filename, size=size,
+        )
+        # 미리 만들어 두면 조각마다 O_CREAT 경쟁을 신경 쓸 필요가 없다
+        os.close(os.open(session_path(session), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        session.save()
+    return session
+
+
+def write_chunk(session, offset: int, stream, length: int) -> int:
+    """stream에서 length 바이트를 offset 위치에 쓰고, 새로 받은 위치(다음 offset)를 반환한다"""
+    if offset > session.received or offset + length > session.size:
+        raise OffsetMismatch()
+
+    try:
+        fd = os.open(session_path(session), os.O_WRONLY)
+    except FileNotFoundError:
+        # 완료/취소되었거나 오래된 세션으로 정리되어 임시 파일이 없다
+        raise SessionNotFound()
+    pos = offset
+    try:
+        while pos < offset + length:
+            data = stream.read(min(READ_CHUNK, offset + length - pos))
+            if not data:
+                break
+            os.pwrite(fd, data, pos)
+            pos += len(data)
+    finally:
+        os.close(fd)
+
+    # 중간에 끊긴 조각도 실제로 쓴 곳까지는 인정한다 (같은 조각을 다시 보내도 결과는 같다)
+    UploadSession.objects.filter(pk=session.pk).update(
+        received=Greatest(F("received"), pos), updated_at=timezone.now(),
+    )
+    session.received = max(session.received, pos)
+    return session.received
+
+
+def discard_session(session):
+    try:
+        os.remove(session_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+def _claim_session(session) -> str:
+    """
+    세션 행을 잠가 지우고 임시 파일을 완료용 이름으로 옮긴 뒤 그 경로를 반환한다.
+    잠금은 이 짧은 구간에만 잡는다: 동시에 온 complete는 세션이 없어진 것을 보고 SessionNotFound,
+    늦게 온 조각은 임시 파일이 없어 SessionNotFound가 된다.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().filter(pk=session.pk).first()
+        if session is None:
+            raise SessionNotFound()
+        if session.received < session.size:
+            raise UploadIncomplete()
+        path = session_path(session)
+        claimed = f"{path}.complete"
+        os.replace(path, claimed)
+        session.delete()
+    return claimed
+
+
+def complete_session(session, sha256: str):
+    """
+    모두 받았고 sha256이 맞으면 UploadedFile을 만들고 세션을 정리한다. 체크섬이 다르면 세션도 버린다.
+    해시 계산과 스토리지 복사(최대 MAX_UPLOAD_SIZE)는 세션을 넘겨받은 뒤 트랜잭션/행 잠금 밖에서 한다.
+    도중에 프로세스가 죽어 남은 완료용 임시 파일은 gc_uploads가 세션 없는 파일로 정리한다.
+    """
+    path = _claim_session(session)
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as fp:
+            for chunk in iter(lambda: fp.read(READ_CHUNK), b""):
+                digest.update(chunk)
+        if digest.hexdigest() != sha256.lower():
+            raise ChecksumMismatch()
+        with open(path, "rb") as fp:
+            return create_uploaded_file(
+                File(fp, name=session.filename), session.type, digest.hexdigest(), session.size, session.user,
+            )
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,28 @@
+# calender/uploadhandlers.py
+import hashlib
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    업로드 청크를 그대로 다음 핸들러(메모리/임시 파일)로 넘기면서 sha256을 누적한다.
+    파일을 다 받은 뒤 다시 읽지 않고도 내용 해시를 알 수 있다. 결과는 digests[필드명] = (sha256, 크기).
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests = {}
+        self._hash = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = (self._hash.hexdigest(), file_size)
+        # None을 돌려줘야 다음 핸들러가 실제 파일 객체를 만든다
+        return None
@@ -1,6 +1,22 @@
 from django.urls import path
 
-from .views import RoomEventListCreateAPIView, EventDetailAPIView, FileUploadAPIView
+from .views import (
+    RoomEventListCreateAPIView,
+    RoomCalendarSummaryAPIView,
+    RoomCalendarSyncAPIView,
+    RoomCalendarBatchAPIView,
+    EventDetailAPIView,
+    UpcomingEventsAPIView,
+    AssigneeConflictsAPIView,
+    CalendarFeedTokenAPIView,
+    CalendarFeedAPIView,
+    FileUploadAPIView,
+    FileDownloadAPIView,
+    FileVariantAPIView,
+    UploadSessionCreateAPIView,
+    UploadSessionAPIView,
+    UploadSessionCompleteAPIView,
+)
 
 urlpatterns = [
     # /rooms/{room_id}/calendar/events
@@ -9,15 +25,84 @@ urlpatterns = [
         RoomEventListCreateAPIView.as_view(),
         name="room-calender-events",
     ),
+    # /rooms/{room_id}/calendar/summary?month=YYYY-MM
+    path(
+        "rooms/<int:room_id>/calendar/summary/",
+        RoomCalendarSummaryAPIView.as_view(),
+        name="room-calender-summary",
+    ),
+    # /rooms/{room_id}/calendar/sync?sync_token=...
+    path(
+        "rooms/<int:room_id>/calendar/sync/",
+        RoomCalendarSyncAPIView.as_view(),
+        name="room-calender-sync",
+    ),
+    # /rooms/{room_id}/calendar/batch/
+    path(
+        "rooms/<int:room_id>/calendar/batch/",
+        RoomCalendarBatchAPIView.as_view(),
+        name="room-calender-batch",
+    ),
     # /calendar/events/{event_id}/
     path(
         "calendar/events/<int:event_id>/",
         EventDetailAPIView.as_view(),
         name="calendar-event-detail",
     ),
+    # /calendar/upcoming?limit=N&include_shifts=true&cursor=...
+    path(
+        "calendar/upcoming/",
+        UpcomingEventsAPIView.as_view(),
+        name="calendar-upcoming",
+    ),
+    # /calendar/conflicts?assignee_id=&start_at=&end_at=
+    path(
+        "calendar/conflicts/",
+        AssigneeConflictsAPIView.as_view(),
+        name="calendar-conflicts",
+    ),
+    # ICS 구독 주소 관리 / 피드 (토큰 인증)
+    path(
+        "calendar/feed/",
+        CalendarFeedTokenAPIView.as_view(),
+        name="calendar-feed-token",
+    ),
+    path(
+        "calendar/feed/<str:token>.ics",
+        CalendarFeedAPIView.as_view(),
+        name="calendar-feed",
+    ),
     path(
         "files/upload/",
         FileUploadAPIView.as_view(),
         name="file-upload",
     ),
+    # 업로드 파일 내려받기 (권한 확인 후 X-Accel-Redirect)
+    path(
+        "files/<int:file_id>/",
+        FileDownloadAPIView.as_view(),
+        name="file-download",
+    ),
+    # 이미지 파생본 (thumb/medium) - 처리 전이면 요청 시 생성
+    path(
+        "files/<int:file_id>/variants/<str:name>/",
+        FileVariantAPIView.as_view(),
+        name="file-variant",
+    ),
+    # 분할 업로드: 시작 → PUT ?offset=N (조각) → complete
+    path(
+        "files/uploads/",
+        UploadSessionCreateAPIView.as_view(),
+        name="file-upload-session-create",
+    ),
+    path(
+        "files/uploads/<str:upload_id>/",
+        UploadSessionAPIView.as_view(),
+        name="file-upload-session",
+    ),
+    path(
+        "files/uploads/<str:upload_id>/complete/",
+        UploadSessionCompleteAPIView.as_view(),
+        name="file-upload-session-complete",
+    ),
 ]
@@ -1,7 +1,10 @@
 # calender/utils.py
 
+from django.db.models import Q
+
 from room.models import Room, RoomMembership
 from user.models import CustomUser as User
+from .models import CalendarAttachment, UploadedFile
 
 
 def is_room_member(room: Room, user: User) -> bool:
@@ -10,3 +13,62 @@ def is_room_member(room: Room, user: User) -> bool:
     RoomMembership(room, user)을 통해 멤버를 판별한다.
     """
     return RoomMembership.objects.filter(room=room, user=user).exists()
+
+
+
+def _file_pk(file_id):
+    return int(file_id) if str(file_id).isdigit() else None
+
+
+def linkable_file_ids(user, room, pks) -> set:
+    """
+    pks 중 일정에 연결할 수 있는 업로드 파일 id: 요청한 사용자가 올렸거나 이미 같은 방 일정에 첨부된 파일.
+    첨부하면 방 멤버 모두가 받을 수 있게 되므로, 남의 파일을 id만 알고 가져오지 못하게 한다.
+    """
+    if not pks:
+        return set()
+    return set(UploadedFile.objects
+               .filter(Q(uploaded_by=user) | Q(attachments__event__room=room), id__in=pks)
+               .values_list("id", flat=True)
+               .distinct())
+
+
+def resolve_attachment_files(user, room, attachment_lists) -> list:
+    """
+    여러 첨부 입력 목록의 file_id를 한 번에 확인한다.
+    연결할 수 있는 첨부에는 att["uploaded_file_id"]를 넣고, 목록마다 연결할 수 없는 file_id 목록을 반환한다
+    (있는 업로드 파일이지만 linkable_file_ids에 없는 경우 → 호출한 쪽에서 400).
+    업로드 파일 id가 아닌 file_id는 예전처럼 연결 없이 저장한다.
+    """
+    lists = [atts or [] for atts in attachment_lists]
+    pks = {_file_pk(att["file_id"]) for atts in lists for att in atts} - {None}
+    existing = set(UploadedFile.objects.filter(id__in=pks).values_list("id", flat=True)) if pks else set()
+    allowed = linkable_file_ids(user, room, existing)
+
+    rejected = []
+    for atts in lists:
+        denied = []
+        for att in atts:
+            pk = _file_pk(att["file_id"])
+            if pk in allowed:
+                att["uploaded_file_id"] = pk
+            elif pk in existing:
+                denied.append(att["file_id"])
+        rejected.append(denied)
+    return rejected
+
+
+def build_attachments(event, attachments) -> list:
+    """
+    입력 첨부 목록으로 CalendarAttachment 객체를 만든다 (저장은 호출한 쪽에서 bulk_create).
+    uploaded_file FK는 resolve_attachment_files에서 확인된 첨부만 연결한다.
+    """
+    return [
+        CalendarAttachment(
+            event=event,
+            file_id=att["file_id"],
+            uploaded_file_id=att.get("uploaded_file_id"),
+            type=att["type"],
+        )
+        for att in attachments or []
+    ]
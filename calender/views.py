@@ -1,25 +1,70 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.utils.urls import replace_query_param
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils import timezone
 from django.utils.dateparse import parse_date
-from datetime import timedelta
-from dateutil.relativedelta import relativedelta
 
-from room.models import Room
+from room.models import Room, RoomMembership
 from user.models import CustomUser as User
-from .models import CalendarEvent, CalendarAttachment
+from utils.streaming import streaming_response
+from .models import CalendarEvent, CalendarAttachment, CalendarFeedToken
 from .serializers import (
     CalendarEventSerializer,
     CalendarEventSummarySerializer,
     CalendarEventCreateUpdateSerializer,
+    CalendarBatchSerializer,
+    ConflictQuerySerializer,
 )
-from .utils import is_room_member
+from . import batch
+from .broadcast import publish_calendar_change
+from .conflicts import (
+    MAX_CANDIDATES, TooManyCandidates, find_conflicts, item_payload, occurrence_intervals, visible_room_ids,
+)
+from .ics import feed_etag, feed_last_modified, feed_room_ids, issue_feed_token, iter_feed
+from .recurrence import expand, overlapping
+from .summary import get_month_summary, month_range
+from .upcoming import (
+    KIND_EVENT as UPCOMING_KIND_EVENT,
+    decode_cursor as decode_upcoming_cursor,
+    encode_cursor as encode_upcoming_cursor,
+    shift_payload,
+    user_upcoming,
+)
+from .sync import (
+    DEFAULT_PAGE_SIZE as DEFAULT_SYNC_PAGE_SIZE,
+    MAX_PAGE_SIZE as MAX_SYNC_PAGE_SIZE,
+    SyncTokenExpired,
+    sync_page,
+)
+from .series import SCOPES, default_scope, delete_occurrences, preview_intervals, update_occurrences
+from .utils import build_attachments, is_room_member, resolve_attachment_files
+
+from . import upload_sessions
+from .blobs import create_uploaded_file
+from .delivery import can_access, serve_file
+from .images import VARIANT_SIZES
+from .processing import ensure_variants
+from .models import UploadedFile, UploadSession
+from .serializers import (
+    UploadedFileSerializer,
+    UploadSessionCompleteSerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer,
+)
+from .uploadhandlers import HashingUploadHandler
+
 
-from .models import UploadedFile
-from .serializers import UploadedFileSerializer
+UPCOMING_PAGE_SIZE = 20
+UPCOMING_MAX_PAGE_SIZE = 100
 
 
 def error_response(code, msg, status_code, detail=None):
@@ -34,12 +79,54 @@ def error_response(code, msg, status_code, detail=None):
     )
 
 
-class RoomEventListCreateAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+def attachment_error(user, room, attachments):
+    """남의 업로드 파일을 첨부하려 하면 400 응답, 아니면 None (연결할 파일은 첨부 입력에 표시된다)"""
+    denied, = resolve_attachment_files(user, room, [attachments])
+    if denied:
+        return error_response(
+            "ATTACHMENT_FILE_FORBIDDEN",
+            "직접 올렸거나 이 방 일정에 이미 첨부된 파일만 첨부할 수 있습니다.",
+            400,
+            {"file_id": denied},
+        )
+    return None
+
+
+def too_many_candidates_error():
+    return error_response(
+        "CALENDAR_CONFLICT_CHECK_TOO_LARGE",
+        f"겹침 검사는 발생분 {MAX_CANDIDATES}개까지 가능합니다. 반복 종료일을 앞당기거나 검사 없이 저장하세요.",
+        400,
+        {"max_candidates": MAX_CANDIDATES},
+    )
+
+
+def conflict_error(requester, assignee, intervals, exclude=None):
+    """
+    check_conflicts 요청에서 담당자 일정이 겹치면 409 응답, 아니면 None.
+    다른 사람이 담당자면 /calendar/conflicts/와 같이 요청자가 속하지 않은 방 항목은 시간만 알려준다.
+    """
+    found = find_conflicts(assignee, [(start_at, end_at) for start_at, end_at, _ in intervals], exclude)
+    if not found["conflicts"]:
+        return None
+    visible_rooms = None if assignee.pk == requester.pk else visible_room_ids(requester)
+    return error_response(
+        "CALENDAR_ASSIGNEE_CONFLICT",
+        "담당자의 다른 일정 또는 확정 근무와 시간이 겹칩니다.",
+        status.HTTP_409_CONFLICT,
+        detail={"conflicts": [item_payload(item, visible_rooms) for item in found["conflicts"]]},
+    )
+
 
+def event_diff(event) -> dict:
+    """실시간 알림용 요약 (목록 항목과 같은 모양)"""
+    return dict(CalendarEventSummarySerializer(event).data)
+
+
+class RoomCalendarMixin:
     def get_room(self, room_id, user):
         try:
-            room = Room.objects.get(id=room_id)
+            room = Room.objects.alive().get(id=room_id)
         except Room.DoesNotExist:
             return None, error_response(
                 "ROOM_NOT_FOUND",
@@ -57,6 +144,10 @@ class RoomEventListCreateAPIView(APIView):
 
         return room, None
 
+
+class RoomEventListCreateAPIView(RoomCalendarMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
     def get(self, request, room_id):
         room, err = self.get_room(room_id, request.user)
         if err:
@@ -92,26 +183,35 @@ class RoomEventListCreateAPIView(APIView):
                 },
             )
 
-        events = CalendarEvent.objects.filter(room=room).order_by("date", "start_at")
+        start_date = end_date = None
 
-        # date or 기간 필터링
-        if date_str:
-        
-            events = events.filter(date=date_str).order_by("date", "start_at")
-        elif start_date_str and end_date_str:
-            start_date = parse_date(start_date_str)
-            end_date = parse_date(end_date_str)
-            if not start_date or not end_date:
-                return error_response(
-                    "CALENDAR_INVALID_QUERY",
-                    "날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용하세요.",
-                    status.HTTP_400_BAD_REQUEST,
-                    detail={
-                        "location": "query",
-                        "fields": ["start_date", "end_date"],
-                    },
-                )
-            events = events.filter(date__range=[start_date, end_date]).order_by("date", "start_at")
+        # date or 기간 필터링 (형식은 맞지만 존재하지 않는 날짜도 형식 오류로 처리)
+        try:
+            if date_str:
+                start_date = end_date = parse_date(date_str)
+            elif start_date_str and end_date_str:
+                start_date = parse_date(start_date_str)
+                end_date = parse_date(end_date_str)
+        except ValueError:
+            start_date = end_date = None
+        if (date_str or start_date_str) and (not start_date or not end_date):
+            return error_response(
+                "CALENDAR_INVALID_QUERY",
+                "날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용하세요.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "location": "query",
+                    "fields": ["date"] if date_str else ["start_date", "end_date"],
+                },
+            )
+
+        # 반복 일정은 원본만 조회하고 요청 구간 안의 발생분만 펼친다
+        events = overlapping(
+            CalendarEvent.objects.filter(room=room).select_related("assignee"),
+            start_date,
+            end_date,
+        )
+        events = expand(events, start_date, end_date)
 
         serializer = CalendarEventSummarySerializer(events, many=True)
         data = serializer.data
@@ -147,85 +247,42 @@ class RoomEventListCreateAPIView(APIView):
             if not is_room_member(room, assignee):
                 return error_response("ASSIGNEE_NOT_ROOM_MEMBER", "담당자는 방 멤버여야 합니다.", 400)
 
-        repeat_rule = v.get("repeat_rule", "NONE")
-        repeat_until = v.get("repeat_until")
-
-        events = []
-
-        # 원본 이벤트 생성
-        base_event = CalendarEvent.objects.create(
-            room=room,
-            date=v["date"],
-            title=v["title"],
-            start_at=v["start_at"],
-            end_at=v["end_at"],
-            is_all_day=v.get("is_all_day", False),
-            repeat_rule=repeat_rule,
-            repeat_until=repeat_until,
-            description=v.get("description"),
-            assignee=assignee,
-        )
-        events.append(base_event)
-
-    # attachments 생성
-        for att in v.get("attachments", []):
-            CalendarAttachment.objects.create(
-                event=base_event,
-             file_id=att["file_id"],
-                type=att["type"],
-            )
-
-    # 반복 일정 실제 여러 개 생성
-        if repeat_rule != "NONE" and repeat_until:
-            current_date = v["date"]
-
-            while True:
-                # 반복 규칙에 따라 날짜 증가
-                if repeat_rule == "DAILY":
-                    current_date += timedelta(days=1)
-                elif repeat_rule == "WEEKLY":
-                    current_date += timedelta(weeks=1)
-                elif repeat_rule == "MONTHLY":
-                    current_date += relativedelta(months=1)
-
-                # 반복 종료 조건
-                if current_date > repeat_until:
-                    break
-
-                # start/end_at도 날짜만 current_date 기반으로 교체
-                new_start = v["start_at"].replace(
-                    year=current_date.year,
-                    month=current_date.month,
-                    day=current_date.day,
-                )
-                new_end = v["end_at"].replace(
-                    year=current_date.year,
-                    month=current_date.month,
-                    day=current_date.day,
-                )
+        err = attachment_error(request.user, room, v.get("attachments"))
+        if err:
+            return err
 
-            # 이벤트 생성
-                ev = CalendarEvent.objects.create(
-                    room=room,
-                    date=current_date,
-                    title=v["title"],
-                    start_at=new_start,
-                    end_at=new_end,
-                    is_all_day=v.get("is_all_day", False),
-                    repeat_rule="NONE",   # 복제된 이벤트들은 반복 X
-                    repeat_until=None,
-                    description=v.get("description"),
-                    assignee=assignee,
-                )
-                events.append(ev)
+        repeat_rule = v.get("repeat_rule", "NONE")
+        repeat_until = v.get("repeat_until") if repeat_rule != "NONE" else None
 
-            # attachments도 복제
-                for att in v.get("attachments", []):
-                    CalendarAttachment.objects.create(
-                        event=ev,
-                        file_id=att["file_id"],
-                        type=att["type"],
-                    )
+        if v.get("check_conflicts") and assignee is not None:
+            preview = CalendarEvent(
+                date=v["date"], start_at=v["start_at"], end_at=v["end_at"],
+                repeat_rule=repeat_rule, repeat_until=repeat_until,
+            )
+            try:
+                err = conflict_error(request.user, assignee, occurrence_intervals(preview))
+            except TooManyCandidates:
+                err = too_many_candidates_error()
+            if err:
+                return err
+
+        # 반복 일정도 원본 한 행만 저장 (발생분은 조회 시 계산)
+        with transaction.atomic():
+            base_event = CalendarEvent.objects.create(
+                room=room,
+                date=v["date"],
+                title=v["title"],
+                start_at=v["start_at"],
+                end_at=v["end_at"],
+                is_all_day=v.get("is_all_day", False),
+                repeat_rule=repeat_rule,
+                repeat_until=repeat_until,
+                description=v.get("description"),
+                assignee=assignee,
+            )
+            CalendarAttachment.objects.bulk_create(build_attachments(base_event, v.get("attachments")))
+            publish_calendar_change(room.id, "calendar.created", data=event_diff(base_event))
+        base_event = CalendarEvent.objects.with_details().get(pk=base_event.pk)
 
     # 기존 API 구조상 원본 이벤트만 반환
         return Response(
@@ -234,11 +291,279 @@ class RoomEventListCreateAPIView(APIView):
         )
 
 
+class RoomCalendarBatchAPIView(RoomCalendarMixin, APIView):
+    """
+    일정 생성/수정/삭제 묶음 처리 (전부 성공하거나 전부 실패)
+    {"operations": [{"op": "create", "data": {...}},
+                    {"op": "update", "id": 1, "scope": "this", "occurrence_date": "YYYY-MM-DD", "data": {...}},
+                    {"op": "delete", "id": 2}]}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, room_id):
+        room, err = self.get_room(room_id, request.user)
+        if err:
+            return err
+
+        serializer = CalendarBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response("CALENDAR_VALIDATION_ERROR", "유효성 검사 실패", 400, serializer.errors)
+        operations = serializer.validated_data["operations"]
+
+        try:
+            ops = batch.prepare(room, operations, request.user)
+        except batch.BatchValidationError as e:
+            return error_response(
+                "CALENDAR_BATCH_INVALID",
+                "일부 작업이 유효하지 않아 아무것도 반영하지 않았습니다.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={"operations": e.errors},
+            )
+
+        with transaction.atomic():
+            results = batch.apply(room, ops)
+            events = CalendarEvent.objects.with_details().in_bulk(
+                [r["id"] for r in results if r["op"] != batch.OP_DELETE]
+            )
+            # 작업마다 보내지 않고 묶음 전체를 한 번에 알린다
+            publish_calendar_change(
+                room.id, "calendar.batch",
+                created=[event_diff(events[r["id"]]) for r in results if r["op"] == batch.OP_CREATE],
+                updated=[event_diff(events[r["id"]]) for r in results if r["op"] == batch.OP_UPDATE],
+                deleted=[
+                    {"event_id": r["id"], "scope": r["scope"], "deleted_count": r["deleted_count"]}
+                    for r in results if r["op"] == batch.OP_DELETE
+                ],
+            )
+
+        context = {"request": request}
+        for r in results:
+            if r["op"] != batch.OP_DELETE:
+                r["event"] = CalendarEventSerializer(events[r["id"]], context=context).data
+        return Response({"room_id": room.id, "results": results})
+
+
+class RoomCalendarSummaryAPIView(RoomCalendarMixin, APIView):
+    """월간 달력용 날짜별 일정 개수/제목 요약"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, room_id):
+        room, err = self.get_room(room_id, request.user)
+        if err:
+            return err
+
+        month_str = request.query_params.get("month")
+        today = timezone.now().date()
+        year, month = today.year, today.month
+        if month_str:
+            try:
+                year, month = (int(part) for part in month_str.split("-"))
+                month_range(year, month)
+            except ValueError:
+                return error_response(
+                    "CALENDAR_INVALID_QUERY",
+                    "month 형식이 올바르지 않습니다. YYYY-MM 형식을 사용하세요.",
+                    status.HTTP_400_BAD_REQUEST,
+                    detail={"location": "query", "fields": ["month"]},
+                )
+
+        return Response({
+            "room_id": room.id,
+            "month": f"{year:04d}-{month:02d}",
+            "days": get_month_summary(room.id, year, month),
+        })
+
+
+class RoomCalendarSyncAPIView(RoomCalendarMixin, APIView):
+    """
+    증분 동기화: ?sync_token=...&limit=N
+    토큰 없이 호출하면 전체 일정을, 이후에는 바뀐 일정과 삭제된 일정 id만 내려준다.
+    has_more가 true면 받은 sync_token으로 바로 다시 호출한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, room_id):
+        room, err = self.get_room(room_id, request.user)
+        if err:
+            return err
+
+        try:
+            limit = min(int(request.query_params.get("limit", DEFAULT_SYNC_PAGE_SIZE)), MAX_SYNC_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError(limit)
+        except ValueError:
+            return error_response(
+                "CALENDAR_INVALID_QUERY",
+                f"limit은 1~{MAX_SYNC_PAGE_SIZE} 사이의 정수여야 합니다.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={"location": "query", "fields": ["limit"]},
+            )
+
+        try:
+            page = sync_page(room.id, request.query_params.get("sync_token"), limit)
+        except SyncTokenExpired:
+            return error_response(
+                "CALENDAR_SYNC_TOKEN_EXPIRED",
+                "동기화 토큰이 만료되었습니다. 토큰 없이 전체 동기화를 다시 해주세요.",
+                status.HTTP_410_GONE,
+            )
+        except ValueError:
+            return error_response(
+                "CALENDAR_SYNC_TOKEN_INVALID",
+                "유효하지 않은 동기화 토큰입니다.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={"location": "query", "fields": ["sync_token"]},
+            )
+
+        context = {"request": request}
+        return Response({
+            "room_id": room.id,
+            "created": CalendarEventSerializer(page["created"], many=True, context=context).data,
+            "updated": CalendarEventSerializer(page["updated"], many=True, context=context).data,
+            "deleted": page["deleted"],
+            "sync_token": page["sync_token"],
+            "has_more": page["has_more"],
+        })
+
+
+class AssigneeConflictsAPIView(APIView):
+    """
+    담당자 일정 겹침 조회 (?assignee_id=&start_at=&end_at=&exclude_event_id=)
+    conflicts: 주어진 구간과 겹치는 일정/확정 근무, overlaps: 그 구간 안에서 이미 서로 겹쳐 있는 쌍
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        ser = ConflictQuerySerializer(data=request.query_params)
+        if not ser.is_valid():
+            return error_response("CALENDAR_INVALID_QUERY", "유효성 검사 실패", 400, ser.errors)
+        q = ser.validated_data
+
+        me = request.user
+        assignee_id = q.get("assignee_id", me.id)
+        visible_rooms = None
+        if assignee_id != me.id:
+            my_rooms = visible_room_ids(me)
+            shared = RoomMembership.objects.filter(user_id=assignee_id, room_id__in=my_rooms).exists()
+            if not shared:
+                return error_response("ROOM_MEMBER_ONLY", "같은 방 멤버의 일정만 확인할 수 있습니다.", 403)
+            visible_rooms = my_rooms
+        assignee = get_object_or_404(User, id=assignee_id)
+
+        exclude = None
+        if q.get("exclude_event_id"):
+            # 반복 일정을 제외하면 그 일정에서 분리된 발생분도 함께 제외
+            exclude = Q(pk=q["exclude_event_id"]) | Q(series_id=q["exclude_event_id"])
+        found = find_conflicts(assignee, [(q["start_at"], q["end_at"])], exclude)
+        return Response({
+            "assignee_id": assignee.id,
+            "conflicts": [item_payload(item, visible_rooms) for item in found["conflicts"]],
+            "overlaps": [
+                [item_payload(a, visible_rooms), item_payload(b, visible_rooms)]
+                for a, b in found["overlaps"]
+            ],
+        })
+
+
+class UpcomingEventsAPIView(APIView):
+    """
+    내가 속한 모든 방의 다가오는 일정 (?limit=N&include_shifts=true&cursor=...)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            limit = min(int(params.get("limit", UPCOMING_PAGE_SIZE)), UPCOMING_MAX_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError(limit)
+            after = decode_upcoming_cursor(params["cursor"]) if params.get("cursor") else None
+        except ValueError:
+            return error_response(
+                "CALENDAR_INVALID_QUERY",
+                "limit 또는 cursor 값이 올바르지 않습니다.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={"location": "query", "fields": ["limit", "cursor"]},
+            )
+        include_shifts = str(params.get("include_shifts")).lower() in ("true", "1", "yes")
+
+        items, has_more = user_upcoming(request.user, limit, after, include_shifts)
+
+        events = [obj for (_, _, kind, _), obj in items if kind == UPCOMING_KIND_EVENT]
+        event_data = iter(CalendarEventSummarySerializer(events, many=True).data)
+        results = []
+        for (_, _, kind, _), obj in items:
+            if kind == UPCOMING_KIND_EVENT:
+                results.append({"type": "event", "room_id": obj.room_id, **next(event_data)})
+            else:
+                results.append(shift_payload(obj))
+
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_upcoming_cursor(items[-1][0])
+            )
+        return Response({"next": next_url, "results": results})
+
+
+class CalendarFeedTokenAPIView(APIView):
+    """
+    ICS 구독 주소 발급/재발급/해지.
+    GET: 기존 주소(없으면 발급), POST: 새 토큰으로 교체, DELETE: 해지
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _payload(self, request, feed):
+        url = request.build_absolute_uri(reverse("calendar-feed", kwargs={"token": feed.token}))
+        return {"url": url, "created_at": feed.created_at}
+
+    def get(self, request):
+        return Response(self._payload(request, issue_feed_token(request.user)))
+
+    def post(self, request):
+        return Response(self._payload(request, issue_feed_token(request.user, rotate=True)),
+                        status=status.HTTP_201_CREATED)
+
+    def delete(self, request):
+        CalendarFeedToken.objects.filter(user=request.user).delete()
+        return Response({"success": True})
+
+
+class CalendarFeedAPIView(APIView):
+    """
+    토큰 인증 ICS 피드 (캘린더 앱이 주기적으로 폴링).
+    내용이 바뀌지 않았으면 ETag/Last-Modified로 304를 돌려준다.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, token):
+        feed = CalendarFeedToken.objects.select_related("user").filter(token=token).first()
+        if feed is None or not feed.user.is_active:
+            return error_response("CALENDAR_FEED_NOT_FOUND", "구독 주소를 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
+
+        user = feed.user
+        room_ids = feed_room_ids(user)
+        etag = f'"{feed_etag(user, room_ids)}"'
+        last_modified = feed_last_modified(etag)
+
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = streaming_response(request, iter_feed(user, room_ids), content_type="text/calendar; charset=utf-8")
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "private, max-age=300"
+        response["Content-Disposition"] = 'inline; filename="careon.ics"'
+        return response
+
+
 class EventDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get_event(self, event_id, user):
-        event = get_object_or_404(CalendarEvent, id=event_id)
+        event = get_object_or_404(CalendarEvent.objects.with_details(), id=event_id)
         if not is_room_member(event.room, user):
             return None, error_response("ROOM_MEMBER_ONLY", "방 멤버만 접근 가능", 403)
         return event, None
@@ -251,8 +576,38 @@ class EventDetailAPIView(APIView):
             CalendarEventSerializer(event, context={"request": request}).data
             )
 
+    def parse_scope(self, request, event):
+        """?scope=this|following|all&occurrence_date=YYYY-MM-DD 해석"""
+        scope = request.query_params.get("scope") or default_scope(event)
+        if scope not in SCOPES:
+            return None, None, error_response(
+                "CALENDAR_INVALID_QUERY",
+                "scope는 this, following, all 중 하나여야 합니다.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={"location": "query", "fields": ["scope"]},
+            )
+
+        raw = request.query_params.get("occurrence_date")
+        occurrence_date = None
+        if raw:
+            try:
+                occurrence_date = parse_date(raw)
+            except ValueError:
+                pass
+            if occurrence_date is None:
+                return None, None, error_response(
+                    "CALENDAR_INVALID_QUERY",
+                    "날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용하세요.",
+                    status.HTTP_400_BAD_REQUEST,
+                    detail={"location": "query", "fields": ["occurrence_date"]},
+                )
+        return scope, occurrence_date, None
+
     def patch(self, request, event_id):
         event, err = self.get_event(event_id, request.user)
+        if err:
+            return err
+        scope, occurrence_date, err = self.parse_scope(request, event)
         if err:
             return err
 
@@ -260,23 +615,52 @@ class EventDetailAPIView(APIView):
         if not serializer.is_valid():
             return error_response("CALENDAR_VALIDATION_ERROR", "유효성 검사 실패", 400, serializer.errors)
 
-        v = serializer.validated_data
-        for field, value in v.items():
-            if field == "assignee_id":
-                if value is None:
-                    event.assignee = None
-                else:
-                    try:
-                        assignee = User.objects.get(id=value)
-                    except User.DoesNotExist:
-                        return error_response("ASSIGNEE_NOT_FOUND", "담당자 없음", 404)
-                    if not is_room_member(event.room, assignee):
-                        return error_response("ASSIGNEE_NOT_ROOM_MEMBER", "담당자는 방 멤버만 가능", 400)
-                    event.assignee = assignee
+        v = dict(serializer.validated_data)
+        attachments = v.pop("attachments", None)
+        if "assignee_id" in v:
+            value = v.pop("assignee_id")
+            if value is None:
+                v["assignee"] = None
             else:
-                setattr(event, field, value)
-
-        event.save()
+                try:
+                    assignee = User.objects.get(id=value)
+                except User.DoesNotExist:
+                    return error_response("ASSIGNEE_NOT_FOUND", "담당자 없음", 404)
+                if not is_room_member(event.room, assignee):
+                    return error_response("ASSIGNEE_NOT_ROOM_MEMBER", "담당자는 방 멤버만 가능", 400)
+                v["assignee"] = assignee
+        if attachments is not None:
+            err = attachment_error(request.user, event.room, attachments)
+            if err:
+                return err
+
+        check = v.pop("check_conflicts", False)
+        try:
+            assignee = v["assignee"] if "assignee" in v else event.assignee
+            if check and assignee is not None:
+                intervals, exclude = preview_intervals(event, scope, occurrence_date, v)
+                err = conflict_error(request.user, assignee, intervals, exclude)
+                if err:
+                    return err
+            event = update_occurrences(event, scope, occurrence_date, v, attachments)
+        except TooManyCandidates:
+            return too_many_candidates_error()
+        except ValueError:
+            return error_response(
+                "CALENDAR_OCCURRENCE_NOT_FOUND",
+                "해당 날짜에 반복 일정 발생분이 없습니다.",
+                status.HTTP_404_NOT_FOUND,
+                detail={"location": "query", "value": f"occurrence_date={occurrence_date}"},
+            )
+        publish_calendar_change(
+            event.room_id, "calendar.updated",
+            event_id=event_id,
+            scope=scope,
+            occurrence_date=occurrence_date.isoformat() if occurrence_date else None,
+            fields=sorted(v) + (["attachments"] if attachments is not None else []),
+            data=event_diff(event),
+        )
+        event = CalendarEvent.objects.with_details().get(pk=event.pk)
         return Response(
             CalendarEventSerializer(event, context={"request": request}).data
             )
@@ -285,8 +669,26 @@ class EventDetailAPIView(APIView):
         event, err = self.get_event(event_id, request.user)
         if err:
             return err
-        event.delete()
-        return Response({"success": True, "deleted_id": event_id})
+        scope, occurrence_date, err = self.parse_scope(request, event)
+        if err:
+            return err
+
+        try:
+            deleted_count = delete_occurrences(event, scope, occurrence_date)
+        except ValueError:
+            return error_response(
+                "CALENDAR_OCCURRENCE_NOT_FOUND",
+                "해당 날짜에 반복 일정 발생분이 없습니다.",
+                status.HTTP_404_NOT_FOUND,
+                detail={"location": "query", "value": f"occurrence_date={occurrence_date}"},
+            )
+        publish_calendar_change(
+            event.room_id, "calendar.deleted",
+            event_id=event_id,
+            scope=scope,
+            occurrence_date=occurrence_date.isoformat() if occurrence_date else None,
+        )
+        return Response({"success": True, "deleted_id": event_id, "scope": scope, "deleted_count": deleted_count})
 
 class FileUploadAPIView(APIView):
 
@@ -294,6 +696,9 @@ class FileUploadAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
+        # 본문을 읽기 전에 등록해야 청크가 디스크로 가는 동안 해시가 계산된다
+        hasher = HashingUploadHandler(request)
+        request.upload_handlers.insert(0, hasher)
         uploaded = request.FILES.get("file")
         file_type = request.data.get("type")
 
@@ -309,6 +714,188 @@ class FileUploadAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        obj = UploadedFile.objects.create(file=uploaded, type=file_type)
+        # 같은 내용이 이미 있으면 저장하지 않고 기존 blob을 공유한다
+        sha256, size = hasher.digests["file"]
+        obj = create_uploaded_file(uploaded, file_type, sha256, size, request.user)
+        serializer = UploadedFileSerializer(obj, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class FileDownloadMixin:
+    def get_file(self, file_id, user):
+        uploaded = get_object_or_404(UploadedFile.objects.select_related("blob"), id=file_id)
+        # 존재 여부도 드러내지 않도록 권한이 없으면 404
+        if not can_access(user, uploaded):
+            return None, error_response("FILE_NOT_FOUND", "파일을 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
+        return uploaded, None
+
+
+class FileDownloadAPIView(FileDownloadMixin, APIView):
+    """
+    업로드 원본 내려받기 (올린 사람 또는 첨부된 일정의 방 멤버만).
+    운영에서는 X-Accel-Redirect로 nginx가 전송하며 Range(녹음 탐색)도 nginx가 처리한다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, file_id):
+        uploaded, err = self.get_file(file_id, request.user)
+        if err:
+            return err
+        return serve_file(request, uploaded.file.storage, uploaded.file.name)
+
+
+class FileVariantAPIView(FileDownloadMixin, APIView):
+    """
+    이미지 파생본 (원본과 같은 권한).
+    백그라운드 처리가 아직이면 이 요청에서 만들고, 파생본이 없으면(이미지로 읽을 수 없는 파일) 원본을 준다.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, file_id, name):
+        uploaded, err = self.get_file(file_id, request.user)
+        if err:
+            return err
+        if uploaded.type != UploadedFile.FileType.IMAGE or name not in VARIANT_SIZES:
+            return error_response(
+                "FILE_VARIANT_NOT_FOUND",
+                "지원하지 않는 이미지 크기입니다.",
+                status.HTTP_404_NOT_FOUND,
+                detail={"sizes": list(VARIANT_SIZES)},
+            )
+        path = ensure_variants(uploaded).get(name) or uploaded.file.name
+        return serve_file(request, uploaded.file.storage, path)
+
+
+class UploadSessionCreateAPIView(APIView):
+    """분할 업로드 시작: {"type", "filename", "size"} → upload_id와 권장 조각 크기"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ser = UploadSessionCreateSerializer(data=request.data, context={"max_size": upload_sessions.MAX_UPLOAD_SIZE})
+        if not ser.is_valid():
+            return error_response("UPLOAD_VALIDATION_ERROR", "유효성 검사 실패", 400, ser.errors)
+        v = ser.validated_data
+        try:
+            session = upload_sessions.start_session(request.user, v["type"], v["filename"], v["size"])
+        except upload_sessions.TooManySessions:
+            return error_response(
+                "UPLOAD_TOO_MANY_SESSIONS",
+                "진행 중인 업로드가 너무 많습니다. 완료하거나 취소한 뒤 다시 시작하세요.",
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "max_sessions": upload_sessions.MAX_OPEN_SESSIONS,
+                    "max_pending_bytes": upload_sessions.MAX_PENDING_BYTES,
+                },
+            )
+        data = UploadSessionSerializer(session).data
+        data.update(chunk_size=upload_sessions.CHUNK_SIZE, max_chunk_size=upload_sessions.MAX_CHUNK_SIZE)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionMixin:
+    def session_not_found(self):
+        return error_response(
+            "UPLOAD_NOT_FOUND",
+            "업로드 세션을 찾을 수 없습니다. 처음부터 다시 시작하세요.",
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def get_session(self, upload_id, user):
+        session = UploadSession.objects.filter(upload_id=upload_id, user=user).first()
+        if session is None:
+            return None, self.session_not_found()
+        return session, None
+
+
+class UploadSessionAPIView(UploadSessionMixin, APIView):
+    """
+    GET: 이어 보낼 위치(offset) 조회
+    PUT ?offset=N: 본문(바이트 그대로)을 offset 위치에 기록
+    DELETE: 업로드 취소
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        session, err = self.get_session(upload_id, request.user)
+        if err:
+            return err
+        return Response(UploadSessionSerializer(session).data)
+
+    def put(self, request, upload_id):
+        session, err = self.get_session(upload_id, request.user)
+        if err:
+            return err
+
+        try:
+            offset = int(request.query_params.get("offset", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            offset = length = -1
+        if offset < 0 or length <= 0:
+            return error_response(
+                "UPLOAD_INVALID_CHUNK",
+                "offset 쿼리와 Content-Length가 필요합니다.",
+                status.HTTP_400_BAD_REQUEST,
+                detail={"location": "query", "fields": ["offset"]},
+            )
+        if length > upload_sessions.MAX_CHUNK_SIZE:
+            return error_response(
+                "UPLOAD_CHUNK_TOO_LARGE",
+                "조각이 너무 큽니다.",
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail={"max_chunk_size": upload_sessions.MAX_CHUNK_SIZE},
+            )
+
+        # request.data를 거치지 않고 본문 스트림을 조금씩 읽어 바로 파일에 쓴다
+        try:
+            received = upload_sessions.write_chunk(session, offset, request.stream, length)
+        except upload_sessions.OffsetMismatch:
+            return error_response(
+                "UPLOAD_OFFSET_MISMATCH",
+                "받은 위치와 맞지 않는 조각입니다. offset부터 다시 보내세요.",
+                status.HTTP_409_CONFLICT,
+                detail={"offset": session.received, "size": session.size},
+            )
+        except upload_sessions.SessionNotFound:
+            return self.session_not_found()
+        return Response({"upload_id": session.upload_id, "offset": received, "size": session.size})
+
+    def delete(self, request, upload_id):
+        session, err = self.get_session(upload_id, request.user)
+        if err:
+            return err
+        upload_sessions.discard_session(session)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionCompleteAPIView(UploadSessionMixin, APIView):
+    """분할 업로드 완료: {"sha256"}이 맞으면 UploadedFile 생성 (일반 업로드와 같은 응답)"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        session, err = self.get_session(upload_id, request.user)
+        if err:
+            return err
+        ser = UploadSessionCompleteSerializer(data=request.data)
+        if not ser.is_valid():
+            return error_response("UPLOAD_VALIDATION_ERROR", "유효성 검사 실패", 400, ser.errors)
+
+        try:
+            obj = upload_sessions.complete_session(session, ser.validated_data["sha256"])
+        except upload_sessions.SessionNotFound:
+            return self.session_not_found()
+        except upload_sessions.UploadIncomplete:
+            return error_response(
+                "UPLOAD_INCOMPLETE",
+                "아직 받지 못한 조각이 있습니다.",
+                status.HTTP_409_CONFLICT,
+                detail={"offset": session.received, "size": session.size},
+            )
+        except upload_sessions.ChecksumMismatch:
+            return error_response(
+                "UPLOAD_CHECKSUM_MISMATCH",
+                "파일 체크섬이 일치하지 않습니다. 처음부터 다시 업로드하세요.",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
         serializer = UploadedFileSerializer(obj, context={"request": request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -12,13 +12,14 @@ django.setup()
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from schedule.ws_auth import JWTAuthMiddleware
-from schedule.routing import websocket_urlpatterns
+from schedule.routing import websocket_urlpatterns as schedule_ws_urlpatterns
+from calender.routing import websocket_urlpatterns as calendar_ws_urlpatterns
 
 django_asgi_app = get_asgi_application()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
     "websocket": JWTAuthMiddleware(
-        URLRouter(websocket_urlpatterns)
+        URLRouter(schedule_ws_urlpatterns + calendar_ws_urlpatterns)
     ),
 })
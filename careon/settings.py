@@ -101,6 +101,23 @@ CHANNEL_LAYERS = {
     }
 }
 
+# 캐시 (로컬=LocMem, 배포=Redis). 채널 레이어와 DB 번호를 분리한다.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+if CACHE_BACKEND == "django.core.cache.backends.redis.RedisCache":
+    CACHES = {
+        "default": {
+            "BACKEND": CACHE_BACKEND,
+            "LOCATION": os.getenv("CACHE_LOCATION", f"redis://{REDIS_HOST}:{REDIS_PORT}/1"),
+            "KEY_PREFIX": "careon",
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": CACHE_BACKEND}}
+
+# 방 삭제 등 무거운 작업을 웹 프로세스의 백그라운드 스레드에서 바로 실행할지 여부
+# (False면 관리 명령 워커만 처리)
+BACKGROUND_THREADS = os.getenv("BACKGROUND_THREADS", "True") == "True"
+
 
 
 # Database
@@ -175,6 +192,10 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# 업로드 파일은 권한 확인 후 nginx internal 위치로 넘긴다 (X-Accel-Redirect). 비우면 Django가 직접 전송(개발용)
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "" if DEBUG else "/protected-media/")
+# 분할 업로드 중인 임시 파일 위치 (미디어로 공개되지 않는 곳)
+UPLOAD_SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", str(BASE_DIR / "upload_sessions"))
 
 
 
@@ -205,6 +226,11 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    # nginx 한 단계 뒤에 있으므로 X-Forwarded-For의 마지막 프록시 앞 주소를 클라이언트 IP로 사용
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "1")),
+    "DEFAULT_THROTTLE_RATES": {
+        "invite_join": os.getenv("INVITE_JOIN_RATE", "10/min"),
+    },
 }
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
@@ -0,0 +1,253 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from django.db.models.functions import ExtractHour, TruncWeek
+from django.utils import timezone
+from .downsample import lttb, lttb_multi
+from .models import CareLog, CareLogDailyRollup, LogMetric
+from .values import CHARTABLE_TYPES, LABELS_BP, LABELS_TEMP, normalize_label
+
+TZ = ZoneInfo("Asia/Seoul")
+
+DEFAULT_DAYS = 7
+MAX_RANGE_DAYS = 366
+BUCKETS = ("hour", "day", "week")
+# 묶지 않은(원본 점) 요청에서 시리즈당 최대 점 수. 넘으면 LTTB로 줄인다.
+DEFAULT_MAX_POINTS = 1000
+MAX_POINTS_LIMIT = 5000
+MIN_POINTS = 3
+
+
+def _combine_dt(d, t):
+    return datetime.combine(d, t, tzinfo=TZ)
+
+
+def _round(v):
+    return round(v, 2) if v is not None else None
+
+
+def _stats(row, prefix, cast=float):
+    return {"avg": _round(row[f"{prefix}_avg"]), "min": cast(row[f"{prefix}_min"]), "max": cast(row[f"{prefix}_max"])}
+
+
+def _aggregates(**fields):
+    """{prefix: 컬럼} → 로그에 대한 AVG/MIN/MAX/COUNT 집계식"""
+    result = {}
+    for prefix, column in fields.items():
+        result[f"{prefix}_avg"] = Avg(column)
+        result[f"{prefix}_min"] = Min(column)
+        result[f"{prefix}_max"] = Max(column)
+        result[f"{prefix}_count"] = Count(column)
+    return result
+
+
+def _rollup_aggregates(**fields):
+    """{prefix: 컬럼} → 일별 집계 행들을 다시 합치는 집계식 (평균은 합계/개수로 _with_avg에서)"""
+    result = {}
+    for prefix, column in fields.items():
+        result[f"{prefix}_sum"] = Sum(f"{column}_sum")
+        result[f"{prefix}_min"] = Min(f"{column}_min")
+        result[f"{prefix}_max"] = Max(f"{column}_max")
+        result[f"{prefix}_count"] = Sum("count")
+    return result
+
+
+def _with_avg(row, *prefixes):
+    for prefix in prefixes:
+        count, total = row[f"{prefix}_count"], row[f"{prefix}_sum"]
+        row[f"{prefix}_avg"] = total / count if count and total is not None else None
+    return row
+
+
+def parse_chart_params(params) -> dict:
+    """
+    쿼리 파라미터(from, to, bucket, max_points) → build_room_charts 인자. 잘못된 값이면 ValueError(메시지).
+    기본: 오늘까지 최근 7일, 원본 점.
+    """
+    try:
+        end_date = date.fromisoformat(params["to"]) if params.get("to") else timezone.now().date()
+        start_date = (date.fromisoformat(params["from"]) if params.get("from")
+                      else end_date - timedelta(days=DEFAULT_DAYS - 1))
+    except ValueError:
+        raise ValueError("from/to 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+    if start_date > end_date:
+        raise ValueError("from은 to보다 늦을 수 없습니다.")
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"조회 기간은 최대 {MAX_RANGE_DAYS}일입니다.")
+
+    bucket = params.get("bucket") or None
+    if bucket is not None and bucket not in BUCKETS:
+        raise ValueError(f"bucket은 {', '.join(BUCKETS)} 중 하나여야 합니다.")
+
+    try:
+        max_points = int(params.get("max_points") or DEFAULT_MAX_POINTS)
+    except ValueError:
+        raise ValueError("max_points는 숫자여야 합니다.")
+    if not MIN_POINTS <= max_points <= MAX_POINTS_LIMIT:
+        raise ValueError(f"max_points는 {MIN_POINTS}~{MAX_POINTS_LIMIT} 사이여야 합니다.")
+
+    return {"start_date": start_date, "end_date": end_date, "bucket": bucket, "max_points": max_points}
+
+
+class _Series:
+    """항목 하나의 차트 데이터. PAIR는 value2(두 번째 값)까지."""
+
+    def __init__(self, metric):
+        self.metric = metric
+        self.pair = metric.value_type == LogMetric.ValueType.PAIR
+        self.cast = int if metric.value_type == LogMetric.ValueType.SCALE else float
+        self.agg = None
+        self.points = []
+        self.downsampled = False
+
+    def summary(self, row, t=None) -> dict:
+        """집계 행(v_*, v2_*) → {"count", "avg", "min", "max"(, "value2")}"""
+        result = {"t": t} if t else {}
+        result.update(count=row["v_count"], **_stats(row, "v", self.cast))
+        if self.pair:
+            result["value2"] = _stats(row, "v2", self.cast) if row["v2_min"] is not None else None
+        return result
+
+    def as_dict(self) -> dict:
+        return {
+            "metric_id": self.metric.id,
+            "label": self.metric.label,
+            "value_type": self.metric.value_type,
+            "unit": self.metric.unit,
+            "agg": self.agg,
+            "points": self.points,
+            "downsampled": self.downsampled,
+        }
+
+
+def _fill_rollup_buckets(series, rollups, bucket):
+    """day/week: 일별 집계 행으로 (기간이 길어도 하루 한 행)"""
+    day = TruncWeek("date") if bucket == "week" else F("date")
+    rows = (rollups.annotate(day=day)
+            .values("metric_id", "day")
+            .annotate(**_rollup_aggregates(v="value", v2="value2"))
+            .order_by("metric_id", "day"))
+    for row in rows:
+        s = series[row["metric_id"]]
+        s.points.append(s.summary(_with_avg(row, "v", "v2"), _combine_dt(row["day"], time()).isoformat()))
+
+
+def _fill_hour_buckets(series, qs):
+    """hour: 로그를 (항목, 날짜, 시) 단위로 SQL에서 묶는다"""
+    rows = (qs.values("metric_id", "date_only", hour=ExtractHour("time_only"))
+            .annotate(**_aggregates(v="value", v2="value2"))
+            .order_by("metric_id", "date_only", "hour"))
+    for row in rows:
+        s = series[row["metric_id"]]
+        s.points.append(s.summary(row, _combine_dt(row["date_only"], time(row["hour"])).isoformat()))
+
+
+def _fill_raw_points(series, qs, max_points):
+    rows = defaultdict(list)
+    for metric_id, date_only, time_only, value, value2 in (
+        qs.order_by("date_only", "time_only", "id")
+        .values_list("metric_id", "date_only", "time_only", "value", "value2")
+    ):
+        rows[metric_id].append((_combine_dt(date_only, time_only), value, value2))
+
+    timestamp = lambda r: r[0].timestamp()
+    for metric_id, points in rows.items():
+        s = series[metric_id]
+        if s.pair:
+            points = [p for p in points if p[2] is not None]
+            sampled = lttb_multi(points, max_points, timestamp, lambda r: r[1], lambda r: r[2])
+            s.points = [{"t": dt.isoformat(), "value": v, "value2": v2} for dt, v, v2 in sampled]
+        else:
+            sampled = lttb(points, max_points, timestamp, lambda r: r[1])
+            s.points = [{"t": dt.isoformat(), "value": s.cast(v)} for dt, v, _ in sampled]
+        s.downsampled = len(sampled) < len(points)
+
+
+def _legacy_temperature(s):
+    """예전 응답 형식의 temperature (체온 항목 시리즈 그대로, 기간 통계의 count만 빠짐)"""
+    if s is None:
+        return {"unit": "°C", "agg": None, "points": [], "downsampled": False}
+    agg = s.agg and {key: s.agg[key] for key in ("avg", "min", "max")}
+    return {"unit": "°C", "agg": agg, "points": s.points, "downsampled": s.downsampled}
+
+
+def _legacy_blood_pressure(s):
+    """예전 응답 형식의 blood_pressure (value → systolic, value2 → diastolic, 최소/최대는 정수)"""
+    if s is None:
+        return {"unit": "mmHg", "agg": None, "points": [], "downsampled": False}
+
+    def whole(stats):
+        return {"avg": stats["avg"], "min": int(stats["min"]), "max": int(stats["max"])}
+
+    agg = None
+    if s.agg and s.agg["value2"]:
+        sys_s, dia_s = whole(s.agg), whole(s.agg["value2"])
+        agg = {key: {"systolic": sys_s[key], "diastolic": dia_s[key]} for key in ("avg", "min", "max")}
+
+    points = []
+    for p in s.points:
+        if "count" not in p:
+            points.append({"t": p["t"], "systolic": int(p["value"]), "diastolic": int(p["value2"])})
+        elif p["value2"]:
+            points.append({"t": p["t"], "count": p["count"], "systolic": whole(p), "diastolic": whole(p["value2"])})
+    return {"unit": "mmHg", "agg": agg, "points": points, "downsampled": s.downsampled}
+
+
+def build_room_charts(room_id: int, start_date=None, end_date=None, bucket=None,
+                      max_points: int = DEFAULT_MAX_POINTS) -> dict:
+    """
+    숫자형 항목(NUMERIC/PAIR/SCALE) 전체의 차트 데이터 (RoomChartsView, 대시보드 공용). 기본은 오늘까지 최근 7일.
+    bucket(hour/day/week)을 주면 구간별 count/avg/min/max를 SQL로 묶어서 (day/week와 기간 통계는 일별 집계 테이블에서),
+    없으면 원본 점을 시리즈당 max_points개까지 (넘으면 LTTB로 모양을 유지하며 줄여서) 돌려준다.
+    항목이 몇 개든 같은 쿼리 몇 개로 함께 계산한다.
+    temperature/blood_pressure는 예전 클라이언트용: 체온/혈압 항목의 시리즈를 예전 형식으로 옮긴 것.
+    """
+    end_date = end_date or timezone.now().date()
+    start_date = start_date or end_date - timedelta(days=DEFAULT_DAYS - 1)
+
+    metrics = (LogMetric.objects
+               .filter(room_id=room_id, value_type__in=CHARTABLE_TYPES)
+               .order_by("sort_order", "id"))
+    series = {metric.id: _Series(metric) for metric in metrics}
+
+    # 저장 시 해석해 둔 숫자 컬럼만 읽는다 (해석할 수 없던 로그는 value가 비어 있어 빠진다)
+    qs = CareLog.objects.filter(
+        room_id=room_id,
+        metric_id__in=list(series),
+        date_only__range=[start_date, end_date],
+        value__isnull=False,
+    )
+    # 기간 통계와 일/주 단위 묶음은 일별 집계에서 (로그 수와 무관하게 기간 일수만큼의 행)
+    rollups = CareLogDailyRollup.objects.filter(
+        room_id=room_id,
+        metric_id__in=list(series),
+        date__range=[start_date, end_date],
+    )
+    for row in rollups.values("metric_id").annotate(**_rollup_aggregates(v="value", v2="value2")).order_by():
+        if row["v_count"]:
+            s = series[row["metric_id"]]
+            s.agg = s.summary(_with_avg(row, "v", "v2"))
+
+    if bucket in ("day", "week"):
+        _fill_rollup_buckets(series, rollups, bucket)
+    elif bucket == "hour":
+        _fill_hour_buckets(series, qs)
+    else:
+        _fill_raw_points(series, qs, max_points)
+
+    def first(labels, value_type):
+        return next((s for s in series.values()
+                     if normalize_label(s.metric.label) in labels and s.metric.value_type == value_type), None)
+
+    return {
+        "range": {
+            "from": start_date.strftime("%Y-%m-%d"),
+            "to": end_date.strftime("%Y-%m-%d"),
+            "timezone": "Asia/Seoul",
+            "bucket": bucket,
+        },
+        "metrics": [s.as_dict() for s in series.values()],
+        "temperature": _legacy_temperature(first(LABELS_TEMP, LogMetric.ValueType.NUMERIC)),
+        "blood_pressure": _legacy_blood_pressure(first(LABELS_BP, LogMetric.ValueType.PAIR)),
+    }
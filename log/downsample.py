@@ -0,0 +1,64 @@
+# log/downsample.py
+"""
+차트 원본 점 줄이기: LTTB(Largest-Triangle-Three-Buckets).
+점들을 threshold-2개 구간으로 나누고, 구간마다 (이전에 고른 점, 다음 구간 평균)과 만드는 삼각형이 가장 큰 점을 고른다.
+단순 간격 추출과 달리 튀는 값(발열, 혈압 급상승)이 남는다. 첫 점과 마지막 점은 항상 포함.
+"""
+
+
+def lttb_indices(xs, ys, threshold: int) -> list:
+    """xs(오름차순), ys에서 남길 점의 인덱스 (최대 threshold개, 오름차순)"""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            # 삼각형 넓이의 2배 (비교만 하므로 1/2 생략)
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def lttb(points, threshold: int, x, y) -> list:
+    """points(시간순)를 최대 threshold개로. x(point), y(point)는 숫자를 돌려주는 함수"""
+    if len(points) <= threshold:
+        return list(points)
+    xs = [x(p) for p in points]
+    return [points[i] for i in lttb_indices(xs, [y(p) for p in points], threshold)]
+
+
+def lttb_multi(points, threshold: int, x, *ys) -> list:
+    """
+    값이 여러 개인 점(혈압 수축기/이완기): 첫/마지막 점을 뺀 threshold-2개를 값마다 나눠 고른 인덱스를 합친다.
+    한 값만 기준으로 고르면 다른 값의 튀는 점이 빠진다. 양 끝점은 모든 값이 공유하므로 합쳐도 threshold개를 넘지 않는다.
+    """
+    if len(points) <= threshold or threshold < 3:
+        return list(points)
+    xs = [x(p) for p in points]
+    # 가운데 점 몫이 값 개수보다 적으면 앞쪽 값부터 하나씩 (몫이 0인 값은 건너뜀)
+    share, extra = divmod(threshold - 2, len(ys))
+    indices = set()
+    for i, y in enumerate(ys):
+        middle = share + (1 if i < extra else 0)
+        if middle:
+            indices.update(lttb_indices(xs, [y(p) for p in points], middle + 2))
+    return [points[i] for i in sorted(indices)]
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from log.models import LogMetric
+from log.values import CHARTABLE_TYPES, REPARSE_BATCH, reparse_logs
+
+
+class Command(BaseCommand):
+    help = "기존 돌봄 로그의 내용을 항목 값 형식으로 해석해 차트용 숫자 컬럼(value, value2)을 채웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REPARSE_BATCH)
+        parser.add_argument("--all", action="store_true", help="이미 채워진 로그도 다시 계산 (TEXT 항목의 남은 값도 비운다)")
+
+    def handle(self, *args, **opts):
+        metrics = LogMetric.objects.all()
+        if not opts["all"]:
+            metrics = metrics.filter(value_type__in=CHARTABLE_TYPES)
+        scanned, updated = reparse_logs(metrics, opts["batch_size"], only_missing=not opts["all"])
+        self.stdout.write(self.style.SUCCESS(f"로그 {scanned}건 확인, {updated}건 갱신"))
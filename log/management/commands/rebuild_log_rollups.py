@@ -0,0 +1,20 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from log.rollups import REBUILD_BATCH, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "돌봄 로그에서 일별 집계(CareLogDailyRollup)를 다시 만듭니다. (시그널 없이 바뀐 로그, 정합성 복구)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--room", type=int, help="이 방만 다시 계산")
+        parser.add_argument("--since", help="이 날짜(YYYY-MM-DD)부터만 다시 계산")
+        parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH)
+
+    def handle(self, *args, **opts):
+        try:
+            since = date.fromisoformat(opts["since"]) if opts["since"] else None
+        except ValueError:
+            raise CommandError("--since는 YYYY-MM-DD 형식이어야 합니다.")
+        created = rebuild_rollups(room_id=opts["room"], since=since, batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"일별 집계 {created}건 생성"))
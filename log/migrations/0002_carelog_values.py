@@ -0,0 +1,89 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:42
+
+import math
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+# 이 시점에 차트를 그리던 항목과 값 형식 (0004에서 같은 라벨에 NUMERIC / PAIR(10~999)를 지정한다)
+LABELS_TEMP = {"체온", "temperature"}
+LABELS_BP = {"혈압", "blood_pressure"}
+_NUMBER = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)"
+NUMBER_RE = re.compile(rf"^\s*({_NUMBER})\s*$")
+PAIR_RE = re.compile(rf"^\s*({_NUMBER})\s*/\s*({_NUMBER})\s*$")
+
+
+def _number(raw, low=None, high=None):
+    value = float(raw)
+    if not math.isfinite(value) or (low is not None and value < low) or (high is not None and value > high):
+        return None
+    return value
+
+
+def _parse(kind, content):
+    if kind == "temp":
+        match = NUMBER_RE.match(content or "")
+        return (_number(match.group(1)), None) if match else (None, None)
+    match = PAIR_RE.match(content or "")
+    if not match:
+        return None, None
+    values = _number(match.group(1), 10, 999), _number(match.group(2), 10, 999)
+    return values if None not in values else (None, None)
+
+
+def fill_values(apps, schema_editor):
+    # 기존 로그의 숫자 컬럼을 채운다 (차트가 이 컬럼만 읽으므로 배포 직후에도 비지 않게, 0003의 일별 집계도 이 값으로 만든다)
+    LogMetric = apps.get_model("log", "LogMetric")
+    CareLog = apps.get_model("log", "CareLog")
+    kinds = {}
+    for metric_id, label in LogMetric.objects.values_list("id", "label"):
+        label = (label or "").strip().lower()
+        if label in LABELS_TEMP:
+            kinds[metric_id] = "temp"
+        elif label in LABELS_BP:
+            kinds[metric_id] = "bp"
+    if not kinds:
+        return
+
+    qs = CareLog.objects.filter(metric_id__in=kinds).order_by("pk").only("id", "metric_id", "content")
+    last = 0
+    while True:
+        logs = list(qs.filter(pk__gt=last)[:BATCH_SIZE])
+        if not logs:
+            break
+        last = logs[-1].pk
+        changed = []
+        for log in logs:
+            log.value, log.value2 = _parse(kinds[log.metric_id], log.content)
+            if log.value is not None:
+                changed.append(log)
+        CareLog.objects.bulk_update(changed, ["value", "value2"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('log', '0001_initial'),
+        ('room', '0003_room_deleting_at_roomdeletionjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carelog',
+            name='value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='carelog',
+            name='value2',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='carelog',
+            index=models.Index(fields=['room', 'metric', 'date_only', 'value', 'value2'], name='log_carelog_room_id_3ba595_idx'),
+        ),
+        migrations.RunPython(fill_values, migrations.RunPython.noop),
+    ]
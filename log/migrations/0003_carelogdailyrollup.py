@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Min, Sum
+
+
+def build_rollups(apps, schema_editor):
+    # 0002에서 값을 채운 로그로 일별 집계를 만든다
+    CareLog = apps.get_model("log", "CareLog")
+    CareLogDailyRollup = apps.get_model("log", "CareLogDailyRollup")
+    rows = (CareLog.objects
+            .filter(value__isnull=False)
+            .values("room_id", "metric_id", "date_only")
+            .annotate(
+                count=Count("value"),
+                value_sum=Sum("value"),
+                value_min=Min("value"),
+                value_max=Max("value"),
+                value_sq_sum=Sum(F("value") * F("value")),
+                value2_sum=Sum("value2"),
+                value2_min=Min("value2"),
+                value2_max=Max("value2"),
+                value2_sq_sum=Sum(F("value2") * F("value2")),
+            )
+            .order_by())
+    CareLogDailyRollup.objects.bulk_create(
+        (CareLogDailyRollup(date=row.pop("date_only"), **row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('log', '0002_carelog_values'),
+        ('room', '0003_room_deleting_at_roomdeletionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CareLogDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('value_sum', models.FloatField(default=0)),
+                ('value_min', models.FloatField(blank=True, null=True)),
+                ('value_max', models.FloatField(blank=True, null=True)),
+                ('value_sq_sum', models.FloatField(default=0)),
+                ('value2_sum', models.FloatField(blank=True, null=True)),
+                ('value2_min', models.FloatField(blank=True, null=True)),
+                ('value2_max', models.FloatField(blank=True, null=True)),
+                ('value2_sq_sum', models.FloatField(blank=True, null=True)),
+                ('metric', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='log.logmetric')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='care_log_rollups', to='room.room')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('room', 'metric', 'date'), name='uq_carelog_rollup_room_metric_date')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
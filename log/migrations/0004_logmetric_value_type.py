@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-20 01:51
+
+from django.db import migrations, models
+
+
+def set_default_types(apps, schema_editor):
+    # 지금까지 차트/검증이 라벨로 정해지던 항목에 같은 형식을 지정한다 (나머지는 자유 입력)
+    LogMetric = apps.get_model("log", "LogMetric")
+    for metric in LogMetric.objects.all().only("id", "label"):
+        label = (metric.label or "").strip().lower()
+        if label in ("체온", "temperature"):
+            LogMetric.objects.filter(pk=metric.pk).update(value_type="NUMERIC", unit="°C")
+        elif label in ("혈압", "blood_pressure"):
+            LogMetric.objects.filter(pk=metric.pk).update(value_type="PAIR", unit="mmHg", min_value=10, max_value=999)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('log', '0003_carelogdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logmetric',
+            name='max_value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='logmetric',
+            name='min_value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='logmetric',
+            name='unit',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='logmetric',
+            name='value_type',
+            field=models.CharField(choices=[('NUMERIC', 'Numeric'), ('PAIR', 'Pair'), ('SCALE', 'Scale'), ('TEXT', 'Text')], default='TEXT', max_length=10),
+        ),
+        migrations.RunPython(set_default_types, migrations.RunPython.noop),
+    ]
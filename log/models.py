@@ -1,11 +1,19 @@
 from django.db import models
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
 from django.utils import timezone
+from utils.cache import bump_room_version
 
 
 class LogMetric(models.Model):
-    
+    class ValueType(models.TextChoices):
+        NUMERIC = "NUMERIC", "Numeric"   # 숫자 하나 (체온, 혈당, 소변량)
+        PAIR = "PAIR", "Pair"            # "a/b" 두 숫자 (혈압)
+        SCALE = "SCALE", "Scale"         # 정수 단계 (식사량 0~10)
+        TEXT = "TEXT", "Text"            # 자유 입력 (차트 없음)
+
     room = models.ForeignKey(
         to='room.Room',                 
         on_delete=models.CASCADE,
@@ -14,6 +22,12 @@ class LogMetric(models.Model):
     )
     label = models.CharField(max_length=100)  
     sort_order = models.IntegerField(default=0)
+    # 값 형식: 입력 검증과 차트용 숫자 컬럼(CareLog.value/value2) 해석 방법 (log/values.py)
+    value_type = models.CharField(max_length=10, choices=ValueType.choices, default=ValueType.TEXT)
+    unit = models.CharField(max_length=20, blank=True, default="")
+    # 허용 범위 (NUMERIC/PAIR는 선택, SCALE은 단계의 양 끝)
+    min_value = models.FloatField(null=True, blank=True)
+    max_value = models.FloatField(null=True, blank=True)
 
     class Meta:
         indexes = [
@@ -49,6 +63,9 @@ class CareLog(models.Model):
     )
 
     content = models.TextField()           
+    # 항목 값 형식(value_type)으로 content를 해석한 숫자 (PAIR면 value2까지). 차트 집계는 이 컬럼으로 SQL에서 한다.
+    value = models.FloatField(null=True, blank=True)
+    value2 = models.FloatField(null=True, blank=True)
     memo = models.TextField(blank=True, null=True)
 
     time_only = models.TimeField()         
@@ -62,7 +79,69 @@ class CareLog(models.Model):
             models.Index(fields=['metric']),
             models.Index(fields=['author']),
             models.Index(fields=['room', 'metric', 'date_only', 'time_only']),
+            # 기간 집계(AVG/MIN/MAX)를 테이블 행을 읽지 않고 인덱스만으로
+            models.Index(fields=['room', 'metric', 'date_only', 'value', 'value2']),
         ]
 
     def __str__(self) -> str:
         return f"[Room#{self.room_id} Metric#{self.metric_id}] {self.date_only} {self.time_only} - {self.content[:30]}"
+
+
+class CareLogDailyRollup(models.Model):
+    """
+    (방, 항목, 날짜)별 숫자 값 집계. 긴 기간 차트/통계는 로그 대신 이 행들(하루 한 행)을 읽는다.
+    로그가 바뀌면 커밋 이후 해당 날짜만 다시 계산하고(log/rollups.py), rebuild_log_rollups로 전체를 다시 맞출 수 있다.
+    """
+    room = models.ForeignKey(
+        to='room.Room',
+        on_delete=models.CASCADE,
+        related_name='care_log_rollups',
+    )
+    metric = models.ForeignKey(
+        to=LogMetric,
+        on_delete=models.CASCADE,
+        related_name='daily_rollups',
+    )
+    date = models.DateField()
+    # value가 있는 로그 수
+    count = models.PositiveIntegerField(default=0)
+    value_sum = models.FloatField(default=0)
+    value_min = models.FloatField(null=True, blank=True)
+    value_max = models.FloatField(null=True, blank=True)
+    value_sq_sum = models.FloatField(default=0)
+    # 혈압 이완기 등 두 번째 값
+    value2_sum = models.FloatField(null=True, blank=True)
+    value2_min = models.FloatField(null=True, blank=True)
+    value2_max = models.FloatField(null=True, blank=True)
+    value2_sq_sum = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'metric', 'date'], name='uq_carelog_rollup_room_metric_date')
+        ]
+
+    def __str__(self) -> str:
+        return f"[Room#{self.room_id} Metric#{self.metric_id}] {self.date} ({self.count})"
+
+
+@receiver(post_init, sender=CareLog)
+def remember_rollup_key(sender, instance, **kwargs):
+    # 날짜/항목이 바뀌는 수정이면 이전 날짜의 집계도 다시 계산해야 한다
+    # (only()로 빠진 필드를 건드리면 행마다 조회가 생기므로 __dict__에서 읽는다)
+    fields = instance.__dict__
+    instance._rollup_key = (fields.get("room_id"), fields.get("metric_id"), fields.get("date_only"))
+
+
+@receiver([post_save, post_delete], sender=CareLog)
+def refresh_care_log_rollup(sender, instance, **kwargs):
+    from .rollups import schedule_refresh
+
+    key = (instance.room_id, instance.metric_id, instance.date_only)
+    schedule_refresh({key, getattr(instance, "_rollup_key", key)})
+    instance._rollup_key = key
+
+
+@receiver([post_save, post_delete], sender=LogMetric)
+@receiver([post_save, post_delete], sender=CareLog)
+def bump_log_cache(sender, instance, **kwargs):
+    bump_room_version(instance.room_id, "logs", "charts")
@@ -0,0 +1,82 @@
+# log/rollups.py
+"""
+CareLogDailyRollup 유지.
+- 로그 저장/수정/삭제: 커밋 이후 바뀐 (방, 항목, 날짜)만 그날 로그에서 다시 집계해 덮어쓴다.
+  최소/최대는 삭제를 증분으로 되돌릴 수 없어서 더하고 빼는 대신 다시 읽는다
+  ((room, metric, date_only, value, value2) 인덱스 범위라 하루치 몇십 행).
+- bulk_create/bulk_update처럼 시그널이 없는 경로와 정합성 복구: rebuild_rollups (rebuild_log_rollups 명령)
+"""
+import itertools
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+
+from utils.cache import bump_room_version
+from .models import CareLog, CareLogDailyRollup
+
+REBUILD_BATCH = 1000
+
+
+def _aggregates() -> dict:
+    return {
+        "count": Count("value"),
+        "value_sum": Sum("value"),
+        "value_min": Min("value"),
+        "value_max": Max("value"),
+        "value_sq_sum": Sum(F("value") * F("value")),
+        "value2_sum": Sum("value2"),
+        "value2_min": Min("value2"),
+        "value2_max": Max("value2"),
+        "value2_sq_sum": Sum(F("value2") * F("value2")),
+    }
+
+
+def refresh_rollups(keys) -> None:
+    """keys: {(room_id, metric_id, date)}"""
+    rooms = set()
+    for room_id, metric_id, day in keys:
+        row = (CareLog.objects
+               .filter(room_id=room_id, metric_id=metric_id, date_only=day, value__isnull=False)
+               .aggregate(**_aggregates()))
+        lookup = {"room_id": room_id, "metric_id": metric_id, "date": day}
+        if row["count"]:
+            CareLogDailyRollup.objects.update_or_create(**lookup, defaults=row)
+        else:
+            CareLogDailyRollup.objects.filter(**lookup).delete()
+        rooms.add(room_id)
+    # 로그 저장 시점의 버전 갱신 이후 읽힌 차트가 이전 집계로 캐시되었을 수 있다
+    for room_id in rooms:
+        bump_room_version(room_id, "charts")
+
+
+def schedule_refresh(keys) -> None:
+    keys = {key for key in keys if None not in key}
+    if keys:
+        transaction.on_commit(lambda: refresh_rollups(keys))
+
+
+def rebuild_rollups(room_id=None, since=None, batch_size: int = REBUILD_BATCH) -> int:
+    """로그에서 집계를 다시 만든다 (room_id/since(날짜)로 범위 제한 가능). 만든 행 수를 반환."""
+    logs = CareLog.objects.filter(value__isnull=False)
+    rollups = CareLogDailyRollup.objects.all()
+    if room_id is not None:
+        logs, rollups = logs.filter(room_id=room_id), rollups.filter(room_id=room_id)
+    if since is not None:
+        logs, rollups = logs.filter(date_only__gte=since), rollups.filter(date__gte=since)
+
+    rows = (logs.values("room_id", "metric_id", "date_only")
+            .annotate(**_aggregates())
+            .order_by()
+            .iterator(chunk_size=batch_size))
+    created, rooms = 0, set(rollups.values_list("room_id", flat=True).distinct())
+    with transaction.atomic():
+        rollups.delete()
+        while batch := list(itertools.islice(rows, batch_size)):
+            CareLogDailyRollup.objects.bulk_create([
+                CareLogDailyRollup(date=row.pop("date_only"), **row) for row in batch
+            ])
+            created += len(batch)
+            rooms.update(row["room_id"] for row in batch)
+
+    for rid in rooms:
+        bump_room_version(rid, "charts")
+    return created
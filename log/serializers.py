@@ -3,14 +3,34 @@ from rest_framework import serializers
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from .models import LogMetric, CareLog
+from .values import default_value_config, parser_for
 
 
 class LogMetricSerializer(serializers.ModelSerializer):
     class Meta:
         model = LogMetric
-        fields = ["id", "room", "label", "sort_order"]
+        fields = ["id", "room", "label", "sort_order", "value_type", "unit", "min_value", "max_value"]
         read_only_fields = ["id", "room"]
 
+    def validate(self, attrs):
+        instance = self.instance
+        if instance is None and "value_type" not in attrs:
+            # 형식을 고르지 않았으면 라벨로 짐작 (체온/혈압 외에는 자유 입력)
+            for field, value in default_value_config(attrs.get("label")).items():
+                attrs.setdefault(field, value)
+
+        def current(field):
+            return attrs[field] if field in attrs else getattr(instance, field, None)
+
+        min_value, max_value = current("min_value"), current("max_value")
+        if min_value is not None and max_value is not None and min_value > max_value:
+            raise serializers.ValidationError("min_value는 max_value보다 클 수 없습니다.")
+        if current("value_type") == LogMetric.ValueType.SCALE and any(
+            v is not None and not float(v).is_integer() for v in (min_value, max_value)
+        ):
+            raise serializers.ValidationError("단계(SCALE) 범위는 정수여야 합니다.")
+        return attrs
+
 
 class CareLogSerializer(serializers.ModelSerializer):
     metric_label = serializers.CharField(source="metric.label", read_only=True)
@@ -25,12 +45,14 @@ class CareLogSerializer(serializers.ModelSerializer):
             "metric_label",
             "author",
             "content",
+            "value",
+            "value2",
             "memo",
             "time_only",
             "date_only",
             "created_at",
         ]
-        read_only_fields = ["id", "room", "author", "created_at"]
+        read_only_fields = ["id", "room", "author", "value", "value2", "created_at"]
 
     def validate_date_only(self, value):
         if isinstance(value, datetime):
@@ -57,18 +79,13 @@ class CareLogSerializer(serializers.ModelSerializer):
         if metric.room_id != room_id:
             raise serializers.ValidationError("해당 방의 항목(metric)이 아닙니다.")
 
-        label = (metric.label or "").strip().lower()
         val = (attrs.get("content") or (self.instance.content if getattr(self, "instance", None) else "")).strip()
 
-        if label in ["체온", "temperature"]:
-            try:
-                float(val)
-            except ValueError:
-                raise serializers.ValidationError("체온은 숫자(float)여야 합니다. 예: 36.8")
-        elif label in ["혈압", "blood_pressure"]:
-            import re
-            if not re.match(r"^\s*\d{2,3}\s*/\s*\d{2,3}\s*$", val):
-                raise serializers.ValidationError("혈압은 '수축기/이완기' 형식이어야 합니다. 예: 120/80")
+        # 항목 값 형식으로 검증하면서 차트용 숫자 컬럼도 함께 채운다 (내용/항목이 바뀌지 않은 수정도 같은 결과)
+        try:
+            attrs["value"], attrs["value2"] = parser_for(metric).parse(val)
+        except ValueError as e:
+            raise serializers.ValidationError(f"{metric.label}: {e}")
 
         return attrs
 
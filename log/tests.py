@@ -1,3 +1,328 @@
-from django.test import TestCase
+import math
+from datetime import date, time, timedelta
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from room.models import Room
+from user.models import CustomUser as User
+from .charts import DEFAULT_DAYS, MAX_POINTS_LIMIT, MAX_RANGE_DAYS, build_room_charts, parse_chart_params
+from .downsample import lttb, lttb_indices, lttb_multi
+from .models import CareLog, CareLogDailyRollup, LogMetric
+from .rollups import rebuild_rollups
+from .values import parse_stored, parser_for
+
+
+class RoomLogTestMixin:
+    def setUp(self):
+        self.user = User.objects.create(email="owner@example.com", name="owner")
+        self.room = Room.objects.create(owner=self.user, patient="환자", invite_code="TESTCODE")
+        self.temp = LogMetric.objects.get(room=self.room, label="체온")
+        self.bp = LogMetric.objects.get(room=self.room, label="혈압")
+        self.day = date(2026, 10, 1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class CareLogValueTests(RoomLogTestMixin, TestCase):
+    def post_log(self, metric, content):
+        return self.client.post(
+            f"/rooms/{self.room.id}/logs/",
+            {"metric": metric.id, "content": content, "time_only": "08:00", "date_only": self.day.isoformat()},
+            format="json",
+        )
+
+    def test_create_and_update_store_parsed_values(self):
+        res = self.post_log(self.bp, " 120 / 80 ")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual((res.data["value"], res.data["value2"]), (120, 80))
+
+        log_id = res.data["id"]
+        res = self.client.patch(f"/logs/{log_id}/", {"content": "130/85"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(CareLog.objects.values_list("value", "value2").get(pk=log_id), (130, 85))
+
+        res = self.post_log(self.temp, "36.8")
+        self.assertEqual((res.data["value"], res.data["value2"]), (36.8, None))
+
+    def test_values_are_read_only(self):
+        res = self.client.post(
+            f"/rooms/{self.room.id}/logs/",
+            {"metric": self.temp.id, "content": "36.5", "value": 99, "time_only": "08:00"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["value"], 36.5)
+
+    def test_backfill_existing_logs(self):
+        def log(metric, content):
+            return CareLog.objects.create(
+                room=self.room, metric=metric, author=self.user, content=content,
+                time_only=time(8), date_only=self.day,
+            )
+
+        temp, bp, bad_bp, out_of_range = log(self.temp, "36.5"), log(self.bp, "120/80"), log(self.bp, "높음"), log(self.bp, "5/80")
+        CareLog.objects.update(value=None, value2=None)
+
+        migration = import_module("log.migrations.0002_carelog_values")
+        migration.fill_values(apps, None)
+
+        values = dict(CareLog.objects.values_list("id", "value"))
+        self.assertEqual(values[temp.id], 36.5)
+        self.assertEqual(CareLog.objects.get(pk=bp.id).value2, 80)
+        self.assertIsNone(values[bad_bp.id])
+        self.assertIsNone(values[out_of_range.id])
+
+
+class ParseChartParamsTests(SimpleTestCase):
+    def test_defaults(self):
+        params = parse_chart_params({})
+        today = timezone.now().date()
+        self.assertEqual(params["end_date"], today)
+        self.assertEqual(params["start_date"], today - timedelta(days=DEFAULT_DAYS - 1))
+        self.assertIsNone(params["bucket"])
+
+    def test_explicit_values(self):
+        params = parse_chart_params({"from": "2026-01-01", "to": "2026-03-31", "bucket": "week", "max_points": "50"})
+        self.assertEqual(params, {
+            "start_date": date(2026, 1, 1), "end_date": date(2026, 3, 31), "bucket": "week", "max_points": 50,
+        })
+
+    def test_invalid_values(self):
+        too_long = (date(2026, 1, 1) + timedelta(days=MAX_RANGE_DAYS)).isoformat()
+        for params in (
+            {"from": "2026-13-01"},
+            {"from": "2026-02-01", "to": "2026-01-01"},
+            {"from": "2026-01-01", "to": too_long},
+            {"bucket": "month"},
+            {"max_points": "many"},
+            {"max_points": "2"},
+            {"max_points": str(MAX_POINTS_LIMIT + 1)},
+        ):
+            with self.assertRaises(ValueError, msg=params):
+                parse_chart_params(params)
+
+
+class LttbTests(SimpleTestCase):
+    def test_small_input_is_returned_as_is(self):
+        self.assertEqual(lttb_indices([0, 1, 2], [5, 6, 7], 10), [0, 1, 2])
+        self.assertEqual(lttb_indices(list(range(10)), [0] * 10, 2), list(range(10)))
+
+    def test_keeps_endpoints_and_threshold(self):
+        xs = list(range(1000))
+        ys = [math.sin(x / 50) for x in xs]
+        indices = lttb_indices(xs, ys, 100)
+        self.assertEqual(len(indices), 100)
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+        self.assertEqual(indices, sorted(set(indices)))
+
+    def test_keeps_spike(self):
+        points = [(x, 36.5) for x in range(5000)]
+        points[3210] = (3210, 39.8)
+        sampled = lttb(points, 50, lambda p: p[0], lambda p: p[1])
+        self.assertIn((3210, 39.8), sampled)
+
+    def test_multi_keeps_spikes_of_each_value(self):
+        points = [(x, 120, 80) for x in range(3000)]
+        points[100] = (100, 190, 80)
+        points[2500] = (2500, 120, 40)
+        sampled = lttb_multi(points, 60, lambda p: p[0], lambda p: p[1], lambda p: p[2])
+        self.assertIn(points[100], sampled)
+        self.assertIn(points[2500], sampled)
+        self.assertLessEqual(len(sampled), 60)
+
+    def test_multi_never_exceeds_threshold(self):
+        points = [(x, 120 + (x % 7) * 5, 80 - (x % 5) * 3) for x in range(500)]
+        for threshold in (3, 4, 5, 10, 99):
+            sampled = lttb_multi(points, threshold, lambda p: p[0], lambda p: p[1], lambda p: p[2])
+            self.assertLessEqual(len(sampled), threshold, msg=threshold)
+            self.assertEqual((sampled[0], sampled[-1]), (points[0], points[-1]))
+
+
+class RoomChartsTests(RoomLogTestMixin, TestCase):
+    def log(self, metric, content, value, value2, d, t):
+        CareLog.objects.create(
+            room=self.room, metric=metric, author=self.user, content=content,
+            value=value, value2=value2, time_only=t, date_only=d,
+        )
+
+    def test_raw_points_are_downsampled(self):
+        CareLog.objects.bulk_create([
+            CareLog(
+                room=self.room, metric=self.temp, author=self.user, content="36.5", value=36.5,
+                time_only=time(i // 60 % 24, i % 60), date_only=self.day + timedelta(days=i // 1440),
+            )
+            for i in range(2000)
+        ])
+        charts = build_room_charts(self.room.id, self.day, self.day + timedelta(days=1), max_points=100)
+        temp = charts["temperature"]
+        self.assertTrue(temp["downsampled"])
+        self.assertEqual(len(temp["points"]), 100)
+
+        charts = build_room_charts(self.room.id, self.day, self.day + timedelta(days=1), bucket="hour")
+        hours = charts["metrics"][0]["points"]
+        self.assertEqual(len(hours), 2000 // 60 + 1)
+        self.assertEqual(hours[0]["count"], 60)
+
+    def test_endpoint_limits_pair_points(self):
+        for minute in range(10):
+            self.log(self.bp, "", 120 + minute, 80 - minute, self.day, time(8, minute))
+
+        res = self.client.get(
+            f"/rooms/{self.room.id}/charts/",
+            {"from": self.day.isoformat(), "to": self.day.isoformat(), "max_points": 3},
+        )
+        self.assertEqual(res.status_code, 200)
+        bp = res.data["blood_pressure"]
+        self.assertTrue(bp["downsampled"])
+        self.assertLessEqual(len(bp["points"]), 3)
+        self.assertEqual(bp["points"][0], {"t": "2026-10-01T08:00:00+09:00", "systolic": 120, "diastolic": 80})
+
+    def test_endpoint_rejects_invalid_params(self):
+        res = self.client.get(f"/rooms/{self.room.id}/charts/", {"bucket": "month"})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("detail", res.data)
+
+
+class CareLogRollupTests(RoomLogTestMixin, TestCase):
+    FIELDS = ("room_id", "metric_id", "date", "count", "value_sum", "value_min", "value_max",
+              "value_sq_sum", "value2_sum", "value2_min", "value2_max", "value2_sq_sum")
+
+    def rollups(self):
+        return sorted(CareLogDailyRollup.objects.values_list(*self.FIELDS))
+
+    def post_log(self, metric, content, d, t="08:00"):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                f"/rooms/{self.room.id}/logs/",
+                {"metric": metric.id, "content": content, "time_only": t, "date_only": d.isoformat()},
+                format="json",
+            )
+        self.assertEqual(res.status_code, 201)
+        return res.data["id"]
+
+    def test_rollups_follow_log_changes(self):
+        next_day = self.day + timedelta(days=1)
+        first = self.post_log(self.temp, "36.5", self.day)
+        self.post_log(self.temp, "38.5", self.day, "20:00")
+        self.post_log(self.bp, "120/80", self.day)
+        row = CareLogDailyRollup.objects.get(metric=self.temp, date=self.day)
+        self.assertEqual((row.count, row.value_sum, row.value_min, row.value_max), (2, 75.0, 36.5, 38.5))
+        self.assertEqual(CareLogDailyRollup.objects.get(metric=self.bp).value2_max, 80)
+
+        # 날짜를 옮기면 이전 날짜와 새 날짜가 모두 다시 계산된다
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(f"/logs/{first}/", {"date_only": next_day.isoformat()}, format="json")
+        self.assertEqual(res.status_code, 200)
+        row = CareLogDailyRollup.objects.get(metric=self.temp, date=self.day)
+        self.assertEqual((row.count, row.value_min), (1, 38.5))
+        self.assertEqual(CareLogDailyRollup.objects.get(metric=self.temp, date=next_day).count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/logs/{first}/")
+        self.assertFalse(CareLogDailyRollup.objects.filter(date=next_day).exists())
+
+        incremental = self.rollups()
+        self.assertEqual(rebuild_rollups(room_id=self.room.id), len(incremental))
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_rebuild_covers_logs_without_signals(self):
+        CareLog.objects.bulk_create([
+            CareLog(room=self.room, metric=self.temp, author=self.user, content=str(v), value=v,
+                    time_only=time(8), date_only=self.day + timedelta(days=i))
+            for i, v in enumerate((36.5, 37.0, 37.5))
+        ])
+        self.assertFalse(CareLogDailyRollup.objects.exists())
+
+        call_command("rebuild_log_rollups", "--room", str(self.room.id), "--since", (self.day + timedelta(days=1)).isoformat())
+        self.assertEqual([row[2] for row in self.rollups()], [self.day + timedelta(days=1), self.day + timedelta(days=2)])
+
+    def test_day_buckets_and_period_stats(self):
+        self.post_log(self.temp, "36.5", self.day)
+        self.post_log(self.temp, "37.5", self.day, "20:00")
+        self.post_log(self.temp, "38.0", self.day + timedelta(days=1))
+        self.post_log(self.bp, "120/80", self.day)
+        CareLog.objects.create(room=self.room, metric=self.temp, author=self.user, content="열 없음",
+                               time_only=time(9), date_only=self.day)
+
+        res = self.client.get(f"/rooms/{self.room.id}/charts/", {
+            "from": self.day.isoformat(), "to": (self.day + timedelta(days=1)).isoformat(), "bucket": "day",
+        })
+        self.assertEqual(res.status_code, 200)
+        temp = next(m for m in res.data["metrics"] if m["metric_id"] == self.temp.id)
+        self.assertEqual(temp["agg"], {"count": 3, "avg": 37.33, "min": 36.5, "max": 38.0})
+        self.assertEqual([(p["count"], p["avg"]) for p in temp["points"]], [(2, 37.0), (1, 38.0)])
+        self.assertEqual(res.data["temperature"]["agg"], {"avg": 37.33, "min": 36.5, "max": 38.0})
+        self.assertEqual(res.data["blood_pressure"]["agg"]["max"], {"systolic": 120, "diastolic": 80})
+
+
+class ValueParserTests(SimpleTestCase):
+    def metric(self, value_type, min_value=None, max_value=None):
+        return LogMetric(label="x", value_type=value_type, min_value=min_value, max_value=max_value)
+
+    def test_parsers(self):
+        self.assertEqual(parser_for(self.metric("NUMERIC")).parse(" 36.8 "), (36.8, None))
+        self.assertEqual(parser_for(self.metric("PAIR", 10, 999)).parse("120 / 80"), (120.0, 80.0))
+        self.assertEqual(parser_for(self.metric("SCALE")).parse("7"), (7.0, None))
+        self.assertEqual(parser_for(self.metric("TEXT")).parse("잘 먹음"), (None, None))
+
+    def test_invalid_content(self):
+        for metric, content in (
+            (self.metric("NUMERIC"), "abc"),
+            (self.metric("NUMERIC"), "9" * 400),
+            (self.metric("PAIR", 10, 999), "5/3"),
+            (self.metric("SCALE"), "11"),
+        ):
+            with self.assertRaises(ValueError, msg=content):
+                parser_for(metric).parse(content)
+            self.assertEqual(parse_stored(metric, content), (None, None))
+
+
+class MetricValueTypeTests(RoomLogTestMixin, TestCase):
+    def create_metric(self, **data):
+        return self.client.post(f"/rooms/{self.room.id}/metrics/", data, format="json")
+
+    def post_log(self, metric_id, content):
+        return self.client.post(
+            f"/rooms/{self.room.id}/logs/",
+            {"metric": metric_id, "content": content, "time_only": "08:00", "date_only": self.day.isoformat()},
+            format="json",
+        )
+
+    def test_metric_config(self):
+        res = self.create_metric(label="Temperature")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual((res.data["value_type"], res.data["unit"]), ("NUMERIC", "°C"))
+        self.assertEqual(self.create_metric(label="식사").data["value_type"], "TEXT")
+        self.assertEqual(self.create_metric(label="통증", value_type="SCALE", min_value=0.5).status_code, 400)
+        self.assertEqual(self.create_metric(label="맥박", value_type="NUMERIC", min_value=200, max_value=30).status_code, 400)
+
+    def test_scale_logs_are_validated_and_charted(self):
+        metric_id = self.create_metric(label="통증", value_type="SCALE", min_value=0, max_value=10).data["id"]
+        res = self.post_log(metric_id, "11")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("통증", str(res.data))
+        res = self.post_log(metric_id, "7")
+        self.assertEqual((res.status_code, res.data["value"]), (201, 7))
+
+        res = self.client.get(f"/rooms/{self.room.id}/charts/", {"from": self.day.isoformat(), "to": self.day.isoformat()})
+        pain = next(m for m in res.data["metrics"] if m["metric_id"] == metric_id)
+        self.assertEqual((pain["value_type"], pain["points"][0]["value"]), ("SCALE", 7))
+
+    def test_changing_value_type_reparses_logs(self):
+        metric_id = self.create_metric(label="맥박").data["id"]
+        log_ids = [self.post_log(metric_id, content).data["id"] for content in ("72", "빠름")]
+        self.assertFalse(CareLog.objects.filter(metric_id=metric_id, value__isnull=False).exists())
+
+        res = self.client.patch(f"/rooms/{self.room.id}/metrics/{metric_id}/", {"value_type": "NUMERIC"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        values = dict(CareLog.objects.filter(pk__in=log_ids).values_list("content", "value"))
+        self.assertEqual(values, {"72": 72, "빠름": None})
+        self.assertEqual(CareLogDailyRollup.objects.get(metric_id=metric_id).count, 1)
+
+        # 기존 로그와 달리 새 로그는 형식에 맞아야 저장된다
+        self.assertEqual(self.post_log(metric_id, "빠름").status_code, 400)
@@ -0,0 +1,176 @@
+# log/values.py
+"""
+항목(LogMetric) 값 형식 레지스트리: 입력 검증 + 차트/집계용 숫자 컬럼(CareLog.value, value2) 해석.
+- NUMERIC: 숫자 하나 (체온 36.8, 소변량 300) → value
+- PAIR: "a/b" (혈압 120/80) → value, value2
+- SCALE: 정수 단계 (식사량 0~10) → value
+- TEXT: 자유 입력, 차트 없음
+정규식은 모듈 로드 시 한 번만 컴파일하고, 파서는 (형식, 최소, 최대) 설정별로 한 번만 만들어 캐시한다.
+항목 설정이 바뀌면 키가 달라지므로 따로 비울 필요가 없다.
+"""
+import math
+import re
+from functools import lru_cache
+
+from .models import CareLog, LogMetric
+
+ValueType = LogMetric.ValueType
+
+LABELS_TEMP = {"체온", "temperature"}
+LABELS_BP = {"혈압", "blood_pressure"}
+
+# 방을 만들 때 생기는 기본 항목의 값 형식 (혈압 범위는 예전 검증 규칙 "2~3자리 숫자"와 같게)
+DEFAULT_METRICS = {
+    "체온": {"value_type": ValueType.NUMERIC, "unit": "°C"},
+    "혈압": {"value_type": ValueType.PAIR, "unit": "mmHg", "min_value": 10, "max_value": 999},
+}
+DEFAULT_SCALE = (0, 10)
+REPARSE_BATCH = 1000
+
+_NUMBER = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)"
+NUMBER_RE = re.compile(rf"^\s*({_NUMBER})\s*$")
+PAIR_RE = re.compile(rf"^\s*({_NUMBER})\s*/\s*({_NUMBER})\s*$")
+SCALE_RE = re.compile(r"^\s*([-+]?\d+)\s*$")
+
+
+def normalize_label(label) -> str:
+    return (label or "").strip().lower()
+
+
+def default_value_config(label) -> dict:
+    """라벨로 짐작한 값 형식 (기본 항목, 형식 정보가 없는 예전 백업)"""
+    label = normalize_label(label)
+    if label in LABELS_TEMP:
+        return dict(DEFAULT_METRICS["체온"])
+    if label in LABELS_BP:
+        return dict(DEFAULT_METRICS["혈압"])
+    return {"value_type": ValueType.TEXT}
+
+
+class ValueParser:
+    """content → (value, value2). 형식에 맞지 않으면 ValueError(사용자에게 보여 줄 메시지)."""
+    chartable = True
+
+    def __init__(self, min_value=None, max_value=None):
+        self.min_value = min_value
+        self.max_value = max_value
+
+    def _number(self, raw: str) -> float:
+        value = float(raw)
+        # 정규식이 nan/inf는 걸러 내지만 자릿수가 아주 긴 입력은 inf가 될 수 있다
+        if not math.isfinite(value):
+            raise ValueError("너무 큰 숫자입니다.")
+        if (self.min_value is not None and value < self.min_value) or \
+                (self.max_value is not None and value > self.max_value):
+            raise ValueError(f"{self._bound(self.min_value)}~{self._bound(self.max_value)} 범위의 값이어야 합니다.")
+        return value
+
+    @staticmethod
+    def _bound(v):
+        if v is None:
+            return ""
+        return int(v) if float(v).is_integer() else v
+
+    def parse(self, content) -> tuple:
+        raise NotImplementedError
+
+
+class NumericParser(ValueParser):
+    def parse(self, content):
+        match = NUMBER_RE.match(content or "")
+        if not match:
+            raise ValueError("숫자여야 합니다. 예: 36.8")
+        return self._number(match.group(1)), None
+
+
+class PairParser(ValueParser):
+    def parse(self, content):
+        match = PAIR_RE.match(content or "")
+        if not match:
+            raise ValueError("'값/값' 형식이어야 합니다. 예: 120/80")
+        return self._number(match.group(1)), self._number(match.group(2))
+
+
+class ScaleParser(ValueParser):
+    def __init__(self, min_value=None, max_value=None):
+        low, high = DEFAULT_SCALE
+        super().__init__(low if min_value is None else min_value, high if max_value is None else max_value)
+
+    def parse(self, content):
+        match = SCALE_RE.match(content or "")
+        if not match:
+            raise ValueError(f"{self._bound(self.min_value)}~{self._bound(self.max_value)} 사이의 정수여야 합니다.")
+        return self._number(match.group(1)), None
+
+
+class TextParser(ValueParser):
+    chartable = False
+
+    def parse(self, content):
+        return None, None
+
+
+PARSERS = {
+    ValueType.NUMERIC: NumericParser,
+    ValueType.PAIR: PairParser,
+    ValueType.SCALE: ScaleParser,
+    ValueType.TEXT: TextParser,
+}
+CHARTABLE_TYPES = {value_type for value_type, parser in PARSERS.items() if parser.chartable}
+
+
+@lru_cache(maxsize=1024)
+def _parser(value_type, min_value, max_value) -> ValueParser:
+    return PARSERS.get(value_type, TextParser)(min_value, max_value)
+
+
+def value_config(metric) -> tuple:
+    return metric.value_type, metric.min_value, metric.max_value
+
+
+def parser_for(metric) -> ValueParser:
+    return _parser(*value_config(metric))
+
+
+def parse_stored(metric, content) -> tuple:
+    """이미 저장된 내용(백업, 형식 변경 후 재해석): 맞지 않으면 오류 대신 (None, None)"""
+    try:
+        return parser_for(metric).parse(content)
+    except ValueError:
+        return None, None
+
+
+def reparse_logs(metrics, batch_size: int = REPARSE_BATCH, only_missing: bool = False) -> tuple:
+    """
+    항목들의 로그 value/value2를 현재 값 형식으로 다시 채운다 (형식 변경, 예전 로그 채우기).
+    bulk_update는 시그널이 없으므로 바뀐 방의 일별 집계도 다시 만든다. 반환: (확인한 수, 바꾼 수)
+    """
+    from .rollups import rebuild_rollups
+
+    metrics = {metric.id: metric for metric in metrics}
+    qs = CareLog.objects.filter(metric_id__in=metrics)
+    if only_missing:
+        qs = qs.filter(value__isnull=True)
+
+    last = scanned = updated = 0
+    rooms = set()
+    while True:
+        logs = list(qs.filter(pk__gt=last).order_by("pk")
+                    .only("id", "room_id", "metric_id", "content", "value", "value2")[:batch_size])
+        if not logs:
+            break
+        last = logs[-1].pk
+        changed = []
+        for log in logs:
+            values = parse_stored(metrics[log.metric_id], log.content)
+            if values != (log.value, log.value2):
+                log.value, log.value2 = values
+                changed.append(log)
+                rooms.add(log.room_id)
+        CareLog.objects.bulk_update(changed, ["value", "value2"])
+        scanned += len(logs)
+        updated += len(changed)
+
+    for room_id in rooms:
+        rebuild_rollups(room_id=room_id)
+    return scanned, updated
@@ -0,0 +1,354 @@
+# room/backup.py
+"""
+방 전체를 zip(NDJSON + 미디어)으로 내보내고 다시 가져온다.
+내보내기는 iterator() 청크 조회 + 스트리밍 zip이라 방 크기와 무관하게 메모리가 일정하고,
+가져오기는 배치 bulk_create로 id를 새로 매핑한다.
+"""
+import itertools
+import json
+import os
+import zipfile
+from contextlib import contextmanager
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from calender.blobs import create_uploaded_file_from_stream
+from calender.models import CalendarAttachment, CalendarEvent, UploadedFile
+from log.models import CareLog, LogMetric
+from log.rollups import rebuild_rollups
+from log.values import default_value_config, parse_stored
+from schedule.models import (
+    Schedule,
+    ScheduleNeededSlot,
+    ScheduleAvailabilitySlot,
+    ScheduleAvailabilitySubmission,
+    ScheduleConfirmedAssignment,
+)
+from utils.db import bulk_create_with_pks
+from .models import Room, RoomMembership
+from .serializers import _gen_invite_code
+
+FORMAT_VERSION = 1
+ITER_CHUNK = 2000
+IMPORT_BATCH = 1000
+FLUSH_BYTES = 64 * 1024
+MEDIA_CHUNK = 256 * 1024
+
+# (파일명, 쿼리셋, 내보낼 컬럼)
+EXPORT_TABLES = [
+    ("memberships",
+     lambda rid: RoomMembership.objects.filter(room_id=rid),
+     ("user__email", "relation", "role", "joined_at")),
+    ("metrics",
+     lambda rid: LogMetric.objects.filter(room_id=rid),
+     ("id", "label", "sort_order", "value_type", "unit", "min_value", "max_value")),
+    ("care_logs",
+     lambda rid: CareLog.objects.filter(room_id=rid),
+     ("metric_id", "author__email", "content", "memo", "time_only", "date_only")),
+    ("schedules",
+     lambda rid: Schedule.objects.filter(room_id=rid),
+     ("id", "start_date", "end_date", "status", "created_by__email", "finalized_at")),
+    ("schedule_needed_slots",
+     lambda rid: ScheduleNeededSlot.objects.filter(schedule__room_id=rid),
+     ("schedule_id", "day", "hour", "needed")),
+    ("schedule_availability_slots",
+     lambda rid: ScheduleAvailabilitySlot.objects.filter(schedule__room_id=rid),
+     ("schedule_id", "user__email", "day", "hour", "available")),
+    ("schedule_submissions",
+     lambda rid: ScheduleAvailabilitySubmission.objects.filter(schedule__room_id=rid),
+     ("schedule_id", "user__email")),
+    ("schedule_confirmed",
+     lambda rid: ScheduleConfirmedAssignment.objects.filter(schedule__room_id=rid),
+     ("schedule_id", "day", "hour", "assignee__email", "finalized_by__email")),
+    ("calendar_events",
+     lambda rid: CalendarEvent.objects.filter(room_id=rid),
+     ("id", "date", "title", "start_at", "end_at", "is_all_day", "repeat_rule", "repeat_until",
+      "repeat_exceptions", "series_id", "original_date", "description", "assignee__email")),
+    ("calendar_attachments",
+     lambda rid: CalendarAttachment.objects.filter(event__room_id=rid),
+     ("event_id", "file_id", "type")),
+]
+
+
+class _StreamBuffer:
+    """zipfile이 쓴 바이트를 모아 두었다가 제너레이터가 꺼내 가는 버퍼 (seek 불가 스트림)"""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def _dumps(row) -> bytes:
+    return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b"\n"
+
+
+def iter_room_export(room: Room):
+    """zip 바이트 조각을 순서대로 내보내는 제너레이터 (StreamingHttpResponse/파일 쓰기 공용)"""
+    buf = _StreamBuffer()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("manifest.json", json.dumps({
+            "format": FORMAT_VERSION,
+            "exported_at": timezone.now().isoformat(),
+            "room": {"id": room.id, "patient": room.patient, "owner_email": room.owner.email},
+        }, ensure_ascii=False))
+
+        file_ids = set()
+        for name, make_qs, fields in EXPORT_TABLES:
+            qs = make_qs(room.id).order_by("pk").values(*fields)
+            with zf.open(f"{name}.ndjson", "w", force_zip64=True) as fp:
+                for row in qs.iterator(chunk_size=ITER_CHUNK):
+                    if name == "calendar_attachments" and str(row["file_id"]).isdigit():
+                        file_ids.add(int(row["file_id"]))
+                    fp.write(_dumps(row))
+                    if buf.size >= FLUSH_BYTES:
+                        yield buf.drain()
+
+        files = UploadedFile.objects.filter(id__in=file_ids).order_by("id")
+        with zf.open("uploaded_files.ndjson", "w", force_zip64=True) as fp:
+            for row in files.values("id", "type", "file").iterator(chunk_size=ITER_CHUNK):
+                fp.write(_dumps(row))
+        yield buf.drain()
+
+        for uploaded in files.iterator(chunk_size=ITER_CHUNK):
+            try:
+                src = uploaded.file.open("rb")
+            except (FileNotFoundError, ValueError):
+                continue
+            with src, zf.open(f"media/{uploaded.file.name}", "w", force_zip64=True) as fp:
+                for chunk in iter(lambda: src.read(MEDIA_CHUNK), b""):
+                    fp.write(chunk)
+                    if buf.size >= FLUSH_BYTES:
+                        yield buf.drain()
+    yield buf.drain()
+
+
+def _rows(zf: zipfile.ZipFile, name: str):
+    try:
+        fp = zf.open(f"{name}.ndjson")
+    except KeyError:
+        return
+    with fp:
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _batched(iterable, size):
+    it = iter(iterable)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def _owner_resolver(owner):
+    """
+    백업의 이메일 → 사용자 id. 가져온 사람 본인의 이메일만 owner로 연결하고 나머지는 None.
+    업로드된 zip의 이메일을 대상 환경의 다른 계정에 연결하면 아무나 남을 방에 넣거나 작성자를 꾸밀 수 있다.
+    """
+    email = (owner.email or "").lower()
+
+    def resolve(value):
+        return owner.id if value and value.lower() == email else None
+    return resolve
+
+
+@contextmanager
+def _archive_errors():
+    """손으로 고친/깨진 백업에서 나는 키 누락, 잘못된 JSON/값을 사용자용 ValueError로 바꾼다"""
+    try:
+        yield
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError, zipfile.BadZipFile, ValidationError):
+        raise ValueError("백업 파일의 내용이 올바르지 않습니다.") from None
+
+
+def _create_room(patient: str, owner) -> Room:
+    for _ in range(5):
+        try:
+            with transaction.atomic():
+                return Room.objects.create(owner=owner, patient=patient, invite_code=_gen_invite_code())
+        except IntegrityError:
+            continue
+    raise ValueError("초대코드 생성에 실패했습니다.")
+
+
+@transaction.atomic
+def import_room(fileobj, owner) -> Room:
+    """
+    iter_room_export()로 만든 zip을 owner 소유의 새 방으로 가져온다.
+    다른 사용자 계정에는 연결하지 않는다: 멤버는 owner 한 명, 작성자(기록/근무표 생성·확정)는 owner,
+    담당자는 owner 본인이 아니면 비우고, 가능 시간/제출은 owner 본인의 것만 가져온다.
+    잘못된 파일이면 ValueError.
+    """
+    try:
+        zf = zipfile.ZipFile(fileobj)
+        manifest = json.loads(zf.read("manifest.json"))
+    except (zipfile.BadZipFile, KeyError, json.JSONDecodeError):
+        raise ValueError("올바른 방 백업 파일이 아닙니다.")
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError("지원하지 않는 백업 형식입니다.")
+
+    with zf, _archive_errors():
+        room = _create_room(manifest["room"]["patient"], owner)
+        user_id = _owner_resolver(owner)
+
+        # 멤버: 가져온 사람(방장)만. 관계는 백업에 본인 행이 있으면 그대로
+        owner_relation = next(
+            (row["relation"] or "" for row in _rows(zf, "memberships") if user_id(row["user__email"])), "",
+        )
+        memberships = [RoomMembership(
+            room=room, user=owner, relation=owner_relation, role=RoomMembership.Role.OWNER,
+        )]
+        RoomMembership.objects.bulk_create(memberships, batch_size=IMPORT_BATCH)
+
+        # 항목: 방 생성 시 만들어지는 기본 항목(체온/혈압)과 라벨로 합친다
+        metric_map, metrics = {}, {}
+        existing = {m.label: m for m in room.log_metrics.all()}
+        for row in _rows(zf, "metrics"):
+            # 값 형식이 없는 예전 백업은 라벨로 짐작
+            config = {
+                field: row[field] for field in ("value_type", "unit", "min_value", "max_value") if field in row
+            } or default_value_config(row["label"])
+            metric = existing.get(row["label"])
+            if metric is None:
+                metric = LogMetric.objects.create(room=room, label=row["label"], sort_order=row["sort_order"], **config)
+            else:
+                changed = {field: value for field, value in {"sort_order": row["sort_order"], **config}.items()
+                           if getattr(metric, field) != value}
+                if changed:
+                    for field, value in changed.items():
+                        setattr(metric, field, value)
+                    metric.save(update_fields=list(changed))
+            metric_map[row["id"]] = metric.id
+            metrics[metric.id] = metric
+
+        for batch in _batched(_rows(zf, "care_logs"), IMPORT_BATCH):
+            logs = []
+            for row in batch:
+                metric_id = metric_map[row["metric_id"]]
+                value, value2 = parse_stored(metrics[metric_id], row["content"])
+                logs.append(CareLog(
+                    room=room,
+                    metric_id=metric_id,
+                    author_id=owner.id,
+                    content=row["content"],
+                    value=value,
+                    value2=value2,
+                    memo=row["memo"],
+                    time_only=row["time_only"],
+                    date_only=row["date_only"],
+                ))
+            CareLog.objects.bulk_create(logs)
+        # bulk_create는 post_save를 보내지 않으므로 일별 집계는 한 번에 만든다
+        rebuild_rollups(room_id=room.id)
+
+        schedule_map = {}
+        for batch in _batched(_rows(zf, "schedules"), IMPORT_BATCH):
+            objs = [
+                Schedule(
+                    room=room,
+                    start_date=row["start_date"],
+                    end_date=row["end_date"],
+                    status=row["status"],
+                    created_by_id=owner.id,
+                    finalized_at=row["finalized_at"],
+                )
+                for row in batch
+            ]
+            bulk_create_with_pks(Schedule, objs)
+            schedule_map.update({row["id"]: obj.id for row, obj in zip(batch, objs)})
+
+        for batch in _batched(_rows(zf, "schedule_needed_slots"), IMPORT_BATCH):
+            ScheduleNeededSlot.objects.bulk_create([
+                ScheduleNeededSlot(schedule_id=schedule_map[r["schedule_id"]], day=r["day"], hour=r["hour"], needed=r["needed"])
+                for r in batch
+            ])
+        for batch in _batched(_rows(zf, "schedule_availability_slots"), IMPORT_BATCH):
+            ScheduleAvailabilitySlot.objects.bulk_create([
+                ScheduleAvailabilitySlot(
+                    schedule_id=schedule_map[r["schedule_id"]], user_id=user_id(r["user__email"]),
+                    day=r["day"], hour=r["hour"], available=r["available"],
+                )
+                for r in batch if user_id(r["user__email"])
+            ])
+        for batch in _batched(_rows(zf, "schedule_submissions"), IMPORT_BATCH):
+            ScheduleAvailabilitySubmission.objects.bulk_create([
+                ScheduleAvailabilitySubmission(schedule_id=schedule_map[r["schedule_id"]], user_id=user_id(r["user__email"]))
+                for r in batch if user_id(r["user__email"])
+            ])
+        for batch in _batched(_rows(zf, "schedule_confirmed"), IMPORT_BATCH):
+            ScheduleConfirmedAssignment.objects.bulk_create([
+                ScheduleConfirmedAssignment(
+                    schedule_id=schedule_map[r["schedule_id"]], day=r["day"], hour=r["hour"],
+                    assignee_id=user_id(r["assignee__email"]),
+                    finalized_by_id=owner.id,
+                )
+                for r in batch
+            ])
+
+        # 첨부 원본 파일은 스토리지로 스트리밍 복사
+        file_map = {}
+        for row in _rows(zf, "uploaded_files"):
+            try:
+                src = zf.open(f"media/{row['file']}")
+            except KeyError:
+                continue
+            with src:
+                # 같은 내용의 파일이 이미 있으면 blob을 공유한다
+                uploaded = create_uploaded_file_from_stream(src, os.path.basename(row["file"]), row["type"])
+            file_map[str(row["id"])] = uploaded.file_id
+
+        event_map, series_links = {}, []
+        for batch in _batched(_rows(zf, "calendar_events"), IMPORT_BATCH):
+            objs = [
+                CalendarEvent(
+                    room=room,
+                    date=r["date"],
+                    title=r["title"],
+                    start_at=r["start_at"],
+                    end_at=r["end_at"],
+                    is_all_day=r["is_all_day"],
+                    repeat_rule=r["repeat_rule"],
+                    repeat_until=r["repeat_until"],
+                    repeat_exceptions=r.get("repeat_exceptions") or [],
+                    original_date=r.get("original_date"),
+                    description=r["description"],
+                    assignee_id=user_id(r["assignee__email"]),
+                )
+                for r in batch
+            ]
+            bulk_create_with_pks(CalendarEvent, objs)
+            event_map.update({r["id"]: obj.id for r, obj in zip(batch, objs)})
+            series_links += [(obj, r["series_id"]) for r, obj in zip(batch, objs) if r.get("series_id")]
+
+        # 개별 수정본이 원본보다 먼저 나올 수 있으므로 모든 일정을 만든 뒤 연결
+        for obj, series_id in series_links:
+            obj.series_id = event_map.get(series_id)
+        CalendarEvent.objects.bulk_update([obj for obj, _ in series_links], ["series"], batch_size=IMPORT_BATCH)
+
+        for batch in _batched(_rows(zf, "calendar_attachments"), IMPORT_BATCH):
+            CalendarAttachment.objects.bulk_create([
+                CalendarAttachment(
+                    event_id=event_map[r["event_id"]],
+                    file_id=file_map.get(str(r["file_id"]), ""),
+                    uploaded_file_id=file_map.get(str(r["file_id"])),
+                    type=r["type"],
+                )
+                for r in batch
+            ])
+
+    return room
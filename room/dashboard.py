@@ -0,0 +1,118 @@
+# room/dashboard.py
+from asgiref.sync import async_to_sync, sync_to_async
+import asyncio
+from django.db import connection, connections
+from django.utils import timezone
+
+from calender.models import CalendarEvent
+from calender.recurrence import upcoming
+from calender.serializers import CalendarEventSummarySerializer
+from log.charts import build_room_charts
+from log.models import CareLog
+from log.serializers import CareLogSerializer
+from schedule.models import Schedule, ScheduleConfirmedAssignment
+from schedule.serializers import compute_sunday_range_from_week
+from utils.cache import cached_room_section
+from .roster import get_room_roster
+from .serializers import RoomSerializer
+
+UPCOMING_EVENTS_LIMIT = 5
+
+
+def _room_section(room):
+    return RoomSerializer(room).data
+
+
+def _members_section(room):
+    return get_room_roster(room.id)
+
+
+def _schedule_section(room):
+    start_date, end_date = compute_sunday_range_from_week(None)
+    schedule = Schedule.objects.filter(room_id=room.id, start_date=start_date).first()
+    confirmed = []
+    if schedule:
+        qs = (ScheduleConfirmedAssignment.objects
+              .filter(schedule=schedule)
+              .order_by("day", "hour")
+              .values("day", "hour", "assignee_id", "assignee__name"))
+        confirmed = [
+            {
+                "day": row["day"],
+                "hour": row["hour"],
+                "assignee": {"id": row["assignee_id"], "name": row["assignee__name"]} if row["assignee_id"] else None,
+            }
+            for row in qs
+        ]
+    return {
+        "week_id": schedule.id if schedule else None,
+        "week_range": [start_date.isoformat(), end_date.isoformat()],
+        "status": schedule.status if schedule else "none",
+        "confirmed": confirmed,
+    }
+
+
+def _logs_section(room):
+    qs = (CareLog.objects
+          .filter(room_id=room.id, date_only=timezone.now().date())
+          .select_related("metric")
+          .order_by("time_only", "id"))
+    return CareLogSerializer(qs, many=True).data
+
+
+def _charts_section(room):
+    return build_room_charts(room.id)
+
+
+def _events_section(room):
+    qs = CalendarEvent.objects.filter(room_id=room.id).select_related("assignee")
+    occurrences = upcoming(qs, timezone.now().date(), UPCOMING_EVENTS_LIMIT)
+    return CalendarEventSummarySerializer(occurrences, many=True).data
+
+
+# 섹션 이름 → (빌더, 캐시 버전 섹션, 날짜 의존 여부)
+# 버전 섹션이 None이면 빌더가 자체 캐시를 사용한다.
+SECTIONS = {
+    "room": (_room_section, "room", False),
+    "members": (_members_section, None, False),
+    "schedule": (_schedule_section, "schedule", True),
+    "logs": (_logs_section, "logs", True),
+    "charts": (_charts_section, "charts", True),
+    "events": (_events_section, "calendar", True),
+}
+
+
+def _build_section(room, name):
+    builder, version_section, per_day = SECTIONS[name]
+    if version_section is None:
+        return builder(room)
+    parts = ["dashboard", name]
+    if per_day:
+        parts.append(timezone.now().date())
+    return cached_room_section(room.id, version_section, lambda: builder(room), *parts)
+
+
+def _build_section_in_worker(room, name):
+    # 워커 스레드는 자체 DB 커넥션을 열기 때문에 끝나면 반드시 닫는다
+    try:
+        return _build_section(room, name)
+    finally:
+        connections.close_all()
+
+
+async def _gather_sections(room, names):
+    results = await asyncio.gather(*[
+        sync_to_async(_build_section_in_worker, thread_sensitive=False)(room, name)
+        for name in names
+    ])
+    return dict(zip(names, results))
+
+
+def build_dashboard(room, names) -> dict:
+    """
+    서로 독립적인 섹션 쿼리를 동시에 실행한다.
+    트랜잭션 안에서는 다른 커넥션이 미커밋 데이터를 볼 수 없으므로 순차 실행.
+    """
+    if len(names) <= 1 or connection.in_atomic_block:
+        return {name: _build_section(room, name) for name in names}
+    return async_to_sync(_gather_sections)(room, names)
@@ -0,0 +1,128 @@
+# room/deletion.py
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+
+from calender.models import CalendarAttachment, CalendarEvent, CalendarEventTombstone
+from log.models import CareLog, CareLogDailyRollup, LogMetric
+from schedule.models import (
+    Schedule,
+    ScheduleNeededSlot,
+    ScheduleAvailabilitySlot,
+    ScheduleAvailabilitySubmission,
+    ScheduleConfirmedAssignment,
+)
+from utils.background import run_in_background
+from .invites import forget_invite
+from .models import Room, RoomMembership, RoomDeletionJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# 자식 → 부모 순서. raw delete는 CASCADE를 처리하지 않으므로 순서가 중요하다.
+PURGE_STEPS = [
+    ("calendar_attachments", lambda rid: CalendarAttachment.objects.filter(event__room_id=rid)),
+    ("calendar_overrides", lambda rid: CalendarEvent.objects.filter(room_id=rid, series__isnull=False)),
+    ("calendar_events", lambda rid: CalendarEvent.objects.filter(room_id=rid)),
+    ("calendar_tombstones", lambda rid: CalendarEventTombstone.objects.filter(room_id=rid)),
+    ("care_logs", lambda rid: CareLog.objects.filter(room_id=rid)),
+    ("care_log_rollups", lambda rid: CareLogDailyRollup.objects.filter(room_id=rid)),
+    ("log_metrics", lambda rid: LogMetric.objects.filter(room_id=rid)),
+    ("schedule_needed_slots", lambda rid: ScheduleNeededSlot.objects.filter(schedule__room_id=rid)),
+    ("schedule_availability_slots", lambda rid: ScheduleAvailabilitySlot.objects.filter(schedule__room_id=rid)),
+    ("schedule_submissions", lambda rid: ScheduleAvailabilitySubmission.objects.filter(schedule__room_id=rid)),
+    ("schedule_confirmed", lambda rid: ScheduleConfirmedAssignment.objects.filter(schedule__room_id=rid)),
+    ("schedules", lambda rid: Schedule.objects.filter(room_id=rid)),
+    ("memberships", lambda rid: RoomMembership.objects.filter(room_id=rid)),
+]
+
+
+def request_room_deletion(room: Room, user) -> RoomDeletionJob:
+    """방을 삭제 중 상태로 표시하고 작업을 등록한다. 실제 삭제는 커밋 이후 백그라운드에서."""
+    with transaction.atomic():
+        Room.objects.filter(pk=room.pk).update(deleting_at=timezone.now())
+        # 커밋 전에 비우면 그 사이 조회가 방을 다시 살아 있는 상태로 캐시할 수 있다
+        transaction.on_commit(lambda: forget_invite(room.invite_code))
+        job, _ = RoomDeletionJob.objects.update_or_create(
+            room_id=room.pk,
+            defaults={
+                "requested_by": user,
+                "status": RoomDeletionJob.Status.PENDING,
+                "progress": {},
+                "error": "",
+                "finished_at": None,
+            },
+        )
+        run_in_background(run_deletion_job, job.pk)
+    return job
+
+
+def _delete_in_batches(qs, batch_size: int, on_batch) -> int:
+    total = 0
+    while True:
+        pks = list(qs.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return total
+        # 방 조건 + pk 범위로 한 번에 지우는 raw DELETE (시그널/Collector 없음)
+        with transaction.atomic():
+            deleted = qs.filter(pk__lte=pks[-1])._raw_delete(qs.db)
+        total += deleted
+        on_batch(deleted)
+
+
+def _claim(job_id: int, stale_before=None) -> bool:
+    qs = RoomDeletionJob.objects.filter(pk=job_id)
+    if stale_before is None:
+        qs = qs.filter(status__in=[RoomDeletionJob.Status.PENDING, RoomDeletionJob.Status.FAILED])
+    else:
+        qs = qs.exclude(status=RoomDeletionJob.Status.DONE).exclude(
+            status=RoomDeletionJob.Status.RUNNING, updated_at__gte=stale_before
+        )
+    return qs.update(status=RoomDeletionJob.Status.RUNNING, updated_at=timezone.now()) == 1
+
+
+def run_deletion_job(job_id: int, batch_size: int = DEFAULT_BATCH_SIZE, stale_before=None, report=None) -> bool:
+    """
+    작업을 선점한 뒤 종속 테이블을 batch_size 단위로 지우고 마지막에 방 행을 삭제한다.
+    이미 다른 워커가 실행 중이면 False.
+    """
+    if not _claim(job_id, stale_before):
+        return False
+
+    job = RoomDeletionJob.objects.get(pk=job_id)
+    progress = dict(job.progress or {})
+
+    try:
+        for label, make_qs in PURGE_STEPS:
+            def on_batch(n, label=label):
+                progress[label] = progress.get(label, 0) + n
+                job.progress = progress
+                job.save(update_fields=["progress", "updated_at"])
+                if report:
+                    report(job, label, progress[label])
+
+            _delete_in_batches(make_qs(job.room_id), batch_size, on_batch)
+
+        # 종속 행이 모두 사라졌으므로 Collector 비용 없이 방 자체를 삭제
+        Room.objects.filter(pk=job.room_id).delete()
+    except Exception as e:
+        logger.exception("room deletion failed: room_id=%s", job.room_id)
+        job.status = RoomDeletionJob.Status.FAILED
+        job.error = str(e)
+        job.save(update_fields=["status", "error", "updated_at"])
+        return False
+
+    job.status = RoomDeletionJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at", "updated_at"])
+    return True
+
+
+def pending_jobs(stale_minutes: int):
+    stale_before = timezone.now() - timedelta(minutes=stale_minutes)
+    qs = RoomDeletionJob.objects.exclude(status=RoomDeletionJob.Status.DONE).exclude(
+        status=RoomDeletionJob.Status.RUNNING, updated_at__gte=stale_before
+    )
+    return qs.order_by("created_at").values_list("pk", flat=True), stale_before
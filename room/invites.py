@@ -0,0 +1,34 @@
+# room/invites.py
+import hashlib
+from django.core.cache import cache
+from .models import Room
+
+POSITIVE_TTL = 60 * 60
+NEGATIVE_TTL = 60
+_MISSING = "__missing__"
+
+
+def _key(invite_code: str) -> str:
+    # 사용자 입력을 그대로 키에 넣지 않도록 해시
+    return "invite:" + hashlib.sha256(invite_code.encode()).hexdigest()[:32]
+
+
+def lookup_invite(invite_code: str):
+    """
+    초대코드 → {"id", "patient"} (없으면 None).
+    존재하는 코드는 길게, 존재하지 않는 코드는 짧게 캐시해 반복 시도가 DB로 가지 않게 한다.
+    """
+    key = _key(invite_code)
+    hit = cache.get(key)
+    if hit == _MISSING:
+        return None
+    if hit is not None:
+        return hit
+
+    row = Room.objects.alive().filter(invite_code=invite_code).values("id", "patient").first()
+    cache.set(key, row or _MISSING, POSITIVE_TTL if row else NEGATIVE_TTL)
+    return row
+
+
+def forget_invite(invite_code: str) -> None:
+    cache.delete(_key(invite_code))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from room.backup import iter_room_export
+from room.models import Room
+
+
+class Command(BaseCommand):
+    help = "방 전체(멤버, 로그, 스케줄, 캘린더, 첨부 파일)를 zip 파일로 내보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("room_id", type=int)
+        parser.add_argument("path", help="저장할 zip 경로")
+
+    def handle(self, *args, **opts):
+        room = Room.objects.alive().select_related("owner").filter(pk=opts["room_id"]).first()
+        if room is None:
+            raise CommandError("해당 방을 찾을 수 없습니다.")
+
+        size = 0
+        with open(opts["path"], "wb") as fp:
+            for chunk in iter_room_export(room):
+                fp.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"room={room.id} → {opts['path']} ({size} bytes)"))
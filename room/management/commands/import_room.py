@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from room.backup import import_room
+
+
+class Command(BaseCommand):
+    help = "export_room으로 만든 zip을 새 방으로 가져옵니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner-email", required=True, help="새 방의 방장이 될 사용자 이메일")
+
+    def handle(self, *args, **opts):
+        owner = get_user_model().objects.filter(email=opts["owner_email"].strip().lower()).first()
+        if owner is None:
+            raise CommandError("해당 이메일의 사용자가 없습니다.")
+
+        try:
+            with open(opts["path"], "rb") as fp:
+                room = import_room(fp, owner)
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"imported → room={room.id} invite_code={room.invite_code}"))
@@ -0,0 +1,33 @@
+import time
+from django.core.management.base import BaseCommand
+from room.deletion import DEFAULT_BATCH_SIZE, pending_jobs, run_deletion_job
+
+
+class Command(BaseCommand):
+    help = "삭제 요청된 방의 데이터를 배치 단위로 정리합니다. (백그라운드 스레드 실패/중단분 재처리 포함)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--stale-minutes", type=int, default=10,
+                            help="이 시간 이상 진행이 없는 RUNNING 작업은 다시 가져온다.")
+        parser.add_argument("--loop", action="store_true", help="종료하지 않고 주기적으로 계속 처리")
+        parser.add_argument("--interval", type=int, default=30, help="--loop 대기 시간(초)")
+
+    def handle(self, *args, **opts):
+        while True:
+            self._run_once(opts)
+            if not opts["loop"]:
+                return
+            time.sleep(opts["interval"])
+
+    def _run_once(self, opts):
+        job_ids, stale_before = pending_jobs(opts["stale_minutes"])
+        for job_id in list(job_ids):
+            def report(job, label, count):
+                self.stdout.write(f"room={job.room_id} {label}: {count}")
+
+            ok = run_deletion_job(job_id, opts["batch_size"], stale_before=stale_before, report=report)
+            if ok:
+                self.stdout.write(self.style.SUCCESS(f"job={job_id} done"))
+            else:
+                self.stdout.write(self.style.WARNING(f"job={job_id} skipped or failed"))
@@ -1,16 +1,27 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from log.models import LogMetric
+from log.values import DEFAULT_METRICS
+from utils.cache import bump_room_version
 # Create your models here.
 
+class RoomQuerySet(models.QuerySet):
+    def alive(self):
+        # 삭제 진행 중인 방은 모든 API에서 존재하지 않는 것으로 취급
+        return self.filter(deleting_at__isnull=True)
+
+
 class Room(models.Model):
     patient = models.CharField(max_length=100, db_index=True)
     invite_code = models.CharField(max_length=32, unique=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="owned_rooms", db_index=True)
     created_at= models.DateTimeField(auto_now_add=True)
     updated_at= models.DateTimeField(auto_now=True)
+    deleting_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = RoomQuerySet.as_manager()
     
     class Meta:
         ordering = ["-created_at"]
@@ -22,9 +33,25 @@ class Room(models.Model):
 @receiver(post_save, sender=Room)
 def create_default_metrics(sender, instance, created, **kwargs):
     if created:
-        defaults = ["체온", "혈압"]
-        for label in defaults:
-            LogMetric.objects.get_or_create(room=instance, label=label)
+        for label, config in DEFAULT_METRICS.items():
+            LogMetric.objects.get_or_create(room=instance, label=label, defaults=config)
+
+
+@receiver(post_save, sender=Room)
+def bump_room_cache(sender, instance, created, **kwargs):
+    if not created:
+        bump_room_version(instance.id, "room")
+
+
+@receiver([post_save, post_delete], sender=Room)
+def forget_room_invite(sender, instance, **kwargs):
+    # 새 코드의 음성 캐시, 변경/삭제된 방의 양성 캐시를 모두 비운다
+    # (커밋 이후에: 그 전에 비우면 동시 조회가 커밋 전 상태를 다시 캐시한다)
+    from .invites import forget_invite
+    code = instance.invite_code
+    transaction.on_commit(lambda: forget_invite(code))
+
+
 class RoomMembership(models.Model):
 
 
@@ -60,4 +87,48 @@ class RoomMembership(models.Model):
         ]
         
     def __str__(self):
-        return f"RoomMembership(room={self.room.patient}, user={self.user.name}, role={self.role})"
\ No newline at end of file
+        return f"RoomMembership(room={self.room_id}, user={self.user_id}, role={self.role})"
+
+
+@receiver([post_save, post_delete], sender=RoomMembership)
+def bump_members_cache(sender, instance, **kwargs):
+    bump_room_version(instance.room_id, "members")
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_members_cache_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    # 멤버 목록에 사용자 이름이 들어가므로, 이름이 바뀔 수 있는 저장이면 소속 방의 목록을 무효화
+    # (로그인 시 last_login만 저장하는 경우 등은 건너뛴다)
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    room_ids = RoomMembership.objects.filter(user_id=instance.pk).values_list("room_id", flat=True)
+    for room_id in room_ids:
+        bump_room_version(room_id, "members")
+
+
+class RoomDeletionJob(models.Model):
+    """방 삭제 백그라운드 작업. 방 행이 지워진 뒤에도 진행 상황을 조회할 수 있도록 FK 대신 id만 보관"""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "PENDING"
+        RUNNING = "RUNNING", "RUNNING"
+        DONE = "DONE", "DONE"
+        FAILED = "FAILED", "FAILED"
+
+    room_id = models.BigIntegerField(unique=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="room_deletion_jobs",
+    )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"RoomDeletionJob(room_id={self.room_id}, status={self.status})"
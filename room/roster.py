@@ -0,0 +1,60 @@
+# room/roster.py
+import base64
+import hashlib
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from utils.cache import cached_room_section, room_version
+from .models import RoomMembership
+
+ROSTER_FIELDS = ("id", "room", "user_id", "user_name", "relation", "role", "joined_at", "membership_index")
+
+
+def _load_roster(room_id: int) -> list[dict]:
+    order = [F("joined_at").asc(), F("id").asc()]
+    qs = (
+        RoomMembership.objects
+        .filter(room_id=room_id)
+        .annotate(
+            user_name=F("user__name"),
+            membership_index=Window(RowNumber(), order_by=order) - 1,
+        )
+        .order_by(*order)
+        .values(*ROSTER_FIELDS)
+    )
+    return list(qs)
+
+
+def get_room_roster(room_id: int) -> list[dict]:
+    """가입 순서(joined_at, id)로 정렬된 멤버 목록. 멤버 변경 시 members 버전이 올라가며 무효화"""
+    return cached_room_section(room_id, "members", lambda: _load_roster(room_id), "roster")
+
+
+def get_membership_index(room_id: int, user_id: int):
+    for row in get_room_roster(room_id):
+        if row["user_id"] == user_id:
+            return row["membership_index"]
+    return None
+
+
+def roster_etag(room_id: int, *parts) -> str:
+    raw = ":".join(str(p) for p in (room_id, room_version(room_id, "members"), *parts))
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(f"p={position}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """잘못된 커서면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not raw.startswith("p="):
+        raise ValueError("invalid cursor")
+    position = int(raw[2:])
+    if position < 0:
+        raise ValueError("invalid cursor")
+    return position
@@ -1,7 +1,8 @@
 import secrets, string
 from django.db import transaction, IntegrityError
 from rest_framework import serializers
-from .models import Room, RoomMembership
+from .models import Room, RoomMembership, RoomDeletionJob
+from .invites import lookup_invite
 from rest_framework import exceptions
 
 
@@ -55,23 +56,28 @@ class RoomJoinSerializer(serializers.Serializer):
     relation = serializers.CharField(max_length=30)
 
     def validate(self, attrs):
-        try:
-            room = Room.objects.get(invite_code=attrs["invite_code"], patient=attrs["patient"])
-        except Room.DoesNotExist:
+        # 초대코드 조회는 캐시 우선 (room/invites.py)
+        row = lookup_invite(attrs["invite_code"])
+        if row is None or row["patient"] != attrs["patient"]:
             raise serializers.ValidationError("입장코드 또는 환자 정보가 올바르지 않습니다.")
-        attrs["room"] = room
+        attrs["room_id"] = row["id"]
         return attrs
 
     def create(self, validated_data):
         user = self.context["request"].user
-        room = validated_data["room"]
+        room_id = validated_data["room_id"]
         relation = validated_data["relation"]
 
-        membership, created = RoomMembership.objects.get_or_create(
-            room=room,
-            user=user,
-            defaults={"relation": relation, "role": RoomMembership.Role.MEMBER},
-        )
+        try:
+            with transaction.atomic():
+                membership, created = RoomMembership.objects.get_or_create(
+                    room_id=room_id,
+                    user=user,
+                    defaults={"relation": relation, "role": RoomMembership.Role.MEMBER},
+                )
+        except IntegrityError:
+            # 캐시 조회 이후 방이 삭제된 경우
+            raise serializers.ValidationError("입장코드 또는 환자 정보가 올바르지 않습니다.")
         if not created:
             raise serializers.ValidationError("이미 이 방에 참여 중입니다.")
         return membership
@@ -83,4 +89,10 @@ class RoomMembershipSerializer(serializers.ModelSerializer):
     membership_index = serializers.IntegerField(read_only=True)
     class Meta:
         model = RoomMembership
-        fields = ("id", "room", "user_id", "user_name", "relation", "role", "joined_at", "membership_index",)
\ No newline at end of file
+        fields = ("id", "room", "user_id", "user_name", "relation", "role", "joined_at", "membership_index",)
+
+
+class RoomDeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RoomDeletionJob
+        fields = ("room_id", "status", "progress", "error", "created_at", "updated_at", "finished_at")
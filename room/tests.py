@@ -1,3 +1,282 @@
+import io
+import zipfile
+from datetime import date, datetime, time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import TestCase
+from redis.exceptions import RedisError
+from rest_framework.test import APIClient
+
+from calender.models import CalendarEvent
+from log.models import CareLog, LogMetric
+from user.models import CustomUser as User
+from .models import Room, RoomDeletionJob, RoomMembership
+
+
+def make_user(email, name=""):
+    return User.objects.create(email=email, name=name)
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class RoomAPITestCase(TestCase):
+    def setUp(self):
+        # 방 id가 테스트마다 재사용되므로 이전 테스트의 섹션 캐시를 비운다
+        cache.clear()
+        self.owner = make_user("owner@example.com", "방장")
+        self.client = client_for(self.owner)
+        res = self.client.post("/rooms/", {"patient": "환자", "relation": "딸"}, format="json")
+        self.assertEqual(res.status_code, 201, res.content)
+        self.room = Room.objects.get(id=res.data["id"])
+
+    def add_member(self, user):
+        return RoomMembership.objects.create(room=self.room, user=user, relation="아들")
+
+
+class DashboardTests(RoomAPITestCase):
+    def test_returns_every_section_by_default(self):
+        res = self.client.get(f"/rooms/{self.room.id}/dashboard/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            set(res.data),
+            {"room_id", "room", "members", "schedule", "logs", "charts", "events"},
+        )
+        self.assertEqual(res.data["room_id"], self.room.id)
+        self.assertEqual(len(res.data["members"]), 1)
+
+    def test_include_limits_sections_and_rejects_unknown_names(self):
+        res = self.client.get(f"/rooms/{self.room.id}/dashboard/?include=logs,room")
+        self.assertEqual(set(res.data), {"room_id", "logs", "room"})
+
+        res = self.client.get(f"/rooms/{self.room.id}/dashboard/?include=logs,bad")
+        self.assertEqual(res.status_code, 400)
+
+    def test_new_log_invalidates_cached_logs_section(self):
+        url = f"/rooms/{self.room.id}/dashboard/?include=logs"
+        self.assertEqual(self.client.get(url).data["logs"], [])
+
+        metric = LogMetric.objects.get(room=self.room, label="체온")
+        res = self.client.post(
+            f"/rooms/{self.room.id}/logs/",
+            {"metric": metric.id, "content": "36.5", "time_only": "10:00"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201, res.content)
+        self.assertEqual(len(self.client.get(url).data["logs"]), 1)
+
+    def test_non_member_is_forbidden(self):
+        outsider = client_for(make_user("outsider@example.com"))
+        self.assertEqual(outsider.get(f"/rooms/{self.room.id}/dashboard/").status_code, 403)
+
+
+class RoomDeletionTests(RoomAPITestCase):
+    def add_logs(self, room, count):
+        metric = LogMetric.objects.get(room=room, label="체온")
+        CareLog.objects.bulk_create([
+            CareLog(room=room, metric=metric, author=self.owner, content="36.5",
+                    date_only=date(2026, 10, 1), time_only=time(9))
+            for _ in range(count)
+        ])
+
+    def test_delete_hides_room_then_purge_removes_its_data(self):
+        other = Room.objects.get(id=self.client.post(
+            "/rooms/", {"patient": "다른 환자", "relation": "딸"}, format="json").data["id"])
+        self.add_logs(self.room, 5)
+        self.add_logs(other, 2)
+
+        res = self.client.delete(f"/rooms/{self.room.id}/")
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.data["status"], RoomDeletionJob.Status.PENDING)
+
+        # 삭제 중인 방은 바로 보이지 않는다
+        self.assertEqual(self.client.get(f"/rooms/{self.room.id}/").status_code, 404)
+        self.assertEqual([r["id"] for r in self.client.get("/rooms/").data], [other.id])
+
+        call_command("purge_deleted_rooms", "--batch-size", "2", stdout=io.StringIO())
+
+        res = self.client.get(f"/rooms/deletions/{self.room.id}/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["status"], RoomDeletionJob.Status.DONE)
+        self.assertEqual(res.data["progress"]["care_logs"], 5)
+        self.assertFalse(Room.objects.filter(id=self.room.id).exists())
+        self.assertEqual(CareLog.objects.filter(room=other).count(), 2)
+
+    def test_only_owner_can_delete(self):
+        member = make_user("member@example.com")
+        self.add_member(member)
+        self.assertEqual(client_for(member).delete(f"/rooms/{self.room.id}/").status_code, 403)
+        self.assertFalse(RoomDeletionJob.objects.exists())
+
+
+class RosterPaginationTests(RoomAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(4):
+            self.add_member(make_user(f"member{i}@example.com", f"멤버{i}"))
+        self.url = f"/rooms/{self.room.id}/members/"
+
+    def test_without_cursor_returns_full_list(self):
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([m["membership_index"] for m in res.data], [0, 1, 2, 3, 4])
+        self.assertEqual(res.data[0]["user_id"], self.owner.id)
+
+    def test_cursor_pages_follow_join_order(self):
+        res = self.client.get(self.url + "?page_size=2")
+        self.assertEqual([m["membership_index"] for m in res.data["results"]], [0, 1])
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([m["membership_index"] for m in res.data["results"]], [2, 3])
+        self.assertIsNotNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([m["membership_index"] for m in res.data["results"]], [4])
+        self.assertIsNone(res.data["next"])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.client.get(self.url + "?cursor=zzz").status_code, 400)
+        self.assertEqual(self.client.get(self.url + "?page_size=0").status_code, 400)
+
+    def test_etag_changes_when_membership_changes(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        RoomMembership.objects.filter(role=RoomMembership.Role.MEMBER).first().delete()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.data), 4)
+
+
+@mock.patch("room.throttles.get_redis", side_effect=RedisError)
+class InviteJoinTests(RoomAPITestCase):
+    """Redis 없이 동작하는 경로(캐시 카운터 대체)로 초대코드 입장을 확인한다"""
+
+    def join(self, user, invite_code=None, ip="10.0.0.1"):
+        return client_for(user).post(
+            "/rooms/join/",
+            {"invite_code": invite_code or self.room.invite_code, "patient": self.room.patient, "relation": "아들"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_join_with_valid_code_adds_member(self, _):
+        user = make_user("member@example.com", "멤버")
+        with self.assertLogs("room.throttles", "WARNING"):
+            res = self.join(user)
+        self.assertEqual(res.status_code, 201, res.content)
+        self.assertTrue(RoomMembership.objects.filter(room=self.room, user=user).exists())
+
+    def test_unknown_code_is_rejected(self, _):
+        with self.assertLogs("room.throttles", "WARNING"):
+            res = self.join(make_user("member@example.com"), invite_code="NOPE")
+        self.assertEqual(res.status_code, 400)
+
+    def test_repeated_attempts_are_throttled_per_user(self, _):
+        user = make_user("member@example.com")
+        with self.assertLogs("room.throttles", "WARNING"):
+            codes = [self.join(user, invite_code="NOPE", ip=f"10.0.0.{i}").status_code for i in range(11)]
+        self.assertEqual(codes[:10], [400] * 10)
+        self.assertEqual(codes[10], 429)
+
+        # 다른 사용자, 다른 IP는 영향받지 않는다
+        with self.assertLogs("room.throttles", "WARNING"):
+            res = self.join(make_user("other@example.com"), ip="10.0.1.1")
+        self.assertEqual(res.status_code, 201)
+
+
+class RosterRefreshTests(RoomAPITestCase):
+    def test_renaming_a_member_refreshes_roster_and_etag(self):
+        member = make_user("member@example.com", "이전 이름")
+        self.add_member(member)
+        url = f"/rooms/{self.room.id}/members/"
+        etag = self.client.get(url)["ETag"]
+
+        member.name = "새 이름"
+        member.save()
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data[-1]["user_name"], "새 이름")
+
+    def test_last_login_update_keeps_roster_cache(self):
+        etag = self.client.get(f"/rooms/{self.room.id}/members/")["ETag"]
+        self.owner.save(update_fields=["last_login"])
+        res = self.client.get(f"/rooms/{self.room.id}/members/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+
+class RoomBackupTests(RoomAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = make_user("member@example.com", "멤버")
+        self.add_member(self.member)
+        metric = LogMetric.objects.get(room=self.room, label="체온")
+        CareLog.objects.create(room=self.room, metric=metric, author=self.member, content="36.5",
+                               date_only=date(2026, 10, 1), time_only=time(9))
+        CalendarEvent.objects.create(
+            room=self.room, date=date(2026, 10, 1), title="병원", assignee=self.member,
+            start_at=datetime(2026, 10, 1, 1), end_at=datetime(2026, 10, 1, 2),
+        )
+
+    def export(self):
+        res = self.client.get(f"/rooms/{self.room.id}/export/")
+        self.assertEqual(res.status_code, 200)
+        return b"".join(res.streaming_content)
+
+    def import_(self, data, user=None):
+        upload = SimpleUploadedFile("room.zip", data, content_type="application/zip")
+        return client_for(user or self.owner).post("/rooms/import/", {"file": upload}, format="multipart")
+
+    def rewrite(self, data, **replace):
+        """백업 zip에서 일부 파일 내용만 바꾼 사본"""
+        out = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w") as dst:
+            for name in src.namelist():
+                key = name.rsplit(".", 1)[0]
+                dst.writestr(name, replace[key] if key in replace else src.read(name))
+        return out.getvalue()
+
+    def test_export_import_round_trip_belongs_to_importer_only(self):
+        importer = make_user("importer@example.com")
+        res = self.import_(self.export(), importer)
+        self.assertEqual(res.status_code, 201, res.content)
+
+        room = Room.objects.get(id=res.data["id"])
+        self.assertEqual(room.owner, importer)
+        self.assertEqual(list(room.memberships.values_list("user_id", flat=True)), [importer.id])
+
+        log = CareLog.objects.get(room=room)
+        self.assertEqual((log.content, log.author_id), ("36.5", importer.id))
+        event = CalendarEvent.objects.get(room=room)
+        self.assertEqual(event.title, "병원")
+        self.assertIsNone(event.assignee_id)
+
+    def test_only_owner_can_export(self):
+        res = client_for(self.member).get(f"/rooms/{self.room.id}/export/")
+        self.assertEqual(res.status_code, 403)
 
-# Create your tests here.
+    def test_malformed_archives_are_rejected_without_creating_a_room(self):
+        data = self.export()
+        cases = {
+            "not a zip": b"not a zip",
+            "bad json": self.rewrite(data, care_logs=b"{not json\n"),
+            "unknown metric": self.rewrite(data, care_logs=b'{"metric_id": 999999, "author__email": null, '
+                                                          b'"content": "1", "memo": "", "time_only": "09:00", '
+                                                          b'"date_only": "2026-10-01"}\n'),
+            "missing field": self.rewrite(data, calendar_events=b'{"id": 1, "date": "2026-10-01"}\n'),
+        }
+        rooms = Room.objects.count()
+        for label, archive in cases.items():
+            with self.subTest(label):
+                res = self.import_(archive)
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("detail", res.data)
+        self.assertEqual(Room.objects.count(), rooms)
@@ -0,0 +1,96 @@
+# room/throttles.py
+import logging
+import time
+from django.core.cache import cache
+from redis.exceptions import RedisError
+from rest_framework.throttling import SimpleRateThrottle
+
+from utils.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# KEYS: 버킷 키들, ARGV: capacity, refill(tokens/sec), now
+# 모든 버킷에 토큰이 있어야만 한 번에 차감한다. 반환: {허용 여부, 대기 초}
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl = math.ceil(capacity / refill) + 1
+local tokens = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local data = redis.call("HMGET", key, "tokens", "ts")
+    local t = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    t = math.min(capacity, t + math.max(0, now - ts) * refill)
+    tokens[i] = t
+    if t < 1 then
+        wait = math.max(wait, (1 - t) / refill)
+    end
+end
+local allowed = 0
+if wait == 0 then
+    allowed = 1
+end
+for i, key in ipairs(KEYS) do
+    local t = tokens[i]
+    if allowed == 1 then
+        t = t - 1
+    end
+    redis.call("HSET", key, "tokens", tostring(t), "ts", tostring(now))
+    redis.call("EXPIRE", key, ttl)
+end
+return {allowed, tostring(wait)}
+"""
+
+
+class InviteJoinThrottle(SimpleRateThrottle):
+    """
+    초대코드 입장 요청용 토큰 버킷 (사용자별 + IP별).
+    rate "10/min" → 최대 10회 연속 허용, 분당 10토큰씩 회복.
+    Redis 장애 시에는 Django 캐시 기반 고정 윈도우 카운터로 대체한다.
+    """
+
+    scope = "invite_join"
+    _script = None
+
+    def get_cache_key(self, request, view):
+        # 키는 _bucket_keys()에서 따로 만든다 (SimpleRateThrottle 인터페이스 충족용)
+        return None
+
+    def _bucket_keys(self, request):
+        keys = [f"throttle:{self.scope}:ip:{self.get_ident(request)}"]
+        if request.user and request.user.is_authenticated:
+            keys.append(f"throttle:{self.scope}:user:{request.user.pk}")
+        return keys
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        keys = self._bucket_keys(request)
+        try:
+            allowed, wait = self._consume_redis(keys)
+        except RedisError:
+            logger.warning("invite throttle: redis unavailable, falling back to cache counter")
+            allowed, wait = self._consume_cache(keys)
+        self._wait = wait
+        return allowed
+
+    def _consume_redis(self, keys):
+        cls = type(self)
+        if cls._script is None:
+            cls._script = get_redis().register_script(TOKEN_BUCKET_LUA)
+        allowed, wait = cls._script(keys=keys, args=[self.num_requests, self.num_requests / self.duration, time.time()])
+        return bool(int(allowed)), float(wait)
+
+    def _consume_cache(self, keys):
+        window = int(time.time() // self.duration)
+        for key in keys:
+            ck = f"{key}:{window}"
+            cache.add(ck, 0, self.duration)
+            if cache.incr(ck) > self.num_requests:
+                return False, self.duration - (time.time() % self.duration)
+        return True, 0.0
+
+    def wait(self):
+        return getattr(self, "_wait", None) or None
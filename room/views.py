@@ -3,12 +3,23 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import Room
+from rest_framework.parsers import MultiPartParser
+from rest_framework.utils.urls import replace_query_param
+from .models import Room, RoomDeletionJob
 from django.http import Http404
+from utils.streaming import streaming_response
 from .serializers import *
 from .permissions import IsRoomOwner, IsRoomMemberOrOwner
+from .dashboard import SECTIONS, build_dashboard
+from .backup import iter_room_export, import_room
+from .deletion import request_room_deletion
+from .throttles import InviteJoinThrottle
+from .roster import get_room_roster, roster_etag, encode_cursor, decode_cursor
 # Create your views here.
 
+MEMBERS_PAGE_SIZE = 50
+MEMBERS_MAX_PAGE_SIZE = 100
+
 class RoomViewSet(viewsets.ModelViewSet):
     
     serializer_class = RoomSerializer
@@ -23,7 +34,7 @@ class RoomViewSet(viewsets.ModelViewSet):
         
     def get_queryset(self):
         u = self.request.user
-        qs = Room.objects.select_related("owner")
+        qs = Room.objects.alive().select_related("owner")
     
         if self.action == "list":
             return qs.filter(Q(owner_id=u.id) | Q(memberships__user_id=u.id)).distinct()
@@ -36,7 +47,7 @@ class RoomViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated()]
 
     
-        if self.action in ["retrieve", "members", "leave"]:
+        if self.action in ["retrieve", "members", "leave", "dashboard", "export"]:
             return [permissions.IsAuthenticated(), IsRoomMemberOrOwner()]
 
     
@@ -49,13 +60,21 @@ class RoomViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         room = self.get_object()
         self.check_object_permissions(request, room) 
-        room.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        # 대용량 방은 요청 안에서 지우면 타임아웃 → 삭제 중으로 표시하고 백그라운드에서 배치 삭제
+        job = request_room_deletion(room, request.user)
+        return Response(RoomDeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"], url_path=r"deletions/(?P<room_id>\d+)")
+    def deletion_status(self, request, room_id=None):
+        job = RoomDeletionJob.objects.filter(room_id=room_id, requested_by=request.user).first()
+        if job is None:
+            return Response({"detail": "삭제 작업을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(RoomDeletionJobSerializer(job).data, status=status.HTTP_200_OK)
     
     # 커스텀
     
     # 방 들어가기
-    @action(detail=False, methods=["post"], url_path="join")
+    @action(detail=False, methods=["post"], url_path="join", throttle_classes=[InviteJoinThrottle])
     def join(self, request):
         ser = RoomJoinSerializer(data=request.data, context={"request": request})
         ser.is_valid(raise_exception=True)
@@ -65,25 +84,75 @@ class RoomViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"], url_path="members")
     def members(self, request, pk=None):
         room = self.get_object()
+        params = request.query_params
 
-        base_qs = (
-            RoomMembership.objects
-            .filter(room=room)
-            .select_related("user", "room")
-            .order_by("joined_at", "id")
-        )
-
-        memberships = list(base_qs)
-
-        for idx, m in enumerate(memberships):
-            m.membership_index = idx
-
-        memberships.sort(key=lambda m: (m.joined_at, m.id), reverse=False)
+        # cursor/page_size가 없으면 기존처럼 전체 목록을 반환
+        paginate = "cursor" in params or "page_size" in params
+        try:
+            position = decode_cursor(params["cursor"]) if params.get("cursor") else 0
+            page_size = min(int(params.get("page_size", MEMBERS_PAGE_SIZE)), MEMBERS_MAX_PAGE_SIZE)
+            if page_size < 1:
+                raise ValueError
+        except ValueError:
+            return Response({"detail": "cursor 또는 page_size가 올바르지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        etag = roster_etag(room.id, paginate, position, page_size)
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        roster = get_room_roster(room.id)
+        if not paginate:
+            return Response(roster, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+        url = request.build_absolute_uri()
+        end = position + page_size
+        next_url = replace_query_param(url, "cursor", encode_cursor(end)) if end < len(roster) else None
+        previous_url = None
+        if position > 0:
+            previous_url = replace_query_param(url, "cursor", encode_cursor(max(position - page_size, 0)))
+        data = {"next": next_url, "previous": previous_url, "results": roster[position:end]}
+        return Response(data, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+
+    @action(detail=True, methods=["get"], url_path="dashboard")
+    def dashboard(self, request, pk=None):
+        room = self.get_object()
 
-        data = RoomMembershipSerializer(memberships, many=True).data
+        include = request.query_params.get("include")
+        if include:
+            names = list(dict.fromkeys(x.strip() for x in include.split(",") if x.strip()))
+            unknown = [x for x in names if x not in SECTIONS]
+            if unknown:
+                return Response(
+                    {"detail": f"알 수 없는 섹션입니다: {', '.join(unknown)}", "sections": list(SECTIONS)},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            names = list(SECTIONS)
+
+        data = {"room_id": room.id, **build_dashboard(room, names)}
         return Response(data, status=status.HTTP_200_OK)
 
-
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, pk=None):
+        room = self.get_object()
+        if room.owner_id != request.user.id:
+            return Response({"detail": "방장에게만 허용된 작업입니다."}, status=status.HTTP_403_FORBIDDEN)
+
+        response = streaming_response(request, iter_room_export(room), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="room-{room.id}.zip"'
+        return response
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def import_backup(self, request):
+        uploaded = request.FILES.get("file")
+        if not uploaded:
+            return Response({"detail": "file 필드는 필수입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            room = import_room(uploaded, request.user)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(RoomSerializer(room).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["delete"], url_path=r"members/(?P<user_id>\d+)")
     def remove_member(self, request, pk=None, user_id=None):
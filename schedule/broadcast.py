@@ -1,7 +1,10 @@
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from utils.cache import bump_room_version
 
 def broadcast_to_room(room_id: int, payload: dict):
+    # 스케줄 변경은 모두 이 알림을 거치므로 대시보드 캐시 버전도 여기서 올린다
+    bump_room_version(room_id, "schedule")
     channel_layer = get_channel_layer()
     async_to_sync(channel_layer.group_send)(
         f"room_{room_id}_schedules",
@@ -5,6 +5,9 @@ from channels.db import database_sync_to_async
 from room.models import Room, RoomMembership
 
 class ScheduleRoomConsumer(AsyncWebsocketConsumer):
+    # 그룹 이름: room_{room_id}_{group_suffix}
+    group_suffix = "schedules"
+
     async def connect(self):
         self.room_id = int(self.scope["url_route"]["kwargs"]["room_id"])
         user = self.scope.get("user")
@@ -13,7 +16,7 @@ class ScheduleRoomConsumer(AsyncWebsocketConsumer):
             await self.close(code=4403)  # Forbidden
             return
 
-        self.group_name = f"room_{self.room_id}_schedules"
+        self.group_name = f"room_{self.room_id}_{self.group_suffix}"
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
@@ -34,7 +37,7 @@ class ScheduleRoomConsumer(AsyncWebsocketConsumer):
         if not user_id:
             return False
         try:
-            room = Room.objects.only("id", "owner_id").get(id=room_id)
+            room = Room.objects.alive().only("id", "owner_id").get(id=room_id)
         except Room.DoesNotExist:
             return False
         if room.owner_id == user_id:
@@ -19,7 +19,7 @@ class ScheduleCreateSerializer(serializers.Serializer):
     )
 
     def validate_room_id(self, value):
-        if not Room.objects.filter(id=value).exists():
+        if not Room.objects.alive().filter(id=value).exists():
             raise serializers.ValidationError("해당 방을 찾을 수 없습니다.")
         return value
 
@@ -0,0 +1,67 @@
+# schedule/shifts.py
+"""
+확정 근무(ScheduleConfirmedAssignment)를 시간 단위 행에서 연속 근무 구간으로 합친다.
+캘린더 피드(ICS), 다가오는 일정 목록에서 함께 사용한다.
+"""
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from django.conf import settings
+
+from .models import ScheduleConfirmedAssignment
+
+CHUNK_SIZE = 500
+LOCAL_TZ = ZoneInfo(settings.TIME_ZONE)
+
+
+def utc_naive(local_dt: datetime) -> datetime:
+    """근무 시각(현지)을 일정 start_at과 같은 기준(UTC naive)으로 변환"""
+    return local_dt.replace(tzinfo=LOCAL_TZ).astimezone(dt_timezone.utc).replace(tzinfo=None)
+
+
+def _run(schedule_id, room_id, room_name, day_date, first_hour, last_hour, finalized_at):
+    start = datetime.combine(day_date, time(first_hour))
+    return {
+        "schedule_id": schedule_id,
+        "room_id": room_id,
+        "room_name": room_name,
+        "date": day_date,
+        "first_hour": first_hour,
+        # start/end는 현지 시각 (hour 23 근무는 다음날 0시에 끝난다)
+        "start": start,
+        "end": datetime.combine(day_date, time()) + timedelta(hours=last_hour + 1),
+        "finalized_at": finalized_at,
+    }
+
+
+def iter_shift_runs(user, room_ids, since, until=None):
+    """
+    user의 확정 근무를 (날짜, 시작 시각, schedule_id) 순으로, 같은 날 연속된 시간은 하나로 합쳐서.
+    since(date) 이전에 끝난 주, until(date) 이후에 시작하는 주는 제외한다.
+    """
+    qs = ScheduleConfirmedAssignment.objects.filter(
+        assignee=user, schedule__room_id__in=room_ids, schedule__end_date__gte=since,
+    )
+    if until is not None:
+        qs = qs.filter(schedule__start_date__lte=until)
+    qs = (qs
+          .order_by("schedule__start_date", "day", "schedule_id", "hour")
+          .values_list("schedule_id", "schedule__room_id", "schedule__room__patient",
+                       "schedule__start_date", "day", "hour", "finalized_at"))
+
+    day_runs, current_date, run = [], None, None
+    for schedule_id, room_id, patient, start_date, day, hour, finalized_at in qs.iterator(chunk_size=CHUNK_SIZE):
+        day_date = start_date + timedelta(days=day)
+        if run and run[0] == schedule_id and run[3] == day_date and run[5] + 1 == hour:
+            run[5], run[6] = hour, max(run[6], finalized_at)
+            continue
+        if run:
+            day_runs.append(_run(*run))
+        if day_date != current_date:
+            # 같은 날 여러 방의 근무는 시작 시각 순으로 내보낸다
+            yield from sorted(day_runs, key=lambda r: (r["start"], r["schedule_id"]))
+            day_runs, current_date = [], day_date
+        run = [schedule_id, room_id, patient, day_date, hour, hour, finalized_at]
+    if run:
+        day_runs.append(_run(*run))
+    yield from sorted(day_runs, key=lambda r: (r["start"], r["schedule_id"]))
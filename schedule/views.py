@@ -22,7 +22,7 @@ class ScheduleReadCreateView(APIView):
     def post(self, request):
         ser = ScheduleCreateSerializer(data=request.data, context={"request": request})
         ser.is_valid(raise_exception=True)
-        room = get_object_or_404(Room, id=ser.validated_data["room_id"])
+        room = get_object_or_404(Room.objects.alive(), id=ser.validated_data["room_id"])
         if not IsRoomOwner().has_object_permission(request, self, room):
             return Response({"detail": "이 방에 스케줄을 생성할 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
         try:
@@ -52,7 +52,7 @@ class ScheduleReadCreateView(APIView):
         only = qser.validated_data.get("only")
         expand = qser.validated_data.get("expand")
 
-        room = get_object_or_404(Room, id=room_id)
+        room = get_object_or_404(Room.objects.alive(), id=room_id)
         if not IsRoomMemberOrOwner().has_object_permission(request, self, room):
             return Response({"detail": "이 방의 스케줄을 조회할 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
 
@@ -527,7 +527,7 @@ class ScheduleHistoryView(APIView):
         room_id = qser.validated_data["room_id"]
         limit = qser.validated_data["limit"]
 
-        room = get_object_or_404(Room, id=room_id)
+        room = get_object_or_404(Room.objects.alive(), id=room_id)
         if not IsRoomMemberOrOwner().has_object_permission(request, self, room):
             return Response({"detail": "이 방의 스케줄을 조회할 권한이 없습니다."},
                             status=status.HTTP_403_FORBIDDEN)
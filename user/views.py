@@ -8,6 +8,7 @@ from utils.cookies import cookie_kwargs_for, is_cross_site
 from .serializers import SignupSerializer, LoginSerializer
 from  rest_framework_simplejwt.tokens import RefreshToken
 from room.models import Room, RoomMembership
+from room.roster import get_membership_index
 
 # Create your views here.
 User = get_user_model()
@@ -31,17 +32,7 @@ class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def _membership_index(self, room_id: int, user_id: int):
-    
-        user_ids = list(
-            RoomMembership.objects
-            .filter(room_id=room_id)
-            .order_by('joined_at')
-            .values_list('user_id', flat=True)
-        )
-        try:
-            return user_ids.index(user_id)
-        except ValueError:
-            return None
+        return get_membership_index(room_id, user_id)
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -53,10 +44,10 @@ class LoginView(APIView):
             refresh_token = str(refresh)
 
             owned_ids = list(
-                Room.objects.filter(owner=user).values_list('id', flat=True)
+                Room.objects.alive().filter(owner=user).values_list('id', flat=True)
             )
             memberships = list(
-                RoomMembership.objects.filter(user=user).values('room_id')
+                RoomMembership.objects.filter(user=user, room__deleting_at__isnull=True).values('room_id')
             )
 
             rooms_payload = []
@@ -0,0 +1,29 @@
+# utils/background.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# 요청 스레드와 분리된 소규모 작업 풀 (별도 워커 없이 daphne 프로세스 안에서 동작)
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="careon-bg")
+
+
+def _run(fn, args, kwargs):
+    try:
+        fn(*args, **kwargs)
+    except Exception:
+        logger.exception("background task failed: %s", getattr(fn, "__name__", fn))
+    finally:
+        connections.close_all()
+
+
+def run_in_background(fn, *args, **kwargs):
+    """
+    커밋 이후 fn을 백그라운드 스레드에서 실행한다.
+    BACKGROUND_THREADS=False면 아무것도 하지 않고 관리 명령(워커)이 처리하도록 둔다.
+    """
+    if not getattr(settings, "BACKGROUND_THREADS", True):
+        return
+    transaction.on_commit(lambda: _executor.submit(_run, fn, args, kwargs))
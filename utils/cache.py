@@ -0,0 +1,46 @@
+# utils/cache.py
+import time
+from django.core.cache import cache
+
+# 섹션 캐시 기본 수명 (버전이 바뀌면 즉시 무효화되고, TTL은 안전장치)
+SECTION_TTL = 300
+
+
+def _version_key(room_id: int, section: str) -> str:
+    return f"room:{room_id}:ver:{section}"
+
+
+def room_version(room_id: int, section: str) -> int:
+    """방의 섹션(members, logs, calendar ...)별 현재 캐시 버전"""
+    key = _version_key(room_id, section)
+    version = cache.get(key)
+    if version is None:
+        # 키가 사라진 경우(만료/재시작) 이전 값과 겹치지 않도록 시간 기반으로 시작
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_room_version(room_id: int, *sections: str) -> None:
+    for section in sections:
+        key = _version_key(room_id, section)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def room_cache_key(room_id: int, section: str, *parts) -> str:
+    suffix = ":".join(str(p) for p in parts)
+    key = f"room:{room_id}:{section}:{room_version(room_id, section)}"
+    return f"{key}:{suffix}" if suffix else key
+
+
+def cached_room_section(room_id: int, section: str, builder, *parts, timeout: int = SECTION_TTL):
+    """섹션 버전 + 추가 키(parts) 단위로 builder() 결과를 캐시"""
+    key = room_cache_key(room_id, section, *parts)
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, timeout)
+    return data
@@ -0,0 +1,15 @@
+# utils/db.py
+from django.db import connections, router
+
+
+def bulk_create_with_pks(model, objs, batch_size: int = 500):
+    """
+    bulk_create 후 pk가 채워져야 하는 경우용.
+    MySQL은 bulk INSERT에서 pk를 돌려주지 않으므로 그때만 행 단위 INSERT로 대체한다.
+    """
+    db = router.db_for_write(model)
+    if connections[db].features.can_return_rows_from_bulk_insert:
+        return model.objects.using(db).bulk_create(objs, batch_size=batch_size)
+    for obj in objs:
+        obj.save(force_insert=True, using=db)
+    return objs
@@ -0,0 +1,18 @@
+# utils/redis.py
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis() -> redis.Redis:
+    """채널 레이어와 같은 Redis 서버를 쓰는 공용 클라이언트 (커넥션 풀 공유)"""
+    global _client
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _client
@@ -0,0 +1,27 @@
+# utils/streaming.py
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+async def _as_async(iterator):
+    it = iter(iterator)
+    step = sync_to_async(lambda: next(it, _DONE), thread_sensitive=True)
+    while True:
+        chunk = await step()
+        if chunk is _DONE:
+            return
+        yield chunk
+
+
+def streaming_response(request, iterator, **kwargs) -> StreamingHttpResponse:
+    """
+    ASGI(daphne)에서 동기 이터레이터를 넘기면 Django가 전체를 list로 모은 뒤 보내므로
+    ASGI 요청이면 한 조각씩 꺼내는 비동기 이터레이터로 감싼다.
+    """
+    django_request = getattr(request, "_request", request)
+    if isinstance(django_request, ASGIRequest):
+        iterator = _as_async(iterator)
+    return StreamingHttpResponse(iterator, **kwargs)